@@ -0,0 +1,5 @@
+"""
+benchmarks - Performance benchmarks for savecode on synthetic repositories.
+
+Run with `make bench` or `python -m benchmarks.run --help`.
+"""
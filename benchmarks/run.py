@@ -0,0 +1,308 @@
+"""
+benchmarks/run.py - Time and memory benchmarks for savecode's plugins and CLI.
+
+Generates a synthetic repository (see benchmarks/synthrepo.py), then measures:
+
+  - gather:     GatherPlugin walking the tree.
+  - git_status: GitStatusPlugin on the tree's pending git changes.
+  - save:       SavePlugin writing every gathered file to a bundle.
+  - cli:        a full in-process `savecode` run (argument parsing to summary).
+
+Each case runs --repeat times for wall time (the median is reported), plus once more
+under tracemalloc for the peak of Python allocations. Results are written as JSON.
+Given --baseline, a case fails when its time or peak memory exceeds the baseline by
+more than --threshold (a fraction, default 0.25) and the exit status is 1. A missing
+baseline file (e.g. before `make bench-baseline` has been run on this machine) skips
+the comparison with a notice instead of failing.
+
+    python -m benchmarks.run --preset medium --output bench.json
+    python -m benchmarks.run --preset medium --baseline bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from benchmarks.synthrepo import DEFAULT_NOISE_DIRS, PRESETS, generate
+
+DEFAULT_THRESHOLD = 0.25
+
+# Timings this short are dominated by noise; they never count as regressions.
+MIN_SECONDS = 0.005
+
+Case = Callable[[], Any]
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    """Silence progress bars and summaries while a case runs."""
+    with (
+        open(os.devnull, "w") as devnull,
+        contextlib.redirect_stdout(devnull),
+        contextlib.redirect_stderr(devnull),
+    ):
+        yield
+
+
+def _context(repo: str, **extra: Any) -> Dict[str, Any]:
+    from savecode.utils.error_handler import ErrorCollector
+
+    context: Dict[str, Any] = {
+        "roots": [repo],
+        "files": [],
+        "skip": list(DEFAULT_NOISE_DIRS) + [".git"],
+        "extensions": ["py", "js", "toml"],
+        "errors": ErrorCollector(),
+        "base_dir": repo,
+        "cli_opts": {"git": False},
+    }
+    context.update(extra)
+    return context
+
+
+def build_cases(repo: str, scratch: str, git: bool) -> Dict[str, Case]:
+    """Return the benchmark cases for the repository at *repo*.
+
+    Args:
+        repo (str): Synthetic repository root.
+        scratch (str): Directory for bundle outputs.
+        git (bool): Include the git_status case.
+
+    Returns:
+        Dict[str, Case]: Case name to a zero-argument callable.
+    """
+    from savecode.cli import run
+    from savecode.plugins.gather import GatherPlugin
+    from savecode.plugins.git_status import GitStatusPlugin
+    from savecode.plugins.save import SavePlugin
+
+    gathered = _context(repo)
+    GatherPlugin().run(gathered)
+    all_files = gathered["all_files"]
+    output = os.path.join(scratch, "bundle.txt")
+
+    def gather() -> Any:
+        context = _context(repo)
+        GatherPlugin().run(context)
+        return context
+
+    def git_status() -> Any:
+        context = _context(repo, cli_opts={"git": True, "all_ext": True})
+        GitStatusPlugin().run(context)
+        return context
+
+    def save() -> Any:
+        context = _context(
+            repo,
+            all_files=all_files,
+            output=output,
+            cli_opts={"git": False, "force": True},
+        )
+        SavePlugin().run(context)
+        return context
+
+    def cli() -> Any:
+        # --force: measure the full run, not the unchanged-bundle shortcut.
+        argv = ["-r", repo, "-o", output, "--summary", "none", "--force", "--ext"]
+        return run(argv + ["py", "js", "toml", "--skip", *DEFAULT_NOISE_DIRS, ".git"])
+
+    cases: Dict[str, Case] = {"gather": gather}
+    if git:
+        cases["git_status"] = git_status
+    cases.update(save=save, cli=cli)
+    return cases
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """Time *case* *repeat* times, then record its tracemalloc peak once.
+
+    Args:
+        case (Case): The callable to measure.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        Dict[str, Any]: 'seconds' (median), 'min_seconds', 'max_seconds', 'runs' and
+        'peak_bytes'.
+    """
+    times: List[float] = []
+    with _quiet():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            case()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            case()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "seconds": statistics.median(times),
+        "min_seconds": min(times),
+        "max_seconds": max(times),
+        "runs": repeat,
+        "peak_bytes": peak,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Return one message per metric that regressed beyond *threshold*.
+
+    Args:
+        results (Dict[str, Any]): Current results (the 'cases' mapping).
+        baseline (Dict[str, Any]): Baseline results (the 'cases' mapping).
+        threshold (float): Allowed relative increase, e.g. 0.25 for 25%.
+
+    Returns:
+        List[str]: Regression messages; empty if everything is within bounds.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            if metric == "seconds" and new < MIN_SECONDS:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append(
+                    f"{name}.{metric}: {new:.4g} vs baseline {old:.4g} "
+                    f"(+{(new / old - 1) * 100:.0f}%, limit +{threshold * 100:.0f}%)"
+                )
+    return regressions
+
+
+def run_suite(
+    preset: str = "small",
+    repeat: int = 3,
+    git: bool = True,
+    seed: int = 0,
+    workdir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Generate a repository for *preset* and measure every case on it.
+
+    Args:
+        preset (str, optional): Key of PRESETS. Defaults to "small".
+        repeat (int, optional): Timed runs per case. Defaults to 3.
+        git (bool, optional): Build a git repository and benchmark git_status.
+        seed (int, optional): Generator seed. Defaults to 0.
+        workdir (str, optional): Parent directory for the temporary tree.
+
+    Returns:
+        Dict[str, Any]: {'meta': {...}, 'cases': {name: measurement}}.
+    """
+    git = git and shutil.which("git") is not None
+    with tempfile.TemporaryDirectory(prefix="savecode-bench-", dir=workdir) as tmp:
+        repo = os.path.join(tmp, "repo")
+        info = generate(repo, git=git, seed=seed, **PRESETS[preset])
+        cases = build_cases(repo, tmp, git)
+        env = {"SAVECODE_NOCOPY": "1"}
+        saved_env = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        try:
+            results = {name: measure(case, repeat) for name, case in cases.items()}
+        finally:
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+    return {
+        "meta": {
+            "preset": preset,
+            "seed": seed,
+            "repeat": repeat,
+            "tree": info,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "cases": results,
+    }
+
+
+def _print_table(
+    results: Dict[str, Any], baseline: Optional[Dict[str, Any]], stream: Any
+) -> None:
+    stream.write(f"{'case':<12}{'median s':>12}{'peak MiB':>12}{'vs base':>10}\n")
+    for name, m in results.items():
+        change = ""
+        base = (baseline or {}).get(name)
+        if base and base.get("seconds"):
+            change = f"{(m['seconds'] / base['seconds'] - 1) * 100:+.0f}%"
+        stream.write(
+            f"{name:<12}{m['seconds']:>12.4f}"
+            f"{m['peak_bytes'] / 1024 / 1024:>12.1f}{change:>10}\n"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-git", action="store_true", help="Skip git_status.")
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    parser.add_argument("--baseline", help="Compare against this JSON results file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative increase over the baseline (default 0.25).",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline and not os.path.exists(args.baseline):
+        print(
+            f"No baseline at {args.baseline}; skipping the comparison "
+            "(record one with `make bench-baseline`).",
+            file=sys.stderr,
+        )
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline_doc = json.load(f)
+        if baseline_doc["meta"]["preset"] != args.preset:
+            print(
+                f"Baseline was recorded with preset {baseline_doc['meta']['preset']!r}",
+                file=sys.stderr,
+            )
+            return 2
+        baseline = baseline_doc["cases"]
+
+    doc = run_suite(args.preset, args.repeat, not args.no_git, args.seed)
+    _print_table(doc["cases"], baseline, sys.stdout)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(doc["cases"], baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for message in regressions:
+                print(f"- {message}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# End of benchmarks/run.py
@@ -0,0 +1,162 @@
+"""
+benchmarks/synthrepo.py - Deterministic synthetic repository generator.
+
+generate() builds a directory tree of a given depth and fan-out, filled with files
+whose sizes and extensions are drawn from a seeded RNG, so the same spec always
+yields byte-identical trees. Every directory can also get "noise" subdirectories
+(node_modules, build, ...) that savecode is expected to skip. With git=True the tree
+is committed to a local repository and then modified, so `git status` reports
+staged, unstaged and untracked changes.
+"""
+
+import os
+import random
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_EXT_MIX: Dict[str, int] = {"py": 6, "js": 2, "md": 1, "toml": 1}
+DEFAULT_NOISE_DIRS: Tuple[str, ...] = ("node_modules", "build")
+
+# Presets, roughly 0.5k, 10k and 100k files (noise included).
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "tiny": {"depth": 2, "fanout": 2, "files_per_dir": 4, "noise_files": 2},
+    "small": {"depth": 3, "fanout": 4, "files_per_dir": 6, "noise_files": 4},
+    "medium": {"depth": 4, "fanout": 6, "files_per_dir": 6, "noise_files": 4},
+    "large": {"depth": 5, "fanout": 7, "files_per_dir": 5, "noise_files": 4},
+}
+
+_LINE = "value_{n} = compute({n}, factor={f})  # synthetic line\n"
+
+
+def _content(rng: random.Random, size: int) -> str:
+    """Return roughly *size* bytes of plausible source text."""
+    lines: List[str] = []
+    total = 0
+    while total < size:
+        line = _LINE.format(n=len(lines), f=rng.randint(0, 999))
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)
+
+
+def _git(root: str, *args: str) -> None:
+    subprocess.run(
+        ["git", *args],
+        cwd=root,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _make_git_repo(root: str, files: List[str], rng: random.Random) -> Dict[str, int]:
+    """Commit the tree, then stage, modify and add files; return the change counts."""
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "bench@example.invalid")
+    _git(root, "config", "user.name", "bench")
+    _git(root, "config", "commit.gpgsign", "false")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "synthetic baseline")
+
+    # About 1% of files get each kind of change.
+    changed = rng.sample(files, k=max(2, len(files) // 50))
+    half = len(changed) // 2
+    for path in changed:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("# modified\n")
+    _git(root, "add", "--", *changed[:half])
+    for n in range(max(1, len(files) // 100)):
+        with open(os.path.join(root, f"untracked_{n}.py"), "w", encoding="utf-8") as f:
+            f.write(_content(rng, 200))
+    return {
+        "staged": half,
+        "unstaged": len(changed) - half,
+        "untracked": max(1, len(files) // 100),
+    }
+
+
+def generate(
+    root: str,
+    depth: int = 3,
+    fanout: int = 4,
+    files_per_dir: int = 6,
+    size_range: Tuple[int, int] = (200, 8000),
+    ext_mix: Optional[Dict[str, int]] = None,
+    noise_dirs: Tuple[str, ...] = DEFAULT_NOISE_DIRS,
+    noise_files: int = 4,
+    git: bool = False,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Build a synthetic repository under *root*.
+
+    Args:
+        root (str): Directory to fill; created if missing.
+        depth (int, optional): Directory levels below *root*. Defaults to 3.
+        fanout (int, optional): Subdirectories per directory. Defaults to 4.
+        files_per_dir (int, optional): Source files per directory. Defaults to 6.
+        size_range (Tuple[int, int], optional): Inclusive file size range in bytes.
+        ext_mix (Dict[str, int], optional): Extension weights. Defaults to
+            DEFAULT_EXT_MIX.
+        noise_dirs (Tuple[str, ...], optional): Directories to be skipped, created in
+            every top-level directory.
+        noise_files (int, optional): Files per noise directory. Defaults to 4.
+        git (bool, optional): Make *root* a git repository with pending changes.
+        seed (int, optional): RNG seed. Defaults to 0.
+
+    Returns:
+        Dict[str, Any]: Counts describing the tree ('files', 'bytes', 'dirs',
+        'noise_files', 'by_ext' and, with git, 'git').
+    """
+    rng = random.Random(seed)
+    mix = ext_mix or DEFAULT_EXT_MIX
+    exts, weights = list(mix), list(mix.values())
+    files: List[str] = []
+    by_ext: Dict[str, int] = {ext: 0 for ext in exts}
+    total_bytes = 0
+    noise = 0
+    dirs = 0
+
+    def fill(directory: str, level: int) -> None:
+        nonlocal total_bytes, noise, dirs
+        os.makedirs(directory, exist_ok=True)
+        dirs += 1
+        for n in range(files_per_dir):
+            ext = rng.choices(exts, weights)[0]
+            path = os.path.join(directory, f"mod_{n}.{ext}")
+            text = _content(rng, rng.randint(*size_range))
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            files.append(path)
+            by_ext[ext] += 1
+            total_bytes += len(text)
+        if level == 1:
+            for name in noise_dirs:
+                noise_dir = os.path.join(directory, name, "pkg")
+                os.makedirs(noise_dir, exist_ok=True)
+                for n in range(noise_files):
+                    ext = rng.choices(exts, weights)[0]
+                    with open(
+                        os.path.join(noise_dir, f"vendored_{n}.{ext}"),
+                        "w",
+                        encoding="utf-8",
+                    ) as f:
+                        f.write(_content(rng, size_range[0]))
+                    noise += 1
+        if level < depth:
+            for n in range(fanout):
+                fill(os.path.join(directory, f"dir_{level}_{n}"), level + 1)
+
+    fill(root, 0)
+    info: Dict[str, Any] = {
+        "files": len(files),
+        "bytes": total_bytes,
+        "dirs": dirs,
+        "noise_files": noise,
+        "by_ext": by_ext,
+    }
+    if git:
+        info["git"] = _make_git_repo(root, files, rng)
+    return info
+
+
+# End of benchmarks/synthrepo.py
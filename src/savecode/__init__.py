@@ -1,12 +1,52 @@
 """
 src/savecode/__init__.py
 Keep runtime version in sync with packaging metadata.
+
+The version is looked up lazily: importlib.metadata scans site-packages, which is a
+noticeable share of startup time, and only `savecode -v` actually needs it. The
+public API is resolved lazily too, so `savecode --client` stays cheap to start.
 """
 
-from importlib.metadata import version
+from typing import Any, Dict
+
+__all__ = [
+    "run_plugins",
+    "list_plugins",
+    "bundle",
+    "write_bundle",
+    "abundle",
+    "awrite_bundle",
+    "BundleError",
+]
+
+# Public name -> submodule that defines it.
+_LAZY: Dict[str, str] = {
+    "run_plugins": "plugin_manager",
+    "list_plugins": "plugin_manager",
+    "bundle": "api",
+    "write_bundle": "api",
+    "abundle": "api",
+    "awrite_bundle": "api",
+    "BundleError": "api",
+}
+
+_version: str = ""
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``__version__`` and the public API on first access."""
+    global _version
+    if name == "__version__":
+        if not _version:
+            from importlib.metadata import PackageNotFoundError, version
 
-# Get version from installed package metadata
-__version__ = version(__name__)
+            try:
+                _version = version(__name__)
+            except PackageNotFoundError:  # running from a source checkout
+                _version = "0+unknown"
+        return _version
+    if name in _LAZY:
+        from importlib import import_module
 
-__all__ = ["run_plugins", "list_plugins"]
-from .plugin_manager import run_plugins, list_plugins
+        return getattr(import_module(f"{__name__}.{_LAZY[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,439 @@
+"""
+savecode/api.py - Embeddable library API for building bundles in-process.
+
+bundle() returns the bundle as an iterator of (path, bytes) chunks, one per file.
+write_bundle() writes the same document the CLI produces (banner, sections and
+footer) to a binary file object. Neither function reads sys.argv, prints, touches
+the clipboard or exits. Each call gets its own PluginManager and context, so calls
+can run concurrently from many threads.
+
+abundle() and awrite_bundle() are the asyncio equivalents: collection and file
+reads run on a thread pool in bounded batches, so the event loop is never blocked
+on disk I/O, and awrite_bundle() only replaces its output file once complete.
+
+Example:
+    >>> from savecode import bundle
+    >>> for path, chunk in bundle(["src"], ext=["py", "toml"]):
+    ...     sink.write(chunk)
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from savecode.constants.defaults import DEFAULT_EXTENSIONS, DEFAULT_SKIP
+from savecode.plugin_manager.manager import PluginManager
+from savecode.plugins.save import format_banner, format_footer, iter_sections
+from savecode.utils.error_handler import ErrorCollector
+
+# Built-in plugins that serve the CLI only: the API does its own output.
+_CLI_ONLY = frozenset({"ExtraArgsPlugin", "SavePlugin"})
+
+# write_bundle() keeps sections in memory up to this size, then spools to disk.
+_SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+# Files read per thread-pool job by the async API; one batch is read ahead.
+DEFAULT_BATCH_SIZE = 64
+
+
+class BundleError(Exception):
+    """Raised once a bundle has been produced if any file or source failed.
+
+    Warnings (missing or oversized files) alone do not raise.
+
+    Attributes:
+        errors (List[str]): The recorded problems (warnings included), in order;
+            at most DEFAULT_MAX_EXAMPLES per category.
+        collector (ErrorCollector, optional): Counts per severity and category.
+    """
+
+    def __init__(
+        self, errors: Iterable[str], collector: Optional[ErrorCollector] = None
+    ):
+        self.errors = list(errors)
+        self.collector = collector
+        preview = "; ".join(self.errors[:3])
+        more = f" (+{len(self.errors) - 3} more)" if len(self.errors) > 3 else ""
+        super().__init__(f"{len(self.errors)} error(s) while bundling: {preview}{more}")
+
+
+def build_context(
+    roots: Optional[Sequence[str]],
+    files: Optional[Sequence[str]],
+    ext: Optional[Sequence[str]],
+    skip: Optional[Sequence[str]],
+    git: bool,
+    staged: bool,
+    unstaged: bool,
+    all_ext: bool,
+    base_dir: Optional[str],
+    cache: Any,
+) -> Dict[str, Any]:
+    """Build the same shared context the CLI does, from keyword arguments.
+
+    Args:
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, cache:
+            As for bundle().
+
+    Returns:
+        Dict[str, Any]: A fresh context for collect_files() and iter_sections().
+
+    Raises:
+        ValueError: For inconsistent options.
+    """
+    if (staged or unstaged or all_ext) and not git:
+        raise ValueError("staged, unstaged and all_ext require git=True")
+    base = os.path.abspath(base_dir or os.getcwd())
+    skip_patterns = list(DEFAULT_SKIP if skip is None else skip)
+    context: Dict[str, Any] = {
+        "roots": [os.path.join(base, p) for p in roots or []],
+        "files": [os.path.join(base, p) for p in files or []],
+        "skip": [os.path.join(base, p) if os.sep in p else p for p in skip_patterns],
+        "output": None,
+        "extensions": [
+            e.lower().lstrip(".") for e in (DEFAULT_EXTENSIONS if ext is None else ext)
+        ],
+        "extra_args": [],
+        "errors": ErrorCollector(),
+        "base_dir": base,
+        "cli_opts": {
+            "git": git,
+            "staged": staged,
+            "unstaged": unstaged,
+            "all_ext": all_ext,
+            "ext_provided": ext is not None,
+        },
+    }
+    if not context["roots"] and not context["files"] and not git:
+        context["roots"] = [base]
+    if cache is not None:
+        context["cache"] = cache
+    return context
+
+
+def collect_files(context: Dict[str, Any]) -> List[str]:
+    """Run the file-collecting plugins on a private manager and return all_files.
+
+    Args:
+        context (Dict[str, Any]): A context from build_context().
+
+    Returns:
+        List[str]: The collected file paths; problems are recorded in
+        context['errors'].
+    """
+    manager = PluginManager()
+    manager.discover()
+    manager.registry = [s for s in manager.registry if s.name not in _CLI_ONLY]
+    manager.run_plugins(context)
+    files: List[str] = context.get("all_files") or []
+    return files
+
+
+def _report(context: Dict[str, Any], errors: Optional[List[str]]) -> None:
+    """Hand the run's problems to the caller's list, or raise real errors."""
+    collector: ErrorCollector = context["errors"]
+    if errors is not None:
+        errors.extend(collector)
+    elif collector.has_errors():
+        raise BundleError(collector, collector)
+
+
+def _sections(
+    context: Dict[str, Any], errors: Optional[List[str]]
+) -> Iterator[Tuple[str, str, str]]:
+    """Yield (path, relative path, section) and then report the run's errors."""
+    yield from iter_sections(collect_files(context), context)
+    _report(context, errors)
+
+
+def _partial_path(output: str) -> str:
+    """Create an empty temporary file next to *output* and return its path."""
+    fd, partial = tempfile.mkstemp(
+        prefix=".savecode-", suffix=".partial", dir=os.path.dirname(output)
+    )
+    os.close(fd)
+    return partial
+
+
+def _finish(spool: IO[bytes], target: str, rel_paths: List[str], output: str) -> None:
+    """Write banner, spooled sections and footer to *target*."""
+    with open(target, "wb") as out:
+        out.write(format_banner(rel_paths).encode("utf-8"))
+        spool.seek(0)
+        shutil.copyfileobj(spool, out)
+        out.write(format_footer(len(rel_paths), output).encode("utf-8"))
+
+
+def bundle(
+    roots: Optional[Sequence[str]] = None,
+    files: Optional[Sequence[str]] = None,
+    *,
+    ext: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    git: bool = False,
+    staged: bool = False,
+    unstaged: bool = False,
+    all_ext: bool = False,
+    base_dir: Optional[str] = None,
+    errors: Optional[List[str]] = None,
+    cache: Any = None,
+) -> Iterator[Tuple[str, bytes]]:
+    """Stream a bundle as (path, chunk) pairs, one UTF-8 section per file.
+
+    Nothing is read until the iterator is consumed. Options mirror the CLI flags.
+
+    Args:
+        roots (Sequence[str], optional): Directories or files to search. Defaults to
+            *base_dir* when neither roots, files nor git is given.
+        files (Sequence[str], optional): Individual files or directories to include.
+        ext (Sequence[str], optional): Extensions to collect. Defaults to ["py"].
+        skip (Sequence[str], optional): Skip patterns. Defaults to the CLI defaults.
+        git (bool, optional): Collect the files Git reports as changed.
+        staged (bool, optional): With git: staged changes only.
+        unstaged (bool, optional): With git: unstaged changes only.
+        all_ext (bool, optional): With git: ignore *ext*.
+        base_dir (str, optional): Directory relative paths (and section headers) are
+            resolved against. Defaults to the working directory.
+        errors (List[str], optional): If given, errors are appended here instead of
+            being raised.
+        cache (optional): A ResultCache or MemoryCache used to memoize walks.
+
+    Returns:
+        Iterator[Tuple[str, bytes]]: (absolute path, section bytes) pairs.
+
+    Raises:
+        ValueError: For inconsistent options (raised immediately).
+        BundleError: After the last chunk, if any errors were recorded and no
+            *errors* list was given.
+    """
+    context = build_context(
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, cache
+    )
+    return (
+        (path, section.encode("utf-8"))
+        for path, _, section in _sections(context, errors)
+    )
+
+
+def write_bundle(
+    out: BinaryIO,
+    roots: Optional[Sequence[str]] = None,
+    files: Optional[Sequence[str]] = None,
+    *,
+    ext: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    git: bool = False,
+    staged: bool = False,
+    unstaged: bool = False,
+    all_ext: bool = False,
+    base_dir: Optional[str] = None,
+    errors: Optional[List[str]] = None,
+    cache: Any = None,
+) -> List[str]:
+    """Write a complete bundle, in the CLI's output format, to *out*.
+
+    Sections are spooled (in memory, then on disk past 16 MB) until the banner
+    listing every included file can be written first.
+
+    Args:
+        out (BinaryIO): Writable binary file object.
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, errors,
+        cache: As for bundle().
+
+    Returns:
+        List[str]: Absolute paths of the files written, in bundle order.
+
+    Raises:
+        ValueError: For inconsistent options.
+        BundleError: After writing, if any errors were recorded and no *errors* list
+            was given.
+    """
+    context = build_context(
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, cache
+    )
+    paths: List[str] = []
+    rel_paths: List[str] = []
+    pending: Optional[BundleError] = None
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as spool:
+        try:
+            for path, rel_path, section in _sections(context, errors):
+                spool.write(section.encode("utf-8"))
+                paths.append(path)
+                rel_paths.append(rel_path)
+        except BundleError as e:
+            pending = e  # still write what was collected, like the CLI
+        out.write(format_banner(rel_paths).encode("utf-8"))
+        spool.seek(0)
+        shutil.copyfileobj(spool, out)
+        name = str(getattr(out, "name", "<stream>"))
+        out.write(format_footer(len(paths), name).encode("utf-8"))
+    if pending is not None:
+        raise pending
+    return paths
+
+
+async def _asections(
+    context: Dict[str, Any], batch_size: int, executor: Optional[Executor]
+) -> AsyncIterator[Tuple[str, str, bytes]]:
+    """Collect and read files on *executor*, one batch in flight ahead of the consumer."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    files = await loop.run_in_executor(executor, collect_files, context)
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+
+    def read(batch: List[str]) -> List[Tuple[str, str, bytes]]:
+        return [
+            (path, rel_path, section.encode("utf-8"))
+            for path, rel_path, section in iter_sections(batch, context)
+        ]
+
+    pending: Optional["asyncio.Future[List[Tuple[str, str, bytes]]]"] = None
+    try:
+        for index, batch in enumerate(batches):
+            if pending is None:
+                pending = loop.run_in_executor(executor, read, batch)
+            sections = await pending
+            pending = None
+            if index + 1 < len(batches):
+                pending = loop.run_in_executor(executor, read, batches[index + 1])
+            for section in sections:
+                yield section
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def abundle(
+    roots: Optional[Sequence[str]] = None,
+    files: Optional[Sequence[str]] = None,
+    *,
+    ext: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    git: bool = False,
+    staged: bool = False,
+    unstaged: bool = False,
+    all_ext: bool = False,
+    base_dir: Optional[str] = None,
+    errors: Optional[List[str]] = None,
+    cache: Any = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """Async version of bundle(): stream (path, chunk) pairs without blocking the loop.
+
+    Walking, Git queries and file reads run on *executor* (the loop's default thread
+    pool if None), *batch_size* files per job. At most one batch is read ahead of the
+    consumer, so a slow consumer applies backpressure. Cancelling the consuming task
+    (or closing the iterator) abandons the batch in flight.
+
+    Args:
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, errors,
+        cache: As for bundle().
+        batch_size (int, optional): Files read per thread-pool job. Defaults to 64.
+        executor (Executor, optional): Where blocking work runs.
+
+    Yields:
+        Tuple[str, bytes]: (absolute path, section bytes) pairs.
+
+    Raises:
+        ValueError: For inconsistent options (on first iteration).
+        BundleError: After the last chunk, as for bundle().
+    """
+    context = build_context(
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, cache
+    )
+    async for path, _, data in _asections(context, max(1, batch_size), executor):
+        yield path, data
+    _report(context, errors)
+
+
+async def awrite_bundle(
+    output: str,
+    roots: Optional[Sequence[str]] = None,
+    files: Optional[Sequence[str]] = None,
+    *,
+    ext: Optional[Sequence[str]] = None,
+    skip: Optional[Sequence[str]] = None,
+    git: bool = False,
+    staged: bool = False,
+    unstaged: bool = False,
+    all_ext: bool = False,
+    base_dir: Optional[str] = None,
+    errors: Optional[List[str]] = None,
+    cache: Any = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> List[str]:
+    """Async version of write_bundle() that writes to the file at *output*.
+
+    The bundle is assembled in a temporary file next to *output* and moved into
+    place only when complete, so cancellation or a failure never leaves a partial
+    output file behind (an existing file is left untouched).
+
+    Args:
+        output (str): Destination path.
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, errors,
+        cache, batch_size, executor: As for abundle().
+
+    Returns:
+        List[str]: Absolute paths of the files written, in bundle order.
+
+    Raises:
+        ValueError: For inconsistent options.
+        BundleError: After the output is in place, as for write_bundle().
+    """
+    import asyncio
+
+    context = build_context(
+        roots, files, ext, skip, git, staged, unstaged, all_ext, base_dir, cache
+    )
+    loop = asyncio.get_running_loop()
+    output = os.path.abspath(output)
+    batch_size = max(1, batch_size)
+    partial = await loop.run_in_executor(executor, _partial_path, output)
+    paths: List[str] = []
+    rel_paths: List[str] = []
+    try:
+        spool = await loop.run_in_executor(executor, tempfile.TemporaryFile)
+        with spool:
+            # File writes stay off the event loop: spooled a batch at a time.
+            chunk: List[bytes] = []
+            async for path, rel_path, data in _asections(context, batch_size, executor):
+                chunk.append(data)
+                paths.append(path)
+                rel_paths.append(rel_path)
+                if len(chunk) >= batch_size:
+                    await loop.run_in_executor(executor, spool.writelines, chunk)
+                    chunk = []
+            if chunk:
+                await loop.run_in_executor(executor, spool.writelines, chunk)
+            await loop.run_in_executor(
+                executor, _finish, spool, partial, rel_paths, output
+            )
+        await loop.run_in_executor(executor, os.replace, partial, output)
+    except BaseException:
+        try:
+            os.unlink(partial)
+        except OSError:
+            pass
+        raise
+    _report(context, errors)
+    return paths
+
+
+# End of savecode/api.py
@@ -0,0 +1,277 @@
+"""
+savecode/bundle_index.py - Random access to the files inside a saved bundle.
+
+`savecode extract BUNDLE PATH...` prints (or writes) single files from a bundle and
+`savecode unpack BUNDLE DEST` restores the whole tree. Both use an offset index: the
+byte range of every file's content in the bundle. The index is read from a sidecar
+file next to the bundle (BUNDLE.idx) when it matches the bundle's size and mtime;
+otherwise it is built in one streaming pass and saved as that sidecar.
+
+A bundle opens with a "Files saved (N):" list of relative paths, which tells the
+scanner exactly which "File: <path>" header comes next, so only that one header can
+end a section; "File: " lines for other paths inside file contents are ignored.
+Contents are copied from the bundle in fixed-size chunks and never held in memory
+whole, and `unpack` writes files on a thread pool.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("savecode.bundle_index")
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+CHUNK_SIZE = 1 << 20
+
+_BANNER_RE = re.compile(rb"Files saved \((\d+)\):\n$")
+_FOOTER_RE = re.compile(rb"Saved code from \d+ files to ")
+
+# relative path -> (content start, content end) byte offsets.
+Entries = List[Tuple[str, int, int]]
+
+
+class BundleFormatError(ValueError):
+    """Raised when a file does not look like a savecode bundle."""
+
+
+def scan_bundle(f: BinaryIO) -> Entries:
+    """Build the offset index of an open bundle in one pass.
+
+    Args:
+        f (BinaryIO): The bundle, opened in binary mode at offset 0.
+
+    Returns:
+        Entries: (relative path, content start, content end) per file, in order.
+
+    Raises:
+        BundleFormatError: If the banner, a header or the footer is missing.
+    """
+    match = _BANNER_RE.match(f.readline())
+    if not match:
+        raise BundleFormatError("missing 'Files saved (N):' banner")
+    paths = []
+    for _ in range(int(match.group(1))):
+        line = f.readline()
+        if not line.startswith(b"- ") or not line.endswith(b"\n"):
+            raise BundleFormatError("truncated file list in banner")
+        paths.append(line[2:-1].decode("utf-8"))
+
+    entries: Entries = []
+    offset = f.tell()
+    previous = b""
+    footer = -1
+    for line in f:
+        line_start = offset
+        offset += len(line)
+        if previous == b"\n":
+            if len(entries) < len(paths):
+                expected = f"File: {paths[len(entries)]}\n".encode("utf-8")
+                if line == expected:
+                    _close(entries, line_start)
+                    # Content starts after the blank line following the header.
+                    entries.append((paths[len(entries)], offset + 1, -1))
+            elif _FOOTER_RE.match(line):
+                # The last match wins: the closing line may also occur in content.
+                footer = line_start
+        previous = line
+    if len(entries) < len(paths) or footer < 0:
+        raise BundleFormatError(
+            f"found {len(entries)} of {len(paths)} sections and "
+            f"{'a' if footer >= 0 else 'no'} closing line"
+        )
+    # The footer starts with its own newline, just before the closing line.
+    _close(entries, footer - 1)
+    return entries
+
+
+def _close(entries: Entries, boundary: int) -> None:
+    """End the open entry two newlines before *boundary* (the next header)."""
+    if entries and entries[-1][2] < 0:
+        rel_path, start, _ = entries[-1]
+        entries[-1] = (rel_path, start, max(start, boundary - 2))
+
+
+def index_path(bundle: str) -> str:
+    """Return the sidecar index path for *bundle*."""
+    return bundle + INDEX_SUFFIX
+
+
+def load_index(bundle: str, write_sidecar: bool = True) -> Entries:
+    """Return the bundle's offset index, from its sidecar or a fresh scan.
+
+    Args:
+        bundle (str): Bundle path.
+        write_sidecar (bool, optional): Save a freshly built index next to the
+            bundle. Defaults to True.
+
+    Returns:
+        Entries: (relative path, content start, content end) per file.
+
+    Raises:
+        OSError: If the bundle cannot be read.
+        BundleFormatError: If it is not a savecode bundle.
+    """
+    st = os.stat(bundle)
+    stamp = [st.st_size, st.st_mtime_ns]
+    sidecar = index_path(bundle)
+    try:
+        with open(sidecar, encoding="utf-8") as f:
+            doc = json.load(f)
+        if doc.get("version") == INDEX_VERSION and doc.get("bundle") == stamp:
+            return [(rel, start, end) for rel, start, end in doc["entries"]]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    with open(bundle, "rb") as f:
+        entries = scan_bundle(f)
+    if write_sidecar:
+        try:
+            tmp = f"{sidecar}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as out:
+                json.dump(
+                    {"version": INDEX_VERSION, "bundle": stamp, "entries": entries}, out
+                )
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            logger.debug("Could not write bundle index %s: %s", sidecar, e)
+    return entries
+
+
+def copy_range(src: BinaryIO, dst: BinaryIO, start: int, end: int) -> None:
+    """Copy bytes [start, end) of *src* to *dst* in CHUNK_SIZE pieces."""
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+def safe_destination(dest: str, rel_path: str) -> Optional[str]:
+    """Return where *rel_path* goes under *dest*, or None if it would escape it."""
+    parts = rel_path.replace("\\", "/").split("/")
+    if os.path.isabs(rel_path) or ".." in parts:
+        return None
+    return os.path.join(dest, *parts)
+
+
+def _unpack_one(bundle: str, dest: str, start: int, end: int) -> None:
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    with open(bundle, "rb") as src, open(dest, "wb") as out:
+        copy_range(src, out, start, end)
+
+
+def _open_index(bundle: str) -> Optional[Entries]:
+    try:
+        return load_index(bundle)
+    except (OSError, BundleFormatError) as e:
+        print(f"Cannot read bundle {bundle}: {e}", file=sys.stderr)
+        return None
+
+
+def extract_command(argv: List[str]) -> int:
+    """Handle `savecode extract BUNDLE PATH... [--dest DIR]`.
+
+    Args:
+        argv (List[str]): Arguments following the 'extract' subcommand.
+
+    Returns:
+        int: Process exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="savecode extract",
+        description="Print files from a bundle, or write them under --dest.",
+    )
+    parser.add_argument("bundle")
+    parser.add_argument("paths", nargs="+", metavar="PATH")
+    parser.add_argument("--dest", help="Write the files under this directory.")
+    args = parser.parse_args(argv)
+
+    entries = _open_index(args.bundle)
+    if entries is None:
+        return 2
+    by_path: Dict[str, Tuple[int, int]] = {rel: (s, e) for rel, s, e in entries}
+    status = 0
+    with open(args.bundle, "rb") as src:
+        for path in args.paths:
+            rel_path = os.path.normpath(path)
+            span = by_path.get(path) or by_path.get(rel_path)
+            if span is None:
+                print(f"{path}: not in {args.bundle}", file=sys.stderr)
+                status = 1
+                continue
+            if args.dest is None:
+                sys.stdout.flush()
+                copy_range(src, sys.stdout.buffer, *span)
+                sys.stdout.buffer.flush()
+                continue
+            dest = safe_destination(args.dest, rel_path)
+            if dest is None:
+                print(f"{path}: refusing to write outside {args.dest}", file=sys.stderr)
+                status = 1
+                continue
+            _unpack_one(args.bundle, dest, *span)
+    return status
+
+
+def unpack_command(argv: List[str]) -> int:
+    """Handle `savecode unpack BUNDLE DEST [--jobs N]`.
+
+    Args:
+        argv (List[str]): Arguments following the 'unpack' subcommand.
+
+    Returns:
+        int: Process exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="savecode unpack",
+        description="Restore every file of a bundle under DEST.",
+    )
+    parser.add_argument("bundle")
+    parser.add_argument("dest")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Files written concurrently (default: ThreadPoolExecutor's default).",
+    )
+    args = parser.parse_args(argv)
+
+    entries = _open_index(args.bundle)
+    if entries is None:
+        return 2
+    status = 0
+    work = []
+    for rel_path, start, end in entries:
+        dest = safe_destination(args.dest, rel_path)
+        if dest is None:
+            print(f"{rel_path}: refusing to write outside {args.dest}", file=sys.stderr)
+            status = 1
+            continue
+        work.append((dest, start, end))
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [
+            (dest, pool.submit(_unpack_one, args.bundle, dest, start, end))
+            for dest, start, end in work
+        ]
+        for dest, future in futures:
+            try:
+                future.result()
+            except OSError as e:
+                print(f"{dest}: {e}", file=sys.stderr)
+                status = 1
+    print(f"Unpacked {len(work)} files to {args.dest}")
+    return status
+
+
+# End of savecode/bundle_index.py
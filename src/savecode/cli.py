@@ -7,67 +7,207 @@ and handle any errors encountered during execution.
 
 import sys
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-# Import the plugins package to ensure all plugins are registered.
-from savecode.plugin_manager.manager import run_plugins
-from savecode.utils.path_utils import (
-    normalize_path,
-)  # Updated import: use normalize_path directly.
-from savecode.utils.display import display_summary
-from savecode.utils.logger import configure_logging
-from savecode.utils.cli_args import parse_arguments
+# The run machinery is imported inside run() and cache_command() so that
+# `savecode --client` only pays for the socket round trip.
 
 
-def main() -> None:
+def cache_command(argv: List[str]) -> int:
     """
-    Main entry point for the savecode CLI.
+    Handle `savecode cache stats|clear`.
+
+    Args:
+        argv (List[str]): Arguments following the 'cache' subcommand.
+
+    Returns:
+        int: Process exit status.
+    """
+    import argparse
+    from savecode.utils.cache import ResultCache
+
+    parser = argparse.ArgumentParser(
+        prog="savecode cache", description="Inspect or clear the savecode result cache."
+    )
+    parser.add_argument("action", choices=["stats", "clear"])
+    args = parser.parse_args(argv)
+
+    cache = ResultCache()
+    try:
+        if args.action == "clear":
+            removed = cache.clear()
+            print(f"Removed {removed} cache entries from {cache.path}")
+            return 0
+        stats = cache.stats()
+        print(f"Cache: {stats['path']}")
+        print(
+            f"Entries: {stats['entries']}  "
+            f"Size: {stats['bytes'] / 1024:.1f} KiB of {stats['max_bytes'] / 1024 / 1024:.0f} MiB"
+        )
+        for namespace, counts in stats["namespaces"].items():
+            print(
+                f"  {namespace}: {counts['entries']} entries, {counts['bytes'] / 1024:.1f} KiB"
+            )
+        return 0
+    finally:
+        cache.close()
+
+
+def run(
+    argv: Optional[List[str]] = None, state: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Run one savecode invocation in this process.
 
     Parses command-line arguments, builds a shared context, executes registered plugins,
     displays a summary of the saved files, and reports any errors encountered.
 
+    Args:
+        argv (List[str], optional): Command-line arguments. Defaults to sys.argv[1:].
+        state (Dict[str, Any], optional): Long-lived context entries (e.g. the daemon's
+            warm 'cache' and 'content_cache') merged into the fresh context.
+
     Returns:
-        None
+        int: Process exit status.
     """
-    args, extra_args = parse_arguments()
+    from savecode.plugin_manager.manager import run_plugins
+    from savecode.utils.path_utils import normalize_path
+    from savecode.utils.display import display_summary
+    from savecode.utils.logger import configure_logging
+    from savecode.utils.cli_args import parse_arguments
+    from savecode.utils.profiler import Profiler
+    from savecode.utils.error_handler import ErrorCollector
+    from savecode.utils.recency import recency_cutoff
+
+    state = state or {}
+    args, extra_args = parse_arguments(argv)
 
     # Convert log level string to corresponding logging level integer.
     log_level = getattr(logging, args.log_level.upper(), logging.WARNING)
     # Configure logging with the dynamic log level.
     configure_logging(level=log_level)
 
+    if args.manifest:
+        from savecode.manifest import ManifestError, run_manifest
+
+        try:
+            return run_manifest(normalize_path(args.manifest))
+        except ManifestError as e:
+            print(f"Invalid manifest: {e}", file=sys.stderr)
+            return 2
+
+    if args.split_by and args.output == "-":
+        print("--split-by writes files and cannot be used with -o -", file=sys.stderr)
+        return 2
+
     # Build a shared context for all plugins.
     context: Dict[str, Any] = {
         "roots": args.roots,
         "files": args.files,
         "skip": args.skip,
-        "output": normalize_path(args.output),  # Directly call normalize_path.
+        "output": "-" if args.output == "-" else normalize_path(args.output),
         "extensions": [ext.lower().lstrip(".") for ext in args.ext],
         "extra_args": extra_args,
-        "errors": [],  # Initialize error aggregation list
+        "errors": ErrorCollector(args.max_errors),  # bounded error aggregation
         "cli_opts": {  # NEW: pass raw flags so plugins can see them
             "git": args.git,
             "staged": args.staged,
             "unstaged": args.unstaged,
             "all_ext": args.all_ext,
             "ext_provided": args.ext_provided,  # <── NEW
+            "summary": args.summary,
+            "stats": args.stats or args.stats_json is not None,
+            "entry": bool(args.entry),
+            "dep_order": args.dep_order,
+            "force": args.force,
+            "follow_symlinks": args.follow_symlinks,
+            "binary": args.binary,
+            "outline": args.outline_head if args.outline else None,
+            "notebook_outputs": args.notebook_outputs,
+            "split_by": args.split_by,
         },
+        "entry": [normalize_path(p) for p in args.entry or []],
+        "jobs": args.jobs,
+        "newer_than_ns": recency_cutoff(args.changed_within, args.newer_than),
+        "stats_json": normalize_path(args.stats_json) if args.stats_json else None,
     }
 
+    context.update(state)
+
+    cache = None
+    if args.cache and "cache" not in state:
+        from savecode.utils.cache import ResultCache
+
+        cache = ResultCache()
+        context["cache"] = cache
+
+    # Profiling is opt-in; without a profiler in the context every span is a no-op.
+    profiler = Profiler() if args.profile or args.trace else None
+    if profiler is not None:
+        context["profiler"] = profiler
+        profiler.start()
+
     try:
         run_plugins(context)
     except KeyboardInterrupt:
         print("\nInterrupted by user – finishing up...")
+    finally:
+        if cache is not None:
+            cache.close()
+        if profiler is not None:
+            profiler.stop()
+            if args.profile:
+                profiler.print_table(sys.stderr)
+            if args.trace:
+                profiler.write_trace(normalize_path(args.trace))
 
-    # If errors were aggregated during plugin execution, report and exit with error.
-    if context["errors"]:
-        print("\nErrors encountered:")
-        for error in context["errors"]:
-            print(f"- {error}")
-        sys.exit(1)
+    # With '-o -' stdout carries the bundle itself, so reports go to stderr.
+    report = sys.stderr if context["output"] == "-" else sys.stdout
+    errors: ErrorCollector = context["errors"]
+
+    # Only real errors fail the run; warnings (missing, oversized files...) are listed.
+    if errors.has_errors():
+        report.write(errors.format_report())
+        return 1
 
     # Display a summary of the saved files using the centralized display function.
-    display_summary(context)
+    if context["output"] != "-":
+        display_summary(context)
+    if errors:
+        report.write(errors.format_report())
+    return 0
+
+
+def main() -> None:
+    """
+    Main entry point for the savecode CLI.
+
+    Dispatches the 'cache', 'extract' and 'unpack' subcommands and the daemon/client
+    modes, otherwise runs savecode in this process.
+
+    Returns:
+        None
+    """
+    argv = sys.argv[1:]
+    if argv[:1] == ["cache"]:
+        sys.exit(cache_command(argv[1:]))
+    if argv[:1] in (["extract"], ["unpack"]):
+        from savecode.bundle_index import extract_command, unpack_command
+
+        command = extract_command if argv[0] == "extract" else unpack_command
+        sys.exit(command(argv[1:]))
+    if "--client" in argv:
+        from savecode.daemon import client_main
+
+        sys.exit(client_main([arg for arg in argv if arg != "--client"]))
+    if "--daemon" in argv:
+        from savecode.daemon import serve_main
+
+        sys.exit(serve_main(argv))
+
+    status = run(argv)
+    if status:
+        sys.exit(status)
 
 
 if __name__ == "__main__":
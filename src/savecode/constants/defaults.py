@@ -0,0 +1,10 @@
+"""
+savecode/constants/defaults.py - Default option values shared by the CLI and the API.
+"""
+
+DEFAULT_EXTENSIONS = ["py"]
+
+DEFAULT_SKIP = ["rnn_src", "node_modules", "dist", "build", ".git"]
+
+# With --outline, non-Python files are cut to about this many bytes (0 = whole).
+DEFAULT_OUTLINE_HEAD = 4096
@@ -0,0 +1,303 @@
+"""
+savecode/daemon.py - Resident server and thin client for repeated invocations.
+
+`savecode --daemon` keeps one process alive with plugins imported, directory walks
+memoized in a MemoryCache and file contents held in a ContentCache. Both are
+revalidated against mtimes on every request, so edits are always picked up.
+`savecode --client ...` sends its argv, working directory and SAVECODE_* environment
+over a Unix domain socket. Stdout and stderr are streamed back as they are written;
+use `-o -` to receive the bundle itself.
+
+Wire format: newline-delimited JSON. The client sends a single request object
+({"argv", "cwd", "env"}). The server answers with {"stream": "stdout"|"stderr",
+"data": ...} frames and a final {"exit": status}. Requests are served one at a time,
+because each one runs with the client's working directory and environment.
+"""
+
+import io
+import json
+import logging
+import os
+import socket
+import sys
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger("savecode.daemon")
+
+# Environment variables with this prefix are forwarded from the client per request.
+ENV_PREFIX = "SAVECODE_"
+
+
+def default_socket_path() -> str:
+    """Return the per-user socket path (under XDG_RUNTIME_DIR when available).
+
+    Returns:
+        str: The socket path.
+    """
+    base = os.getenv("XDG_RUNTIME_DIR") or os.getenv("TMPDIR") or "/tmp"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(base, f"savecode-{uid}.sock")
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]) -> None:
+    conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _split_socket_option(argv: List[str]) -> Tuple[str, List[str]]:
+    """Remove --socket PATH / --socket=PATH from *argv* and return (path, rest)."""
+    path = os.getenv("SAVECODE_SOCKET") or default_socket_path()
+    rest: List[str] = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--socket":
+            path = next(args, path)
+        elif arg.startswith("--socket="):
+            path = arg.split("=", 1)[1]
+        else:
+            rest.append(arg)
+    return path, rest
+
+
+def _is_listening(path: str) -> bool:
+    """Return True if a daemon is accepting connections on *path*."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards every write to the client as a frame."""
+
+    def __init__(self, conn: socket.socket, stream: str):
+        super().__init__()
+        self._conn = conn
+        self._stream = stream
+        self._broken = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data and not self._broken:
+            try:
+                _send(self._conn, {"stream": self._stream, "data": data})
+            except OSError:
+                # The client went away; finish the run without it.
+                self._broken = True
+        return len(data)
+
+
+@contextmanager
+def _request_scope(cwd: str, env: Dict[str, str]) -> Iterator[None]:
+    """Run with the client's working directory and SAVECODE_* environment."""
+    saved_cwd = os.getcwd()
+    saved_env = {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+    for key in saved_env:
+        del os.environ[key]
+    os.environ.update(env)
+    try:
+        os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        for key in [k for k in os.environ if k.startswith(ENV_PREFIX)]:
+            del os.environ[key]
+        os.environ.update(saved_env)
+
+
+@contextmanager
+def _log_to(stream: io.TextIOBase) -> Iterator[None]:
+    """Point the savecode log handlers at *stream* for the duration of a request."""
+    handlers = [
+        h
+        for h in logging.getLogger("savecode").handlers
+        if isinstance(h, logging.StreamHandler)
+    ]
+    previous = [h.setStream(stream) for h in handlers]
+    try:
+        yield
+    finally:
+        for handler, old in zip(handlers, previous):
+            if old is not None:
+                handler.setStream(old)
+
+
+class DaemonServer:
+    """Serve savecode runs over a Unix socket with caches that outlive each run."""
+
+    def __init__(self, socket_path: str, idle_timeout: float = 900.0):
+        """
+        Args:
+            socket_path (str): Where to listen.
+            idle_timeout (float, optional): Seconds without a request before the
+                server exits; 0 disables the timeout. Defaults to 900.
+        """
+        from savecode.utils.cache import ContentCache, MemoryCache
+
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+        self.state: Dict[str, Any] = {
+            "cache": MemoryCache(),
+            "content_cache": ContentCache(),
+        }
+
+    def serve_forever(self) -> None:
+        """Accept and answer requests until idle for longer than the timeout."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # stale: callers check _is_listening first
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)  # socket is private to this user
+        try:
+            listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        listener.listen()
+        listener.settimeout(self.idle_timeout or None)
+        logger.info("Listening on %s", self.socket_path)
+        try:
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    logger.info("Idle for %ss; shutting down.", self.idle_timeout)
+                    break
+                with conn:
+                    conn.settimeout(None)
+                    self.handle(conn)
+        finally:
+            listener.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def handle(self, conn: socket.socket) -> None:
+        """Read one request from *conn*, run it and stream the results back."""
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+        try:
+            request = json.loads(line)
+            argv = [str(arg) for arg in request["argv"]]
+            cwd = str(request["cwd"])
+            env = {
+                str(k): str(v)
+                for k, v in request.get("env", {}).items()
+                if str(k).startswith(ENV_PREFIX)
+            }
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Malformed request ignored: %s", e)
+            return
+
+        out = _FrameWriter(conn, "stdout")
+        err = _FrameWriter(conn, "stderr")
+        status = self._run(argv, cwd, env, out, err)
+        self.requests += 1
+        try:
+            _send(conn, {"exit": status})
+        except OSError:
+            pass
+
+    def _run(
+        self,
+        argv: List[str],
+        cwd: str,
+        env: Dict[str, str],
+        out: _FrameWriter,
+        err: _FrameWriter,
+    ) -> int:
+        from savecode.cli import run
+
+        with redirect_stdout(out), redirect_stderr(err), _log_to(err):
+            try:
+                with _request_scope(cwd, env):
+                    return run(argv, self.state)
+            except SystemExit as e:  # argparse errors, --help, --version
+                if e.code is None or isinstance(e.code, int):
+                    return e.code or 0
+                print(e.code, file=sys.stderr)
+                return 1
+            except Exception as e:
+                logger.exception("Request failed: %s", e)
+                return 1
+
+
+def serve_main(argv: List[str]) -> int:
+    """
+    Handle `savecode --daemon [--socket PATH] [--idle-timeout SECONDS]`.
+
+    Args:
+        argv (List[str]): Command-line arguments.
+
+    Returns:
+        int: Process exit status.
+    """
+    from savecode.utils.cli_args import parse_arguments
+    from savecode.utils.logger import configure_logging
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("savecode --daemon needs Unix domain sockets.", file=sys.stderr)
+        return 1
+    args, _ = parse_arguments(argv)
+    configure_logging(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    path = args.socket or default_socket_path()
+    if _is_listening(path):
+        print(f"A savecode daemon is already listening on {path}", file=sys.stderr)
+        return 1
+    server = DaemonServer(path, args.idle_timeout)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def client_main(argv: List[str]) -> int:
+    """
+    Forward *argv* to a running daemon and relay its output.
+
+    Falls back to running in this process when no daemon is listening (or Unix
+    sockets are unavailable), so callers can always use --client.
+
+    Args:
+        argv (List[str]): Command-line arguments, without --client.
+
+    Returns:
+        int: The run's exit status.
+    """
+    path, argv = _split_socket_option(argv)
+    conn = None
+    if hasattr(socket, "AF_UNIX"):
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.connect(path)
+        except OSError:
+            conn.close()
+            conn = None
+    if conn is None:
+        from savecode.cli import run
+
+        return run(argv)
+
+    with conn:
+        env = {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+        _send(conn, {"argv": argv, "cwd": os.getcwd(), "env": env})
+        with conn.makefile("rb") as reader:
+            for line in reader:
+                message = json.loads(line)
+                if "exit" in message:
+                    return int(message["exit"])
+                stream = sys.stderr if message.get("stream") == "stderr" else sys.stdout
+                stream.write(message["data"])
+                stream.flush()
+    print("savecode daemon closed the connection unexpectedly.", file=sys.stderr)
+    return 1
+
+
+# End of savecode/daemon.py
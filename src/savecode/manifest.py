@@ -0,0 +1,231 @@
+"""
+savecode/manifest.py - Batch mode: build many bundles in one process.
+
+`savecode --manifest jobs.toml` runs every job in the manifest. The work is split
+into three phases:
+
+1. Jobs collect their files in parallel, sharing one ListingCache, so each
+   directory is listed once.
+2. Every distinct text file any job needs is read once into a shared ContentCache,
+   up to SAVECODE_MANIFEST_CACHE_MB (default 256 MB); files past that budget are
+   read again by each job that needs them.
+3. Each job's bundle is assembled from that shared content and written, in
+   parallel across jobs.
+
+Manifest format (paths are relative to the manifest's directory):
+
+    [defaults]                      # optional, merged into every job
+    skip = ["node_modules", "migrations"]
+
+    [[job]]
+    name = "api-py"                 # optional, defaults to the output file name
+    roots = ["services/api"]
+    ext = ["py"]
+    output = "bundles/api-py.txt"
+
+Jobs accept roots, files, ext, skip, git, staged, unstaged and all_ext, with the same
+meaning as the CLI flags. Bundles are not copied to the clipboard.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from savecode.api import build_context, collect_files
+from savecode.plugins.save import (
+    MAX_SIZE_MB,
+    format_banner,
+    format_footer,
+    iter_sections,
+)
+from savecode.utils.binary import is_binary_file
+from savecode.utils.cache import DEFAULT_MAX_MB, ContentCache, ListingCache
+from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.notebook import is_notebook
+from savecode.utils.path_utils import relative_path
+
+logger = logging.getLogger("savecode.manifest")
+
+_LIST_KEYS = ("roots", "files", "ext", "skip")
+_BOOL_KEYS = ("git", "staged", "unstaged", "all_ext")
+JOB_KEYS = frozenset(("name", "output") + _LIST_KEYS + _BOOL_KEYS)
+
+
+class ManifestError(ValueError):
+    """Raised for an unreadable or invalid manifest."""
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """Parse and validate a TOML manifest.
+
+    Args:
+        path (str): Manifest file path.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per job, with defaults merged in, list options
+        normalised to lists and 'output' made absolute.
+
+    Raises:
+        ManifestError: If the file cannot be read or a job is invalid.
+    """
+    import tomllib
+
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ManifestError(f"cannot read {path}: {e}") from e
+
+    defaults = data.get("defaults", {})
+    tables = data.get("job", [])
+    if not isinstance(defaults, dict) or not isinstance(tables, list) or not tables:
+        raise ManifestError(f"{path} must define at least one [[job]] table")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs: List[Dict[str, Any]] = []
+    for number, table in enumerate(tables, 1):
+        job = {**defaults, **table}
+        unknown = sorted(set(job) - JOB_KEYS)
+        if unknown:
+            raise ManifestError(f"job {number}: unknown keys {', '.join(unknown)}")
+        if not isinstance(job.get("output"), str):
+            raise ManifestError(f"job {number}: 'output' is required")
+        for key in _LIST_KEYS:
+            if isinstance(job.get(key), str):
+                job[key] = [job[key]]
+        job["output"] = os.path.normpath(os.path.join(base_dir, job["output"]))
+        job.setdefault("name", os.path.basename(job["output"]))
+        job["base_dir"] = base_dir
+        jobs.append(job)
+
+    outputs = [job["output"] for job in jobs]
+    if len(set(outputs)) != len(outputs):
+        raise ManifestError("two jobs write the same output file")
+    return jobs
+
+
+def _warm_list(paths: Iterable[str], budget: int) -> List[Tuple[str, os.stat_result]]:
+    """Pick the files worth pre-reading, in order, until *budget* bytes are used.
+
+    Oversized files, notebooks (saved from their cells, not the cache) and paths
+    that cannot be stat'ed (including archive members) are left to the jobs.
+    """
+    picked: List[Tuple[str, os.stat_result]] = []
+    max_bytes = MAX_SIZE_MB * 1024 * 1024
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if st.st_size > min(max_bytes, budget) or is_notebook(path):
+            continue
+        budget -= st.st_size
+        picked.append((path, st))
+    return picked
+
+
+def _warm(contents: ContentCache, path: str, st: os.stat_result) -> None:
+    """Read a text file into the shared content cache (errors surface per job later).
+
+    Binary files are only sniffed; the remembered verdict lets the jobs skip them
+    without reading them again.
+    """
+    try:
+        if not is_binary_file(path, st):
+            contents.read(path, st)
+    except OSError:
+        pass
+
+
+def _write_job(job: Dict[str, Any], context: Dict[str, Any], files: List[str]) -> int:
+    """Assemble one job's bundle from the shared caches and write it."""
+    rel_paths: List[str] = []
+    sections: List[str] = []
+    for _, rel_path, section in iter_sections(files, context):
+        rel_paths.append(rel_path)
+        sections.append(section)
+    output = job["output"]
+    try:
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as out:
+            out.write(format_banner(rel_paths))
+            out.writelines(sections)
+            out.write(format_footer(len(rel_paths), output))
+    except OSError as e:
+        log_and_record_error(
+            f"Error writing to output file {output}: {e} (during save process)",
+            context,
+            logger,
+            category="write",
+            path=output,
+        )
+    return len(rel_paths)
+
+
+def run_manifest(path: str, max_workers: Optional[int] = None) -> int:
+    """Run every job in the manifest at *path* and print a line per job.
+
+    Args:
+        path (str): Manifest file path.
+        max_workers (int, optional): Thread pool size. Defaults to the
+            ThreadPoolExecutor default.
+
+    Returns:
+        int: 0 on success, 1 if any job recorded errors.
+
+    Raises:
+        ManifestError: If the manifest is invalid.
+    """
+    jobs = load_manifest(path)
+    listing = ListingCache()
+    # One batch, one snapshot: trust even just-modified files.
+    max_mb = float(os.getenv("SAVECODE_MANIFEST_CACHE_MB", DEFAULT_MAX_MB))
+    contents = ContentCache(max_bytes=int(max_mb * 1024 * 1024), racy_window_ns=0)
+    contexts = []
+    for job in jobs:
+        try:
+            context = build_context(
+                job.get("roots"),
+                job.get("files"),
+                job.get("ext"),
+                job.get("skip"),
+                bool(job.get("git")),
+                bool(job.get("staged")),
+                bool(job.get("unstaged")),
+                bool(job.get("all_ext")),
+                job["base_dir"],
+                None,
+            )
+        except ValueError as e:
+            raise ManifestError(f"job {job['name']}: {e}") from e
+        context.update(listing_cache=listing, content_cache=contents)
+        contexts.append(context)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        file_lists = list(pool.map(collect_files, contexts))
+        needed = dict.fromkeys(p for files in file_lists for p in files)
+        warm = _warm_list(needed, contents.max_bytes)
+        list(pool.map(lambda item: _warm(contents, *item), warm))
+        counts = list(pool.map(_write_job, jobs, contexts, file_lists))
+
+    logger.info(
+        "Manifest: %d jobs, %d directories listed, %d files read",
+        len(jobs),
+        listing.listed,
+        contents.misses,
+    )
+    failed = False
+    lines = []
+    for job, context, count in zip(jobs, contexts, counts):
+        lines.append(f"{job['name']}: {count} files -> {relative_path(job['output'])}")
+        failed = failed or context["errors"].has_errors()
+    for job, context in zip(jobs, contexts):
+        report = context["errors"].format_report()
+        if report:
+            lines.append(f"\n[{job['name']}]{report.rstrip()}")
+    print("\n".join(lines))
+    return 1 if failed else 0
+
+
+# End of savecode/manifest.py
@@ -2,5 +2,19 @@
 savecode/plugin_manager/__init__.py - Initializes the plugin_manager module for savecode.
 """
 
-__all__ = ["register_plugin", "run_plugins", "list_plugins"]
-from .manager import register_plugin, run_plugins, list_plugins
+__all__ = [
+    "register_plugin",
+    "run_plugins",
+    "list_plugins",
+    "PluginManager",
+    "PluginSpec",
+    "PluginCycleError",
+]
+from .manager import (
+    register_plugin,
+    run_plugins,
+    list_plugins,
+    PluginManager,
+    PluginSpec,
+    PluginCycleError,
+)
@@ -2,13 +2,15 @@
 savecode/plugin_manager/decorators.py - Decorators for plugin error handling.
 
 This module provides a decorator to wrap plugin run() methods, catch exceptions,
-log them, and record the error in the shared context.
+log them, and record the error in the shared context. When profiling is enabled the
+wrapped run is also recorded as a "plugin" span.
 """
 
 import functools
 import logging
 from typing import Any, Callable, Dict, TypeVar, cast
 from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.profiler import span
 
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -16,7 +18,8 @@ F = TypeVar("F", bound=Callable[..., Any])
 def handle_plugin_errors(func: F) -> F:
     """
     Decorator to wrap a plugin's run() method to catch exceptions, log the error,
-    and record the error in the shared context.
+    and record the error in the shared context. The run is timed as a "plugin" span
+    when context holds a profiler.
 
     Args:
         func (Callable): The plugin's run method.
@@ -27,14 +30,20 @@ def handle_plugin_errors(func: F) -> F:
 
     @functools.wraps(func)
     def wrapper(self: Any, context: Dict[str, Any], *args: Any, **kwargs: Any) -> Any:
-        try:
-            return func(self, context, *args, **kwargs)
-        except Exception as e:
-            plugin_name = self.__class__.__name__
-            message = f"Unhandled exception in plugin {plugin_name}: {e}"
-            # Use the plugin's logger if available; otherwise, use a default logger.
-            logger = getattr(self, "logger", logging.getLogger(plugin_name))
-            log_and_record_error(message, context, logger, exc_info=True)
-            return None
-
+        plugin_name = self.__class__.__name__
+        with span(context, plugin_name, "plugin") as stats:
+            try:
+                return func(self, context, *args, **kwargs)
+            except Exception as e:
+                stats["failed"] = True
+                message = f"Unhandled exception in plugin {plugin_name}: {e}"
+                # Use the plugin's logger if available; otherwise, use a default logger.
+                logger = getattr(self, "logger", logging.getLogger(plugin_name))
+                log_and_record_error(
+                    message, context, logger, category="plugin", exc_info=True
+                )
+                return None
+
+    # Lets the plugin manager know it need not add its own span around this run.
+    setattr(wrapper, "__savecode_profiled__", True)
     return cast(F, wrapper)
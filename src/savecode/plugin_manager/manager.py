@@ -2,64 +2,552 @@
 savecode/plugin_manager/manager.py - Plugin Manager for savecode.
 
 Encapsulates plugin registration, execution, and management of plugin ordering and isolation.
+
+Plugins may declare which context keys they ``provides`` and ``requires``. The manager
+turns those declarations into a dependency graph, runs independent plugins concurrently
+on a thread pool and skips plugins whose work is not needed. Plugins that declare
+neither fall back to the integer ``order`` and act as barriers in the schedule.
+
+Plugins are discovered from lightweight descriptors: the built-in ones in
+savecode.plugins.specs and third-party ones exposed through the "savecode.plugins"
+entry-point group. A descriptor names its plugin class as "module:Class", and that
+module is only imported once the plugin is actually about to run.
 """
 
+import importlib
+import json
 import logging
-from typing import Any, Dict, List, Tuple, Type, Callable, TypeVar
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from savecode.utils.cache import default_cache_dir
+from savecode.utils.profiler import span
+
+if TYPE_CHECKING:
+    from savecode.utils.cache import ResultCache
 
 # Define a TypeVar for plugins
 T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
+# Entry-point group third-party packages use to publish plugin descriptors.
+ENTRY_POINT_GROUP = "savecode.plugins"
+
+
+class PluginCycleError(ValueError):
+    """Raised when plugin provides/requires declarations form a dependency cycle."""
+
+
+class PluginSpec:
+    """Registration record describing a plugin and its data dependencies.
+
+    Attributes:
+        name: Plugin name (the class name for decorator-registered plugins).
+        plugin_class: The plugin class to instantiate, once loaded.
+        order: Integer execution order; lower values run earlier. Used to order plugins
+            providing the same key and as the fallback for undeclared plugins.
+        provides: Context keys the plugin populates.
+        requires: Context keys the plugin reads and must wait for.
+        flags: ``cli_opts`` keys that activate the plugin; empty means always active.
+        target: "module:Class" reference imported lazily when ``plugin_class`` is unset.
+    """
+
+    # A plain slotted class rather than a dataclass: importing dataclasses (and the
+    # inspect module behind it) costs more than the rest of the manager at startup.
+    __slots__ = (
+        "name",
+        "plugin_class",
+        "order",
+        "provides",
+        "requires",
+        "flags",
+        "target",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        plugin_class: Optional[Type[Any]] = None,
+        order: int = 100,
+        provides: Iterable[str] = (),
+        requires: Iterable[str] = (),
+        flags: Iterable[str] = (),
+        target: Optional[str] = None,
+    ) -> None:
+        if plugin_class is None and not target:
+            raise ValueError(f"Plugin {name!r} needs a plugin_class or a target")
+        self.name = name
+        self.plugin_class = plugin_class
+        self.order = order
+        self.provides: Tuple[str, ...] = tuple(provides)
+        self.requires: Tuple[str, ...] = tuple(requires)
+        self.flags: Tuple[str, ...] = tuple(flags)
+        self.target = target
+
+    def __repr__(self) -> str:
+        return (
+            f"PluginSpec(name={self.name!r}, order={self.order}, "
+            f"provides={self.provides}, requires={self.requires}, "
+            f"flags={self.flags}, target={self.target!r})"
+        )
+
+    def copy(self) -> "PluginSpec":
+        """Return an independent copy, so shared descriptors are never mutated."""
+        return PluginSpec(
+            self.name,
+            self.plugin_class,
+            self.order,
+            self.provides,
+            self.requires,
+            self.flags,
+            self.target,
+        )
+
+    @property
+    def declared(self) -> bool:
+        """Whether the plugin takes part in key-based scheduling."""
+        return bool(self.provides or self.requires)
+
+    def load(self) -> Type[Any]:
+        """Return the plugin class, importing ``target`` on first use.
+
+        Returns:
+            Type[Any]: The plugin class.
+        """
+        if self.plugin_class is None:
+            module_name, _, attr = str(self.target).partition(":")
+            self.plugin_class = _resolve(module_name, attr or self.name)
+        return self.plugin_class
+
+
+def _resolve(module_name: str, attr: str) -> Any:
+    """Import *module_name* and return its (possibly dotted) attribute *attr*."""
+    obj: Any = importlib.import_module(module_name.strip())
+    for part in attr.split("[")[0].strip().split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _coerce_spec(name: str, descriptor: Any) -> PluginSpec:
+    """Turn an entry-point descriptor (a PluginSpec or a dict) into a PluginSpec."""
+    if isinstance(descriptor, PluginSpec):
+        return descriptor.copy()
+    if isinstance(descriptor, dict):
+        fields = dict(descriptor)
+        fields.setdefault("name", name)
+        return PluginSpec(**fields)
+    raise TypeError(
+        f"Entry point {name!r} must resolve to a PluginSpec or dict, "
+        f"got {type(descriptor).__name__}"
+    )
+
+
+def _read_entry_points_txt(path: str) -> List[Tuple[str, str]]:
+    """Return the entry-point group's (name, value) pairs from one entry_points.txt."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+    pairs: List[Tuple[str, str]] = []
+    section = None
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith(("#", ";")):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip()
+        elif section == ENTRY_POINT_GROUP and "=" in line:
+            name, _, value = line.partition("=")
+            pairs.append((name.strip(), value.strip()))
+    return pairs
+
+
+def _scan_entry_points() -> List[Tuple[str, str]]:
+    """Collect the entry-point group from the distributions installed on sys.path.
+
+    Reads entry_points.txt from *.dist-info and *.egg-info directories directly,
+    which avoids importing importlib.metadata (tens of milliseconds) on a cold start.
+    As with importlib.metadata, the first distribution of a given name wins. A
+    zipped sys.path entry falls back to importlib.metadata, which can read inside it.
+    """
+    entries: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    for entry in sys.path:
+        path = entry or "."
+        if os.path.isfile(path):
+            from importlib.metadata import entry_points
+
+            return [(ep.name, ep.value) for ep in entry_points(group=ENTRY_POINT_GROUP)]
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext not in (".dist-info", ".egg-info"):
+                continue
+            dist = stem.split("-")[0].replace(".", "_").lower()
+            if dist in seen:
+                continue
+            seen.add(dist)
+            entries += _read_entry_points_txt(
+                os.path.join(path, name, "entry_points.txt")
+            )
+    return entries
+
+
+def _entry_point_values() -> List[Tuple[str, str]]:
+    """Return (name, "module:attr") pairs published under the entry-point group.
+
+    Scanning installed distributions is still a directory listing per sys.path entry,
+    so the result is kept in a small index file in the cache directory, stamped with
+    the mtimes of the sys.path entries (installing or removing a distribution changes
+    its directory's mtime). The script directory, sys.path[0], is left out of the
+    stamp so running from different projects does not invalidate the index.
+    """
+    stamp: Dict[str, Optional[int]] = {}
+    for entry in sys.path[1:]:
+        try:
+            stamp[entry] = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            stamp[entry] = None
+
+    index_path = os.path.join(default_cache_dir(), "entry_points.json")
+    try:
+        with open(index_path, encoding="utf-8") as fh:
+            index = json.load(fh)
+        if index.get("group") == ENTRY_POINT_GROUP and index.get("stamp") == stamp:
+            return [(name, value) for name, value in index["entries"]]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    entries = _scan_entry_points()
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"group": ENTRY_POINT_GROUP, "stamp": stamp, "entries": entries}, fh
+            )
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.debug("Could not write entry-point index %s: %s", index_path, e)
+    return entries
+
+
+def entry_point_specs() -> List[PluginSpec]:
+    """Load plugin descriptors published under the "savecode.plugins" group.
+
+    Only the descriptor objects are loaded here; plugin modules stay unimported.
+    Broken descriptors are logged and ignored.
+
+    Returns:
+        List[PluginSpec]: Descriptors from installed distributions.
+    """
+    specs: List[PluginSpec] = []
+    for name, value in _entry_point_values():
+        try:
+            module_name, _, attr = value.partition(":")
+            specs.append(_coerce_spec(name, _resolve(module_name, attr)))
+        except Exception as e:
+            logger.warning("Ignoring plugin entry point %s: %s", name, e)
+    return specs
+
+
+def _sort_key(item: Tuple[int, PluginSpec]) -> Tuple[int, int]:
+    index, spec = item
+    return spec.order, index
+
+
+def build_dependencies(specs: Sequence[PluginSpec]) -> Dict[int, Set[int]]:
+    """Build the dependency graph for *specs*.
+
+    The graph maps each spec index to the indices it must wait for:
+      - a plugin requiring a key waits for every plugin providing it;
+      - plugins providing the same key run one after another by ``order``;
+      - plugins without declarations wait for all lower-ordered plugins and block all
+        higher-ordered ones, preserving the historical strictly ordered behaviour.
+
+    Args:
+        specs (Sequence[PluginSpec]): Registered plugin specs.
+
+    Returns:
+        Dict[int, Set[int]]: Mapping of spec index to the indices it depends on.
+    """
+    ranked = sorted(enumerate(specs), key=_sort_key)
+    position = {index: pos for pos, (index, _) in enumerate(ranked)}
+    deps: Dict[int, Set[int]] = {index: set() for index in range(len(specs))}
+
+    providers: Dict[str, List[int]] = {}
+    for index, spec in ranked:
+        for key in spec.provides:
+            providers.setdefault(key, []).append(index)
+
+    for chain in providers.values():
+        for earlier, later in zip(chain, chain[1:]):
+            deps[later].add(earlier)
+
+    for index, spec in enumerate(specs):
+        for key in spec.requires:
+            deps[index].update(p for p in providers.get(key, []) if p != index)
+
+    for index, spec in enumerate(specs):
+        if spec.declared:
+            continue
+        for other in range(len(specs)):
+            if position[other] < position[index]:
+                deps[index].add(other)
+            elif position[other] > position[index]:
+                deps[other].add(index)
+    return deps
+
+
+def topological_order(specs: Sequence[PluginSpec]) -> List[int]:
+    """Return spec indices in a valid execution order.
+
+    Ties are broken by ``order`` and then registration order.
+
+    Args:
+        specs (Sequence[PluginSpec]): Registered plugin specs.
+
+    Returns:
+        List[int]: Spec indices in execution order.
+
+    Raises:
+        PluginCycleError: If the declarations form a cycle.
+    """
+    deps = build_dependencies(specs)
+    remaining = {index: set(d) for index, d in deps.items()}
+    ordered: List[int] = []
+    while remaining:
+        ready = [i for i, d in remaining.items() if not d]
+        if not ready:
+            names = ", ".join(sorted(specs[i].name for i in remaining))
+            raise PluginCycleError(f"Plugin dependency cycle detected among: {names}")
+        ready.sort(key=lambda i: (specs[i].order, i))
+        for index in ready:
+            del remaining[index]
+            ordered.append(index)
+        for d in remaining.values():
+            d.difference_update(ready)
+    return ordered
+
+
+def is_needed(spec: PluginSpec, context: Dict[str, Any]) -> bool:
+    """Decide whether a plugin has any work to do for *context*.
+
+    A plugin is skipped when none of its activating flags is set in ``cli_opts`` or
+    when every key it provides has already been populated by an earlier plugin.
+
+    Args:
+        spec (PluginSpec): The plugin spec to check.
+        context (Dict[str, Any]): Shared context dictionary.
+
+    Returns:
+        bool: True if the plugin should run.
+    """
+    if spec.flags:
+        cli_opts = context.get("cli_opts", {})
+        if not any(cli_opts.get(flag) for flag in spec.flags):
+            return False
+    if spec.provides and all(context.get(k) is not None for k in spec.provides):
+        return False
+    return True
+
 
 class PluginManager:
     """Encapsulates the registry and execution of plugins."""
 
-    def __init__(self) -> None:
-        self.registry: List[Tuple[int, Type[Any]]] = []
-
-    def register_plugin(self, plugin_class: Type[T], order: int = 100) -> Type[T]:
-        """Register a plugin class with an optional execution order.
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        autodiscover: bool = False,
+        cache: Optional["ResultCache"] = None,
+    ) -> None:
+        self.registry: List[PluginSpec] = []
+        self.max_workers = max_workers
+        self.autodiscover = autodiscover
+        # Cross-run result cache handed to plugins as context["cache"]; None disables it.
+        self.cache = cache
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def register_plugin(
+        self,
+        plugin_class: Type[T],
+        order: int = 100,
+        provides: Iterable[str] = (),
+        requires: Iterable[str] = (),
+        flags: Iterable[str] = (),
+    ) -> Type[T]:
+        """Register a plugin class with an optional execution order and dependencies.
 
         Args:
             plugin_class (Type[T]): The plugin class to register.
             order (int, optional): The execution order; lower values run earlier. Defaults to 100.
+            provides (Iterable[str], optional): Context keys the plugin populates.
+            requires (Iterable[str], optional): Context keys the plugin depends on.
+            flags (Iterable[str], optional): ``cli_opts`` keys that activate the plugin.
 
         Returns:
             Type[T]: The registered plugin class.
+
+        Raises:
+            PluginCycleError: If the new plugin introduces a dependency cycle.
         """
-        self.registry.append((order, plugin_class))
+        spec = PluginSpec(
+            name=plugin_class.__name__,
+            plugin_class=plugin_class,
+            order=order,
+            provides=tuple(provides),
+            requires=tuple(requires),
+            flags=tuple(flags),
+        )
+        self.register_spec(spec)
         return plugin_class
 
-    def run_plugins(self, context: Dict[str, Any]) -> None:
-        """Instantiate and run all registered plugins in sequence.
+    def register_spec(self, spec: PluginSpec) -> None:
+        """Register a plugin descriptor, replacing any entry with the same name.
+
+        Replacing by name lets a lazily imported module's @register_plugin decorator
+        bind its class to the descriptor that triggered the import.
 
         Args:
-            context (Dict[str, Any]): Dictionary containing the shared context and data.
+            spec (PluginSpec): The descriptor to register.
+
+        Raises:
+            PluginCycleError: If the descriptor introduces a dependency cycle.
+        """
+        with self._lock:
+            candidate = [s for s in self.registry if s.name != spec.name] + [spec]
+            topological_order(candidate)  # raises on cycles, before we commit
+            self.registry = candidate
+
+    def discover(self) -> None:
+        """Register the built-in descriptors plus any published via entry points.
+
+        Names that are already registered are left alone, so explicit registrations
+        win over discovered ones.
 
         Returns:
             None
         """
-        # Auto-import built-in plugins if nobody did so yet
-        if not self.registry:
-            try:
-                import savecode.plugins  # noqa: F401  (side-effect registration)
-            except ImportError:  # pragma: no cover
-                pass
+        from savecode.plugins.specs import BUILTIN_SPECS
 
-        sorted_plugins = sorted(self.registry, key=lambda item: item[0])
-        for _, plugin_class in sorted_plugins:
-            plugin_instance = plugin_class()  # Delayed instantiation.
+        known = {s.name for s in self.registry}
+        for spec in [s.copy() for s in BUILTIN_SPECS] + entry_point_specs():
+            if spec.name in known:
+                logger.debug("Plugin %s already registered; skipping", spec.name)
+                continue
             try:
+                self.register_spec(spec)
+            except PluginCycleError as e:
+                logger.error("Cannot register plugin %s: %s", spec.name, e)
+                continue
+            known.add(spec.name)
+        self._discovered = True
+
+    def run_plugins(self, context: Dict[str, Any]) -> None:
+        """Instantiate and run all registered plugins, honouring their dependencies.
+
+        Plugins whose dependencies are satisfied run concurrently on a thread pool.
+        When the manager has a result cache, plugins can memoize steps through
+        context["cache"] (see savecode.utils.cache.memoize).
+
+        Args:
+            context (Dict[str, Any]): Dictionary containing the shared context and data.
+
+        Returns:
+            None
+        """
+        if self.autodiscover and not self._discovered:
+            self.discover()
+        if self.cache is not None:
+            context.setdefault("cache", self.cache)
+
+        specs = list(self.registry)
+        deps = build_dependencies(specs)
+        topological_order(specs)  # re-validate in case the registry was edited directly
+        dependents: Dict[int, List[int]] = {i: [] for i in deps}
+        for index, d in deps.items():
+            for dep in d:
+                dependents[dep].append(index)
+        waiting = {index: len(d) for index, d in deps.items()}
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="savecode-plugin"
+        )
+        running: Dict[Future[None], int] = {}
+
+        def release(index: int) -> List[int]:
+            freed: List[int] = []
+            for child in dependents[index]:
+                waiting[child] -= 1
+                if waiting[child] == 0:
+                    freed.append(child)
+            return freed
+
+        def schedule(indices: List[int]) -> None:
+            queue = sorted(indices, key=lambda i: (specs[i].order, i))
+            while queue:
+                index = queue.pop(0)
+                spec = specs[index]
+                if is_needed(spec, context):
+                    running[pool.submit(self._run_one, spec, context)] = index
+                else:
+                    logger.debug("Skipping plugin %s (not needed)", spec.name)
+                    if context.get("profiler") is not None:
+                        context["profiler"].instant(spec.name, "plugin", skipped=True)
+                    queue.extend(release(index))
+                    queue.sort(key=lambda i: (specs[i].order, i))
+
+        try:
+            with span(context, "run_plugins", "run", plugins=len(specs)):
+                schedule([i for i, n in waiting.items() if n == 0])
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    freed: List[int] = []
+                    for future in done:
+                        freed.extend(release(running.pop(future)))
+                    schedule(freed)
+        finally:
+            pool.shutdown(wait=not running, cancel_futures=True)
+
+    @staticmethod
+    def _run_one(spec: PluginSpec, context: Dict[str, Any]) -> None:
+        """Import (if needed), instantiate and run a single plugin, logging any escaped exception."""
+        try:
+            plugin_instance = spec.load()()  # Delayed import and instantiation.
+            if getattr(plugin_instance.run, "__savecode_profiled__", False):
                 plugin_instance.run(context)
-            except Exception as e:
-                logger.error(
-                    "Error running plugin %s: %s",
-                    plugin_class.__name__,
-                    e,
-                    exc_info=True,
-                )
+            else:
+                with span(context, spec.name, "plugin"):
+                    plugin_instance.run(context)
+        except Exception as e:
+            logger.error(
+                "Error running plugin %s: %s",
+                spec.name,
+                e,
+                exc_info=True,
+            )
 
     def list_plugins(self) -> List[str]:
         """List the names of all registered plugin classes in order of execution.
@@ -67,23 +555,36 @@ class PluginManager:
         Returns:
             List[str]: A list of plugin class names.
         """
-        sorted_plugins = sorted(self.registry, key=lambda item: item[0])
-        return [cls.__name__ for _, cls in sorted_plugins]
+        if self.autodiscover and not self._discovered:
+            self.discover()
+        specs = list(self.registry)
+        return [specs[i].name for i in topological_order(specs)]
 
     def clear_registry(self) -> None:
         """Clear the plugin registry to ensure test isolation.
 
+        Also turns off automatic discovery so the caller fully controls the registry.
+
         Returns:
             None
         """
-        self.registry.clear()
+        with self._lock:
+            self.registry = []
+            self.autodiscover = False
 
 
 # Create a global instance of PluginManager.
-plugin_manager = PluginManager()
+plugin_manager = PluginManager(autodiscover=True)
 
 
-def register_plugin(*args: Any, order: int = 100) -> Callable[[Type[T]], Type[T]]:
+def register_plugin(
+    *args: Any,
+    order: int = 100,
+    provides: Iterable[str] = (),
+    requires: Iterable[str] = (),
+    flags: Iterable[str] = (),
+    spec: Optional[PluginSpec] = None,
+) -> Callable[[Type[T]], Type[T]]:
     """Decorator to register a plugin class with an optional execution order.
 
     Can be used as:
@@ -91,22 +592,49 @@ def register_plugin(*args: Any, order: int = 100) -> Callable[[Type[T]], Type[T]
         class MyPlugin:
             ...
     or:
-        @register_plugin(order=10)
+        @register_plugin(order=10, provides=["all_files"], requires=["extensions"])
+        class MyPlugin:
+            ...
+    or, to take the metadata from a descriptor that is also published for lazy
+    discovery (as the built-in plugins do with savecode.plugins.specs):
+        @register_plugin(spec=MY_PLUGIN)
         class MyPlugin:
             ...
 
     Args:
         order (int, optional): Execution order; lower values run earlier. Defaults to 100.
+        provides (Iterable[str], optional): Context keys the plugin populates.
+        requires (Iterable[str], optional): Context keys the plugin depends on.
+        flags (Iterable[str], optional): ``cli_opts`` keys that activate the plugin.
+        spec (PluginSpec, optional): Descriptor supplying order, provides, requires
+            and flags; the other arguments are then ignored.
 
     Returns:
         Callable[[Type[T]], Type[T]]: A decorator that registers the plugin class.
+
+    Raises:
+        ValueError: If *spec* names a different class than the decorated one.
     """
     if args and len(args) == 1 and callable(args[0]):
         cls = args[0]
         return plugin_manager.register_plugin(cls, order=order)
 
     def decorator(cls: Type[T]) -> Type[T]:
-        return plugin_manager.register_plugin(cls, order=order)
+        if spec is not None:
+            if spec.name != cls.__name__:
+                raise ValueError(
+                    f"Descriptor {spec.name!r} cannot register class {cls.__name__!r}"
+                )
+            return plugin_manager.register_plugin(
+                cls,
+                order=spec.order,
+                provides=spec.provides,
+                requires=spec.requires,
+                flags=spec.flags,
+            )
+        return plugin_manager.register_plugin(
+            cls, order=order, provides=provides, requires=requires, flags=flags
+        )
 
     return decorator
 
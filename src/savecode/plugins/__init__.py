@@ -1,10 +1,8 @@
 """
 savecode/plugins/__init__.py - Initialize the plugins package for savecode.
+
+Plugin modules are no longer imported here; the plugin manager discovers them from
+the descriptors in savecode.plugins.specs and imports each one on first use.
 """
 
-# Import plugins to ensure they are registered.
-__all__ = ["gather", "save", "extra_args", "git_status"]
-from . import git_status
-from . import gather
-from . import save
-from . import extra_args
+__all__ = ["gather", "save", "extra_args", "git_status", "specs"]
@@ -7,6 +7,7 @@ and stores them in the shared context.
 import logging
 from typing import Any, Dict, List
 from savecode.plugin_manager.manager import register_plugin
+from savecode.plugins.specs import EXTRA_ARGS
 from savecode.plugin_manager.decorators import handle_plugin_errors
 from savecode.constants.reserved_keys import RESERVED_KEYS
 
@@ -44,7 +45,7 @@ def parse_extra_args(extra_args: List[str]) -> Dict[str, Any]:
     return parsed
 
 
-@register_plugin(order=10)
+@register_plugin(spec=EXTRA_ARGS)
 class ExtraArgsPlugin:
     """
     Processes extra command-line arguments into a key-value dictionary and stores the result in context.
@@ -6,17 +6,66 @@ while skipping those that match provided skip patterns.
 
 import os
 import logging
-from pathlib import Path
-from typing import Any, Dict, List
+import time
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 from savecode.plugin_manager.manager import register_plugin
+from savecode.plugins.specs import GATHER
 from savecode.plugin_manager.decorators import handle_plugin_errors
 from savecode.utils.path_utils import normalize_path
+from savecode.utils.path_record import path_table
 from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.profiler import span
+from savecode.utils.cache import RACY_WINDOW_NS, memoize
+from savecode.utils.archive import (
+    is_archive,
+    list_members,
+    member_path,
+    split_member_path,
+)
+from savecode.utils.recency import filter_recent
 
 logger = logging.getLogger("savecode.plugins.gather")
 
 
-def should_skip(path: str, skip_patterns: List[str]) -> bool:
+def _dirs_unchanged(cached: Dict[str, Any]) -> bool:
+    """Return True if every directory visited by a cached walk is unchanged.
+
+    Adding, removing or renaming an entry updates its parent directory's mtime, so
+    matching mtimes mean the cached file list is still exact.
+    """
+    for dirpath, mtime_ns in cached["dirs"]:
+        if mtime_ns >= cached["walked_ns"] - RACY_WINDOW_NS:
+            return False
+        try:
+            if os.stat(dirpath).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _skip_rules(
+    skip_patterns: Tuple[str, ...], cwd: str
+) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """Split skip patterns into normalized path fragments and bare names, once.
+
+    Path-style patterns are resolved against *cwd*, which is part of the cache key
+    because the daemon changes directory between requests.
+    """
+    fragments = []
+    names = set()
+    for pattern in skip_patterns:
+        norm_pattern = normalize_path(pattern)
+        if os.sep in pattern:
+            fragments.append(norm_pattern)
+        else:
+            names.add(os.path.basename(norm_pattern))
+    return tuple(fragments), frozenset(names)
+
+
+def should_skip(path: str, skip_patterns: List[str], normalized: bool = False) -> bool:
     """
     Determines whether a given path (directory or file) should be skipped based on provided skip patterns.
 
@@ -24,26 +73,75 @@ def should_skip(path: str, skip_patterns: List[str]) -> bool:
       - If the pattern contains a path separator, normalize and check if it is a substring of the normalized path.
       - Otherwise, check if the basename of the normalized pattern is present in the path's components.
 
+    The normalized patterns are computed once per distinct pattern list and working
+    directory.
+
     Args:
         path (str): The file or directory path to check.
         skip_patterns (List[str]): List of skip patterns.
+        normalized (bool, optional): *path* is already absolute and normalized (e.g.
+            joined onto a normalized walk root), so it is used as is.
 
     Returns:
         bool: True if the path should be skipped, False otherwise.
     """
-    norm_path = normalize_path(path)
-    for pattern in skip_patterns:
-        norm_pattern = normalize_path(pattern)
-        if os.sep in pattern:
-            if norm_pattern in norm_path:
-                return True
-        else:
-            if os.path.basename(norm_pattern) in norm_path.split(os.sep):
-                return True
-    return False
+    if not skip_patterns:
+        return False
+    fragments, names = _skip_rules(tuple(skip_patterns), os.getcwd())
+    norm_path = path if normalized else normalize_path(path)
+    if any(fragment in norm_path for fragment in fragments):
+        return True
+    return bool(names) and not names.isdisjoint(norm_path.split(os.sep))
+
+
+def _first_visit(path: str, visited: Set[Tuple[int, int]]) -> bool:
+    """Record directory *path* by identity; False if seen before or unreadable."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False  # broken symlink
+    identity = (st.st_dev, st.st_ino)
+    if identity in visited:
+        return False
+    visited.add(identity)
+    return True
+
+
+def dedupe_inodes(files: List[str], context: Dict[str, Any]) -> List[str]:
+    """Drop later paths that name an already listed file (same st_dev/st_ino).
+
+    The stat results are kept on the shared path records, so SavePlugin and the
+    recency filter reuse them. Archive members and unreadable files are kept.
+
+    Args:
+        files (List[str]): Gathered paths, already unique as strings.
+        context (Dict[str, Any]): Shared context holding the path table.
+
+    Returns:
+        List[str]: *files* with duplicates removed, in order.
+    """
+    paths = path_table(context)
+    seen: Set[Tuple[int, int]] = set()
+    unique = []
+    for file in files:
+        if split_member_path(file) is None:
+            try:
+                st = paths.get(file).stat()
+            except OSError:
+                st = None
+            if st is not None and st.st_ino:
+                identity = (st.st_dev, st.st_ino)
+                if identity in seen:
+                    logger.debug("Skipping %s: same file as an earlier path", file)
+                    continue
+                seen.add(identity)
+        unique.append(file)
+    if len(unique) < len(files):
+        logger.info("Dropped %d linked duplicate files.", len(files) - len(unique))
+    return unique
 
 
-@register_plugin(order=20)
+@register_plugin(spec=GATHER)
 class GatherPlugin:
     """Plugin for gathering Python files from directories and individual file paths."""
 
@@ -54,11 +152,21 @@ class GatherPlugin:
 
         Expects in context:
           - 'roots': List of directories or file paths.
-          - 'files': List of directories or file paths.
+          - 'files': List of directories or file paths. Zip, wheel and tar archives
+            contribute their matching members as "archive!/member" paths.
           - 'skip': List of skip patterns (for directories or files to ignore).
+          - 'newer_than_ns' (optional): Keep only files modified after this time.
+
+        With cli_opts['follow_symlinks'], symlinked directories are walked too; a
+        directory already visited under another path (same st_dev/st_ino) is not
+        entered again, which also stops symlink loops.
 
         Populates context with:
-          - 'all_files': Deduplicated list of gathered source files with specified extensions.
+          - 'all_files': Deduplicated list of gathered source files with specified
+            extensions. Paths naming the same file (hard links, symlinks) appear once.
+
+        The plugin manager skips this plugin when another provider (e.g. GitStatusPlugin)
+        has already populated 'all_files'.
 
         Args:
             context (Dict[str, Any]): Shared context containing parameters and data.
@@ -66,31 +174,36 @@ class GatherPlugin:
         Returns:
             None
         """
-        # Skip if all_files is already populated by another plugin (e.g. GitStatusPlugin)
-        if context.get("all_files") is not None:
-            return
-
         gathered_files: List[str] = []
         # Combine roots and files into a single list.
         entries = context.get("roots", []) + context.get("files", [])
         skip_patterns = context.get("skip", [])
+        paths = path_table(context)
         for entry in entries:
-            normalized_entry = normalize_path(entry)
-            if should_skip(normalized_entry, skip_patterns):
+            normalized_entry = paths.normalize(entry)
+            if should_skip(normalized_entry, skip_patterns, normalized=True):
                 continue
             if os.path.isdir(normalized_entry):
                 gathered_files.extend(
                     self.gather_files(normalized_entry, skip_patterns, context)
                 )
+            elif is_archive(normalized_entry):
+                gathered_files.extend(
+                    self.gather_archive(normalized_entry, skip_patterns, context)
+                )
             elif os.path.isfile(normalized_entry) and self._matches(
                 normalized_entry, context["extensions"]
             ):
                 gathered_files.append(normalized_entry)
             else:
                 warning_msg = f"{entry} is not a valid source file or directory."
-                log_and_record_error(warning_msg, context, logger)
-        # Deduplicate while preserving order.
-        deduped_files = list(dict.fromkeys(gathered_files))
+                log_and_record_error(
+                    warning_msg, context, logger, category="source", path=entry
+                )
+        # Deduplicate paths, then hard links and symlinked copies of the same file,
+        # while preserving order; then apply --changed-within/--newer-than.
+        deduped_files = dedupe_inodes(list(dict.fromkeys(gathered_files)), context)
+        deduped_files = filter_recent(deduped_files, context)
         context["all_files"] = deduped_files
         logger.info("Gathered %d unique source files.", len(deduped_files))
 
@@ -100,6 +213,9 @@ class GatherPlugin:
         """
         Recursively gather all source files with specified extensions from a normalized directory, skipping specified directories and files.
 
+        When a result cache is present in the context the walk is memoized per root,
+        skip list and extension set, and reused while no visited directory has changed.
+
         Args:
             root_dir (str): Normalized absolute directory path to search for source files.
             skip_patterns (List[str]): List of skip patterns for directories or files.
@@ -108,21 +224,127 @@ class GatherPlugin:
         Returns:
             List[str]: List of gathered source file paths.
         """
+        exts = context["extensions"]
+        follow = bool(context.get("cli_opts", {}).get("follow_symlinks"))
+        with span(context, "gather.walk", root=root_dir) as stats:
+            key = [root_dir, os.getcwd(), sorted(skip_patterns), sorted(exts)]
+            result = memoize(
+                context,
+                "gather",
+                key + ["follow"] if follow else key,
+                lambda: self._walk(root_dir, skip_patterns, context, stats),
+                validate=_dirs_unchanged,
+            )
+            if "dirs" not in stats:
+                stats["cached"] = True
+        py_files: List[str] = result["files"]
+        return py_files
+
+    def gather_archive(
+        self, archive: str, skip_patterns: List[str], context: Dict[str, Any]
+    ) -> List[str]:
+        """
+        List the matching members of a zip/wheel/tar archive as virtual paths.
+
+        Members are enumerated from the zip central directory or the tar headers and
+        filtered like files on disk. The listing is memoized per archive (mtime, size)
+        when a result cache is present.
+
+        Args:
+            archive (str): Normalized absolute archive path.
+            skip_patterns (List[str]): List of skip patterns for directories or files.
+            context (Dict[str, Any]): Context containing extensions and for error aggregation.
+
+        Returns:
+            List[str]: Virtual paths ("archive!/member") of the matching members.
+        """
+        with span(context, "gather.archive", archive=archive) as stats:
+            try:
+                st = os.stat(archive)
+                if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+                    members = list_members(archive)
+                else:
+                    members = memoize(
+                        context,
+                        "archive",
+                        (archive, st.st_mtime_ns, st.st_size),
+                        lambda: list_members(archive),
+                    )
+            except Exception as e:
+                log_and_record_error(
+                    f"Cannot read archive {archive}: {e}",
+                    context,
+                    logger,
+                    category="archive",
+                    path=archive,
+                )
+                return []
+            files = [
+                path
+                for path in (member_path(archive, name) for name, _ in members)
+                if self._matches(path, context["extensions"])
+                and not should_skip(path, skip_patterns)
+            ]
+            stats.update(members=len(members), matched=len(files))
+        return files
+
+    def _walk(
+        self,
+        root_dir: str,
+        skip_patterns: List[str],
+        context: Dict[str, Any],
+        stats: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Walk *root_dir* and return the matching files (plus directory mtimes when caching).
+
+        Directory listings come from context['listing_cache'] when present (manifest
+        runs), so trees shared by several jobs are listed only once.
+        """
+        track_dirs = context.get("cache") is not None
+        started_ns = time.time_ns()
         py_files: List[str] = []
-        for dirpath, dirnames, filenames in os.walk(root_dir):
+        dir_mtimes: List[Tuple[str, int]] = []
+        dirs_scanned = 0
+        files_seen = 0
+        follow = bool(context.get("cli_opts", {}).get("follow_symlinks"))
+        # (st_dev, st_ino) of every directory entered, when following links.
+        visited: Optional[Set[Tuple[int, int]]] = None
+        if follow:
+            visited = set()
+            _first_visit(root_dir, visited)
+        listing = context.get("listing_cache")
+        walker = (
+            listing.walk(root_dir, followlinks=follow)
+            if listing is not None
+            else os.walk(root_dir, followlinks=follow)
+        )
+        for dirpath, dirnames, filenames in walker:
+            dirs_scanned += 1
+            files_seen += len(filenames)
+            if track_dirs:
+                dir_mtimes.append((dirpath, os.stat(dirpath).st_mtime_ns))
             # Filter out directories that match the skip patterns.
             dirnames[:] = [
                 d
                 for d in dirnames
-                if not should_skip(os.path.join(dirpath, d), skip_patterns)
+                if not should_skip(
+                    os.path.join(dirpath, d), skip_patterns, normalized=True
+                )
             ]
+            if visited is not None:
+                dirnames[:] = [
+                    d
+                    for d in dirnames
+                    if _first_visit(os.path.join(dirpath, d), visited)
+                ]
             for fname in filenames:
                 file_path = os.path.join(dirpath, fname)
                 if self._matches(file_path, context["extensions"]) and not should_skip(
-                    file_path, skip_patterns
+                    file_path, skip_patterns, normalized=True
                 ):
                     py_files.append(file_path)
-        return py_files
+        stats.update(dirs=dirs_scanned, files_seen=files_seen, matched=len(py_files))
+        return {"files": py_files, "dirs": dir_mtimes, "walked_ns": started_ns}
 
     @staticmethod
     def _matches(path: str, exts: List[str]) -> bool:
@@ -135,7 +357,7 @@ class GatherPlugin:
         Returns:
             True if the file has a matching extension
         """
-        file_ext = Path(path).suffix.lstrip(".").lower()
+        file_ext = os.path.splitext(path)[1].lstrip(".").lower()
         return file_ext in exts
 
 
@@ -11,9 +11,13 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from savecode.plugin_manager.manager import register_plugin
+from savecode.plugins.specs import GIT_STATUS
 from savecode.plugin_manager.decorators import handle_plugin_errors
 from savecode.utils.path_utils import normalize_path
+from savecode.utils.path_record import path_table
+from savecode.utils.recency import filter_recent
 from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.profiler import span
 
 logger = logging.getLogger("savecode.plugins.git_status")
 
@@ -65,7 +69,9 @@ def _git_changed(root: Path, staged: bool, unstaged: bool) -> List[Path]:
     return changed
 
 
-@register_plugin(order=15)  # run right after ExtraArgsPlugin, before GatherPlugin
+# Runs before GatherPlugin (lower order) and only when --git is set; when it fills
+# all_files the manager skips GatherPlugin entirely.
+@register_plugin(spec=GIT_STATUS)
 class GitStatusPlugin:
     """Populate context['all_files'] from `git status` when --git is set."""
 
@@ -77,6 +83,7 @@ class GitStatusPlugin:
         Expects in context:
           - 'cli_opts': Dictionary containing CLI options.
           - 'extensions': List of file extensions to include.
+          - 'newer_than_ns' (optional): Keep only files modified after this time.
 
         Populates context with:
           - 'all_files': List of files from git status matching the extension filter.
@@ -90,13 +97,14 @@ class GitStatusPlugin:
         if not context.get("cli_opts", {}).get("git"):
             return  # flag not set
 
-        repo_root = _git_root(Path.cwd())
+        repo_root = _git_root(Path(context.get("base_dir") or Path.cwd()))
         if repo_root is None:
             log_and_record_error(
                 "Not inside a Git repository (ignored --git)",
                 context,
                 logger,
                 level="warning",
+                category="git",
             )
             return
 
@@ -106,10 +114,13 @@ class GitStatusPlugin:
             # default: both
             staged = unstaged = True
 
-        files = _git_changed(repo_root, staged, unstaged)
+        with span(context, "git.status") as stats:
+            files = _git_changed(repo_root, staged, unstaged)
+            stats["changed"] = len(files)
         # normalize paths from git output
         # Drop paths that have vanished from the working tree
-        normalized = [normalize_path(str(p)) for p in _only_existing(files)]
+        paths = path_table(context)
+        records = [paths.get(normalize_path(str(p))) for p in _only_existing(files)]
 
         # apply extension filtering only if all_ext is not set
         cli_opts = context["cli_opts"]
@@ -120,12 +131,8 @@ class GitStatusPlugin:
         ext_provided = cli_opts.get("ext_provided", False)
         include_all = cli_opts.get("all_ext") or not ext_provided
 
-        allowed = (
-            normalized
-            if include_all
-            else [p for p in normalized if Path(p).suffix.lstrip(".").lower() in exts]
-        )
+        allowed = [r.path for r in records if include_all or r.suffix in exts]
 
         # dedupe while keeping order
-        context["all_files"] = list(dict.fromkeys(allowed))
+        context["all_files"] = filter_recent(list(dict.fromkeys(allowed)), context)
         logger.info("GitStatusPlugin gathered %d files", len(context["all_files"]))
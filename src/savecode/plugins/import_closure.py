@@ -0,0 +1,267 @@
+"""
+savecode/plugins/import_closure.py - Narrow the bundle to what an entry point imports.
+
+With --entry, context['all_files'] is reduced to the entry scripts plus every gathered
+Python module they import, directly or transitively. Imports are read with ast
+(including relative imports and imports inside functions or try blocks) and resolved
+against the gathered files only: a module's dotted name follows its chain of
+__init__.py packages, so src/ layouts and plain script directories both resolve.
+Third-party and standard-library imports are ignored.
+
+Files are parsed one at a time, breadth first, even with --jobs: ast.parse holds the
+GIL, so threads would not help, and spawning worker processes costs more than parsing
+a typical closure. When a result cache is active (--cache, or the daemon's memory
+cache), the import list of each file is memoized under its (path, mtime, size), so
+unchanged files are not parsed again. A plain run has neither parallelism nor a memo
+here and parses every file it reaches; use --cache for repeated --entry runs.
+"""
+
+import ast
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from savecode.plugin_manager.manager import register_plugin
+from savecode.plugins.specs import IMPORT_CLOSURE
+from savecode.plugin_manager.decorators import handle_plugin_errors
+from savecode.utils.archive import ArchiveReader, split_member_path
+from savecode.utils.cache import RACY_WINDOW_NS, memoize
+from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.profiler import span
+
+logger = logging.getLogger("savecode.plugins.import_closure")
+
+# (level, module, imported names) for one import statement.
+ImportRef = Tuple[int, str, List[str]]
+
+
+def scan_imports(source: str, filename: str = "<unknown>") -> List[ImportRef]:
+    """Return every import in *source* as (level, module, names).
+
+    `import a.b` gives (0, "a.b", []); `from ..x import y` gives (2, "x", ["y"]).
+
+    Raises:
+        SyntaxError: If *source* does not parse.
+    """
+    refs: List[ImportRef] = []
+    for node in ast.walk(ast.parse(source, filename)):
+        if isinstance(node, ast.Import):
+            refs.extend((0, alias.name, []) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            names = [alias.name for alias in node.names if alias.name != "*"]
+            refs.append((node.level, node.module or "", names))
+    return refs
+
+
+class ModuleIndex:
+    """Maps dotted module names to the gathered files that define them."""
+
+    def __init__(self, files: List[str]) -> None:
+        self._package_dirs: Dict[str, bool] = {}
+        self._files = set(files)
+        self.modules: Dict[str, List[Tuple[str, str]]] = {}
+        self.names: Dict[str, Tuple[str, str]] = {}
+        for path in files:
+            if path.endswith(".py"):
+                name, root = self._qualify(path)
+                self.names[path] = (name, root)
+                self.modules.setdefault(name, []).append((root, path))
+
+    def _is_package(self, directory: str) -> bool:
+        known = self._package_dirs.get(directory)
+        if known is None:
+            init = os.path.join(directory, "__init__.py")
+            # Archive members ("dist.whl!/pkg/__init__.py") only exist in the index.
+            known = init in self._files or os.path.isfile(init)
+            self._package_dirs[directory] = known
+        return known
+
+    def _qualify(self, path: str) -> Tuple[str, str]:
+        """Return (dotted name, import root) for *path*."""
+        directory, filename = os.path.split(path)
+        stem = os.path.splitext(filename)[0]
+        parts = [] if stem == "__init__" else [stem]
+        while self._is_package(directory):
+            directory, package = os.path.split(directory)
+            if not package:
+                break
+            parts.insert(0, package)
+        return ".".join(parts), directory
+
+    def add(self, path: str) -> None:
+        """Index an entry script that was not among the gathered files."""
+        if path not in self.names:
+            name, root = self._qualify(path)
+            self.names[path] = (name, root)
+            self.modules.setdefault(name, []).append((root, path))
+
+    def lookup(self, name: str, roots: Tuple[str, ...]) -> Optional[str]:
+        """Return the file for module *name*, preferring the given import roots."""
+        matches = self.modules.get(name)
+        if not matches:
+            return None
+        for root in roots:
+            for match_root, path in matches:
+                if match_root == root:
+                    return path
+        return matches[0][1]
+
+    def resolve(self, path: str, refs: List[ImportRef], entry_root: str) -> List[str]:
+        """Return the gathered files that *path*'s imports refer to, in order."""
+        name, root = self.names[path]
+        is_init = os.path.basename(path) == "__init__.py"
+        package = name if is_init else name.rpartition(".")[0]
+        found: List[str] = []
+        for level, module, names in refs:
+            if level:
+                parts = package.split(".") if package else []
+                if level - 1 > len(parts):
+                    continue
+                base = ".".join(parts[: len(parts) - (level - 1)])
+                target = ".".join(p for p in (base, module) if p)
+            else:
+                target = module
+            candidates: List[str] = []
+            if target:
+                pieces = target.split(".")
+                # Importing a.b.c also runs a/__init__.py and a/b/__init__.py.
+                candidates.extend(
+                    ".".join(pieces[:i]) for i in range(1, len(pieces) + 1)
+                )
+            candidates.extend(f"{target}.{n}" if target else n for n in names)
+            for candidate in candidates:
+                hit = self.lookup(candidate, (root, entry_root))
+                if hit is not None and hit != path and hit not in found:
+                    found.append(hit)
+        return found
+
+
+def _dependency_order(entries: List[str], graph: Dict[str, List[str]]) -> List[str]:
+    """Return every reachable file with its imports before itself (cycles broken)."""
+    ordered: List[str] = []
+    visited: Set[str] = set()
+    for entry in entries:
+        if entry in visited:
+            continue
+        visited.add(entry)
+        stack = [(entry, iter(graph.get(entry, [])))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                ordered.append(node)
+            elif child not in visited:
+                visited.add(child)
+                stack.append((child, iter(graph.get(child, []))))
+    return ordered
+
+
+@register_plugin(spec=IMPORT_CLOSURE)
+class ImportClosurePlugin:
+    """Keep only the entry scripts and the local modules they import (--entry)."""
+
+    @handle_plugin_errors
+    def run(self, context: Dict[str, Any]) -> None:
+        """
+        Reduce context['all_files'] to the import closure of context['entry'].
+
+        Expects in context:
+          - 'entry': List of normalized entry script paths.
+          - 'all_files': Gathered files; imports resolve only to these.
+          - 'cli_opts': with 'dep_order' to list dependencies before dependents.
+
+        Populates context with:
+          - 'all_files': The closure, in gathered order or dependency order.
+          - 'import_closure': {'entries': [...], 'graph': {path: [imported paths]}}.
+
+        Args:
+            context (Dict[str, Any]): Shared context containing parameters and data.
+
+        Returns:
+            None
+        """
+        entries: List[str] = list(context.get("entry") or [])
+        gathered: List[str] = context.get("all_files", [])
+        index = ModuleIndex(gathered)
+        for entry in entries:
+            index.add(entry)
+        entry_root = index.names[entries[0]][1] if entries else ""
+
+        graph: Dict[str, List[str]] = {}
+        with span(context, "imports.closure", entries=len(entries)) as stats:
+            frontier = list(dict.fromkeys(entries))
+            seen: Set[str] = set(frontier)
+            with ArchiveReader() as archives:
+                while frontier:
+                    next_frontier: List[str] = []
+                    for path in frontier:
+                        refs = self._imports(path, archives, context)
+                        graph[path] = index.resolve(path, refs, entry_root)
+                        for dep in graph[path]:
+                            if dep not in seen:
+                                seen.add(dep)
+                                next_frontier.append(dep)
+                    frontier = next_frontier
+            stats.update(files=len(seen), gathered=len(gathered))
+
+        if context.get("cli_opts", {}).get("dep_order"):
+            closure = _dependency_order(entries, graph)
+        else:
+            in_gathered = set(gathered)
+            closure = [p for p in entries if p not in in_gathered]
+            closure.extend(p for p in gathered if p in seen)
+        context["all_files"] = closure
+        context["import_closure"] = {"entries": entries, "graph": graph}
+        logger.info(
+            "ImportClosurePlugin kept %d of %d files", len(closure), len(gathered)
+        )
+
+    @staticmethod
+    def _imports(
+        path: str, archives: ArchiveReader, context: Dict[str, Any]
+    ) -> List[ImportRef]:
+        """Return *path*'s imports, memoized under its (mtime, size) when cached.
+
+        Archive members are keyed by their archive's (mtime, size).
+        """
+        member = split_member_path(path)
+        try:
+            st = os.stat(member[0] if member else path)
+        except OSError as e:
+            log_and_record_error(
+                f"Cannot read entry {path}: {e}", context, logger, path=path
+            )
+            return []
+
+        def parse() -> List[ImportRef]:
+            if member is not None:
+                data = archives.read(*member)
+            else:
+                with open(path, "rb") as f:
+                    data = f.read()
+            return scan_imports(data.decode("utf-8", "replace"), path)
+
+        try:
+            # A file written within the racy window could change again unnoticed.
+            if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+                return parse()
+            refs: List[ImportRef] = memoize(
+                context, "imports", (path, st.st_mtime_ns, st.st_size), parse
+            )
+            return refs
+        except (OSError, KeyError, SyntaxError, ValueError) as e:
+            # Failures are not memoized, so they are reported on every run.
+            log_and_record_error(
+                f"Cannot parse imports of {path}: {e}",
+                context,
+                logger,
+                level="warning",
+                category="parse",
+                path=path,
+            )
+            return []
+
+
+# End of savecode/plugins/import_closure.py
@@ -5,23 +5,327 @@ to a designated output file, aggregating any errors encountered during file oper
 """
 
 import logging
-from typing import Any, Dict, List
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from io import StringIO
-from pathlib import Path
-from tqdm import tqdm
 from savecode.plugin_manager.manager import register_plugin
+from savecode.plugins.specs import SAVE
 from savecode.plugin_manager.decorators import handle_plugin_errors
-from savecode.utils.path_utils import relative_path
-from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.path_record import PathRecord, path_table
+from savecode.utils.error_handler import ErrorCollector, log_and_record_error
 from savecode.utils.clipboard import copy as copy_clipboard
+from savecode.utils.profiler import span
+from savecode.utils.cache import ContentCache
+from savecode.utils.archive import ArchiveReader, split_member_path
+from savecode.utils.transform_pool import (
+    PARALLEL_MIN_FILES,
+    decode_source,
+    iter_sections_parallel,
+    process_pool,
+)
+from savecode.utils.binary import (
+    SNIFF_BYTES,
+    binary_stub,
+    is_binary_file,
+    looks_binary,
+    read_unless_binary,
+)
+from savecode.utils.notebook import (
+    NOTEBOOK_MAX_BYTES,
+    is_notebook,
+    notebook_from_bytes,
+    read_notebook,
+)
+from savecode.utils.stats import FileStats, analyze, format_stats, write_stats_json
+from savecode.utils.split import (
+    format_index,
+    key_function,
+    partition,
+    partition_outputs,
+)
+from savecode.utils.fingerprint import (
+    discard_fingerprint,
+    input_fingerprint,
+    load_unchanged,
+    write_fingerprint,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger("savecode.plugins.save")
 
 # Maximum file size to process (in MB)
 MAX_SIZE_MB = 5
 
+# Runs with fewer files finish before a progress bar is useful, so they skip
+# importing tqdm altogether.
+PROGRESS_MIN_FILES = 200
+
+# Bundles of a --split-by run written at the same time.
+SPLIT_MAX_THREADS = 8
+
+
+def _progress(files: List[str]) -> Iterable[str]:
+    """Wrap *files* in a tqdm progress bar for large runs only."""
+    if len(files) < PROGRESS_MIN_FILES:
+        return files
+    from tqdm import tqdm
+
+    progress: Iterable[str] = tqdm(files, desc="Processing files", unit="file")
+    return progress
+
+
+def format_banner(
+    rel_paths: List[str], file_stats: Optional[List[FileStats]] = None
+) -> str:
+    """Return the "Files saved (N):" listing that opens a bundle.
+
+    With *file_stats* (--stats), a block of totals per extension follows the list.
+    """
+    banner = "Files saved ({}):\n{}\n\n".format(
+        len(rel_paths), "\n".join(f"- {rel}" for rel in rel_paths)
+    )
+    if file_stats is not None:
+        banner += "\n".join(format_stats(file_stats)) + "\n\n"
+    return banner
+
+
+def format_footer(file_count: int, output_file: str) -> str:
+    """Return the closing line of a bundle."""
+    return f"\nSaved code from {file_count} files to {output_file}\n"
+
+
+def _record_oversized(file: str, context: Dict[str, Any]) -> None:
+    log_and_record_error(
+        f"Skipped {file} (>{MAX_SIZE_MB} MB)",
+        context,
+        logger,
+        level="warning",
+        category="oversized",
+        path=file,
+    )
+
+
+def _record_read_error(file: str, error: Exception, context: Dict[str, Any]) -> None:
+    log_and_record_error(
+        f"Error reading {file}: {error}",
+        context,
+        logger,
+        category="read",
+        path=file,
+        exc_info=True,
+    )
+
+
+def _binary_file(
+    file: str, size: int, context: Dict[str, Any]
+) -> Optional[Tuple[str, int]]:
+    """Skip a binary file, or with cli_opts['binary'] == 'stub' return a placeholder."""
+    if context.get("cli_opts", {}).get("binary") == "stub":
+        return binary_stub(size), size
+    log_and_record_error(
+        f"Skipped binary file {file}",
+        context,
+        logger,
+        level="info",
+        category="binary",
+        path=file,
+    )
+    return None
+
+
+def _problem_count(context: Dict[str, Any]) -> int:
+    """Errors and warnings recorded so far (informational notes do not count)."""
+    errors = context.get("errors")
+    if isinstance(errors, ErrorCollector):
+        return errors.total("error") + errors.total("warning")
+    return len(errors or [])
+
 
-@register_plugin(order=30)
+def _read_file(
+    record: PathRecord, contents: Optional[ContentCache], context: Dict[str, Any]
+) -> Optional[Tuple[str, int]]:
+    """Return (text, size) of a file on disk, or None if it was skipped."""
+    file = record.path
+    try:
+        st = record.stat()
+    except FileNotFoundError:
+        log_and_record_error(
+            f"{file} does not exist – skipped",
+            context,
+            logger,
+            level="warning",
+            category="missing",
+            path=file,
+        )
+        return None
+    except OSError as e:
+        _record_read_error(file, e, context)
+        return None
+
+    outputs = bool(context.get("cli_opts", {}).get("notebook_outputs"))
+    if is_notebook(file) and st.st_size <= NOTEBOOK_MAX_BYTES:
+        cells = read_notebook(file, outputs)
+        if cells is not None:
+            return cells, st.st_size
+
+    if st.st_size > MAX_SIZE_MB * 1024 * 1024:
+        _record_oversized(file, context)
+        return None
+
+    try:
+        if contents is not None:
+            if is_binary_file(file, st):
+                return _binary_file(file, st.st_size, context)
+            text = contents.read(file, st)
+        else:
+            data = read_unless_binary(file, st)
+            if data is None:
+                return _binary_file(file, st.st_size, context)
+            text = decode_source(data)
+    except Exception as e:
+        _record_read_error(file, e, context)
+        return None
+    return text, st.st_size
+
+
+def _read_member(
+    file: str,
+    member: Tuple[str, str],
+    archives: ArchiveReader,
+    context: Dict[str, Any],
+) -> Optional[Tuple[str, int]]:
+    """Return (text, size) of an archive member, streamed from its archive.
+
+    Oversized and binary members are recognised from the archive's size field and
+    their first bytes, before the rest is decompressed.
+    """
+    notebook = is_notebook(file)
+    max_bytes = MAX_SIZE_MB * 1024 * 1024
+    try:
+        data, size, binary = archives.read_limited(
+            *member,
+            max(max_bytes, NOTEBOOK_MAX_BYTES) if notebook else max_bytes,
+            None if notebook else looks_binary,
+        )
+    except Exception as e:
+        _record_read_error(file, e, context)
+        return None
+    if binary:
+        return _binary_file(file, size, context)
+    if data is not None and notebook:
+        outputs = bool(context.get("cli_opts", {}).get("notebook_outputs"))
+        cells = notebook_from_bytes(data, outputs)
+        if cells is not None:
+            return cells, size
+        if size <= max_bytes and looks_binary(data[:SNIFF_BYTES]):
+            return _binary_file(file, size, context)
+    if data is None or size > max_bytes:
+        _record_oversized(file, context)
+        return None
+    return decode_source(data), size
+
+
+def iter_sections(
+    files: List[str],
+    context: Dict[str, Any],
+    stats: Optional[Dict[str, Any]] = None,
+    progress: bool = False,
+    saved: Optional[List[Tuple[str, int]]] = None,
+    file_stats: Optional[List[FileStats]] = None,
+    pool: Optional["ProcessPoolExecutor"] = None,
+) -> Iterator[Tuple[str, str, str]]:
+    """Read *files* and yield one bundle section per readable file.
+
+    Missing, oversized and unreadable files are recorded in context['errors'] and
+    left out. Section headers use paths relative to context['base_dir'] (default:
+    the working directory). A 'content_cache' in the context serves unchanged files
+    from memory. Archive members ("dist.whl!/pkg/mod.py") are read straight from
+    their archive. Jupyter notebooks contribute only their code and markdown cells
+    (see utils/notebook). Binary files (see utils/binary) are skipped before the
+    full read, or replaced by a placeholder when cli_opts['binary'] is 'stub'.
+
+    With context['jobs'] > 1, larger runs are read and formatted on a process pool
+    (see utils/transform_pool), in the same order. With cli_opts['outline'] set (the
+    head size for non-Python files), sections hold Python skeletons instead of full
+    contents (see utils/outline); sizes and statistics still describe the full files.
+
+    Args:
+        files (List[str]): Source file paths.
+        context (Dict[str, Any]): Shared context for options and error aggregation.
+        stats (Dict[str, Any], optional): Counters filled with files/bytes read.
+        progress (bool, optional): Show a progress bar for large runs.
+        saved (List[Tuple[str, int]], optional): Receives (relative path, size in
+            bytes) for every section yielded.
+        file_stats (List[FileStats], optional): Receives the statistics of every
+            section yielded, computed from the text already in memory.
+        pool (ProcessPoolExecutor, optional): Worker pool shared between calls (see
+            transform_pool.process_pool()), used instead of starting one.
+
+    Yields:
+        Tuple[str, str, str]: (path, relative path, section text), where the section
+        is the "File: <rel>" header, a blank line and the file's content.
+    """
+    outline_head: Optional[int] = context.get("cli_opts", {}).get("outline")
+    jobs: int = context.get("jobs") or 1
+    contents = context.get("content_cache")
+    # The daemon's warm content cache lives in this process, so it wins over a pool.
+    if jobs > 1 and contents is None and len(files) >= PARALLEL_MIN_FILES:
+        yield from iter_sections_parallel(
+            files,
+            context,
+            jobs,
+            MAX_SIZE_MB * 1024 * 1024,
+            stats,
+            saved,
+            file_stats,
+            pool,
+        )
+        return
+
+    paths = path_table(context)
+    hits_before = contents.hits if contents is not None else 0
+    archives: Optional[ArchiveReader] = None
+    file_count = 0
+    bytes_read = 0
+    try:
+        for file in _progress(files) if progress else files:
+            record = paths.get(file)
+            rel_path = record.rel
+
+            member = split_member_path(file)
+            if member is not None:
+                if archives is None:
+                    archives = ArchiveReader()
+                read = _read_member(file, member, archives, context)
+            else:
+                read = _read_file(record, contents, context)
+            if read is None:
+                continue
+            text, size = read
+            file_count += 1
+            bytes_read += size
+            if saved is not None:
+                saved.append((rel_path, size))
+            if file_stats is not None:
+                file_stats.append(analyze(rel_path, text, size))
+            if outline_head is not None:
+                from savecode.utils.outline import outline_text
+
+                text = outline_text(rel_path, text, outline_head, context)
+            yield file, rel_path, f"File: {rel_path}\n\n{text}\n\n"
+    finally:
+        if archives is not None:
+            archives.close()
+        if stats is not None:
+            stats.update(files=file_count, bytes=bytes_read)
+            if contents is not None:
+                stats["cache_hits"] = contents.hits - hits_before
+
+
+@register_plugin(spec=SAVE)
 class SavePlugin:
     """Plugin that saves the content of source files to a single output file."""
 
@@ -31,7 +335,19 @@ class SavePlugin:
 
         Expects in context:
           - 'all_files': List of source file paths.
-          - 'output': Output file path.
+          - 'output': Output file path, or '-' to write the bundle to stdout.
+          - 'content_cache' (optional): ContentCache reused across runs by the daemon.
+
+        Populates context with:
+          - 'saved_files': (relative path, size) of every file written, so the
+            summary need not recompute them.
+          - 'bundle_unchanged': True when the output's fingerprint (see
+            utils/fingerprint) shows nothing changed, in which case nothing is read
+            or written. cli_opts['force'] disables the check.
+          - 'file_stats': per-file FileStats, when cli_opts['stats'] or
+            'stats_json' is set; the totals also go into the banner and the JSON file.
+          - 'partitions': (key, bundle path) of every bundle, when cli_opts['split_by']
+            splits the files (see utils/split); 'output' then receives an index.
 
         Aggregates errors in context['errors'].
 
@@ -43,71 +359,262 @@ class SavePlugin:
         """
         gathered: List[str] = context.get("all_files", [])
         output_file: str = context.get("output", "./temp.txt")
+        stats_json: Optional[str] = context.get("stats_json")
+        file_stats: Optional[List[FileStats]] = None
+        if stats_json or context.get("cli_opts", {}).get("stats"):
+            file_stats = []
 
-        buffer = StringIO()
-        summary_details = []  # Stores paths for the summary
+        split_by: Optional[str] = context.get("cli_opts", {}).get("split_by")
+        if split_by and output_file != "-":
+            written = self._write_partitions(
+                gathered, output_file, split_by, context, file_stats
+            )
+        else:
+            written = self._write_bundle(
+                gathered, output_file, context, file_stats, clipboard=True
+            )
+        if written is None:
+            return
+        saved, unchanged = written
+        context["saved_files"] = saved
+        if unchanged:
+            context["bundle_unchanged"] = True
+        if file_stats is not None:
+            context["file_stats"] = file_stats
+            if stats_json:
+                self._write_stats(stats_json, file_stats, context)
 
+    @staticmethod
+    def _copy_kept_bundle(output_file: str, context: Dict[str, Any]) -> None:
+        """Copy an up-to-date bundle to the clipboard, as a rewrite would have."""
         try:
-            for file in tqdm(gathered, desc="Processing files", unit="file"):
-                rel_path = relative_path(file)
-
-                if not Path(file).exists():
-                    log_and_record_error(
-                        f"{file} does not exist – skipped",
-                        context,
-                        logger,
-                        level="warning",
-                    )
-                    continue
-
-                if Path(file).stat().st_size > MAX_SIZE_MB * 1024 * 1024:
-                    log_and_record_error(
-                        f"Skipped {file} (>{MAX_SIZE_MB} MB)",
-                        context,
-                        logger,
-                        level="warning",
-                    )
-                    continue
-
-                try:
-                    header = f"File: {rel_path}\n\n"
-                    buffer.write(header)
-                    with open(file, "r", encoding="utf-8", errors="replace") as f:
-                        for chunk in iter(lambda: f.read(8192), ""):  # 8 KB chunks
-                            buffer.write(chunk)
-                    buffer.write("\n\n")
-                    summary_details.append(f"- {rel_path}")
-                except Exception as e:
-                    error_msg = f"Error reading {file}: {e}"
-                    log_and_record_error(error_msg, context, logger, exc_info=True)
-
-            file_count = len(summary_details)
-            banner = "Files saved ({}):\n{}\n\n".format(
-                file_count, "\n".join(summary_details)
+            with open(output_file, encoding="utf-8") as f:
+                kept = f.read()
+        except OSError as e:
+            logger.warning("Could not copy %s to the clipboard: %s", output_file, e)
+            return
+        with span(context, "save.clipboard"):
+            copy_clipboard(kept.strip())
+        logger.info("Copied concatenated code to clipboard.")
+
+    def _write_bundle(
+        self,
+        files: List[str],
+        output_file: str,
+        context: Dict[str, Any],
+        file_stats: Optional[List[FileStats]],
+        clipboard: bool = False,
+        pool: Optional["ProcessPoolExecutor"] = None,
+    ) -> Tuple[List[Tuple[str, int]], bool]:
+        """Read *files* and write them as one bundle to *output_file*.
+
+        Args:
+            files (List[str]): Source file paths, in bundle order.
+            output_file (str): Bundle path, or '-' for stdout.
+            context (Dict[str, Any]): Shared context.
+            file_stats (List[FileStats], optional): Receives per-file statistics,
+                which also go into the banner.
+            clipboard (bool, optional): Copy the bundle to the clipboard as well
+                (with a progress bar for large runs).
+            pool (ProcessPoolExecutor, optional): Shared worker pool for --jobs.
+
+        Returns:
+            Tuple[List[Tuple[str, int]], bool]: (relative path, size) of the saved
+            files, and whether the bundle was up to date and left untouched.
+        """
+        digest: Optional[str] = None
+        settled = False
+        if output_file != "-" and file_stats is None:
+            digest, settled = input_fingerprint(
+                files, context, self._fingerprint_options(output_file, context)
             )
+            cli_opts = context.get("cli_opts", {})
+            if digest is not None and not cli_opts.get("force"):
+                unchanged = load_unchanged(output_file, digest)
+                if unchanged is not None:
+                    logger.info("Inputs unchanged; kept %s as is.", output_file)
+                    if clipboard:
+                        self._copy_kept_bundle(output_file, context)
+                    return unchanged, True
+
+        problems_before = _problem_count(context)
+        buffer = StringIO()
+        saved: List[Tuple[str, int]] = []
+
+        try:
+            with span(context, "save.read", output=output_file) as stats:
+                for _, _, section in iter_sections(
+                    files,
+                    context,
+                    stats,
+                    progress=clipboard,
+                    saved=saved,
+                    file_stats=file_stats,
+                    pool=pool,
+                ):
+                    buffer.write(section)
+
+            file_count = len(saved)
+            banner = format_banner([rel_path for rel_path, _ in saved], file_stats)
 
             # Now write everything to the output file
-            with open(output_file, "w", encoding="utf-8") as out:
-                out.write(banner)
-                out.write(buffer.getvalue())
-                footer = f"\nSaved code from {file_count} files to {output_file}\n"
-                out.write(footer)
-
-            # Prepare complete output for clipboard
-            complete_output = banner + buffer.getvalue() + footer
-            copy_clipboard(
-                complete_output.strip()
-            )  # Strip to avoid extra newlines if footer/banner have them
-            logger.info("Copied concatenated code to clipboard.")
+            footer = format_footer(file_count, output_file)
+            with span(context, "save.write", output=output_file):
+                if output_file == "-":
+                    sys.stdout.write(banner + buffer.getvalue() + footer)
+                    sys.stdout.flush()
+                else:
+                    with open(output_file, "w", encoding="utf-8") as out:
+                        out.write(banner)
+                        out.write(buffer.getvalue())
+                        out.write(footer)
+                    # Problems are counted run-wide, so with concurrent partitions
+                    # one partition's problem also keeps the others unfingerprinted.
+                    if digest is not None and settled:
+                        if _problem_count(context) == problems_before:
+                            write_fingerprint(output_file, digest, saved)
+                        else:
+                            discard_fingerprint(output_file)
+
+            if clipboard:
+                # Prepare complete output for clipboard
+                with span(context, "save.clipboard"):
+                    complete_output = banner + buffer.getvalue() + footer
+                    copy_clipboard(
+                        complete_output.strip()
+                    )  # Strip to avoid extra newlines if footer/banner have them
+                logger.info("Copied concatenated code to clipboard.")
 
         except Exception as e:
             # Preserve legacy wording so existing tests/users can grep for it
             error_msg = (
                 f"Error writing to output file {output_file}: {e} (during save process)"
             )
-            log_and_record_error(error_msg, context, logger, exc_info=True)
+            log_and_record_error(
+                error_msg,
+                context,
+                logger,
+                category="write",
+                path=output_file,
+                exc_info=True,
+            )
         finally:
             buffer.close()  # Ensure StringIO buffer is closed
+        return saved, False
+
+    def _write_partitions(
+        self,
+        files: List[str],
+        index_file: str,
+        split_by: str,
+        context: Dict[str, Any],
+        file_stats: Optional[List[FileStats]],
+    ) -> Optional[Tuple[List[Tuple[str, int]], bool]]:
+        """Write one bundle per --split-by partition, plus an index at *index_file*.
+
+        Partitions are written concurrently on threads. With --jobs, one process pool
+        is started for the whole run and every partition submits its batches to it,
+        instead of each partition starting and stopping a pool of its own.
+
+        Returns:
+            Optional[Tuple[List[Tuple[str, int]], bool]]: The saved files of all
+            partitions, in index order, and whether every bundle was up to date;
+            None if the split key could not be loaded.
+        """
+        paths = path_table(context)
+        try:
+            key = key_function(split_by, paths)
+            groups = partition(files, paths, key)
+        except Exception as e:
+            log_and_record_error(
+                f"Cannot split by {split_by}: {e}",
+                context,
+                logger,
+                category="split",
+            )
+            return None
+        outputs = partition_outputs(index_file, list(groups))
+        part_stats: Dict[str, Optional[List[FileStats]]] = {
+            k: None if file_stats is None else [] for k in groups
+        }
+        context["partitions"] = list(outputs.items())
+
+        jobs: int = context.get("jobs") or 1
+        pool: Optional["ProcessPoolExecutor"] = None
+        if (
+            jobs > 1
+            and context.get("content_cache") is None
+            and any(len(group) >= PARALLEL_MIN_FILES for group in groups.values())
+        ):
+            pool = process_pool(jobs)
+
+        def write(name: str) -> Tuple[List[Tuple[str, int]], bool]:
+            return self._write_bundle(
+                groups[name], outputs[name], context, part_stats[name], pool=pool
+            )
+
+        try:
+            with span(context, "save.split", partitions=len(groups)):
+                if len(groups) < 2:
+                    results = [write(name) for name in groups]
+                else:
+                    with ThreadPoolExecutor(
+                        max_workers=min(len(groups), SPLIT_MAX_THREADS)
+                    ) as threads:
+                        results = list(threads.map(write, groups))
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        saved: List[Tuple[str, int]] = []
+        entries = []
+        for name, (part_saved, _) in zip(groups, results):
+            saved.extend(part_saved)
+            entries.append((name, outputs[name], len(part_saved)))
+            if file_stats is not None:
+                file_stats.extend(part_stats[name] or [])
+        try:
+            with open(index_file, "w", encoding="utf-8") as out:
+                out.write(format_index(split_by, entries, index_file))
+        except OSError as e:
+            log_and_record_error(
+                f"Error writing to output file {index_file}: {e}",
+                context,
+                logger,
+                category="write",
+                path=index_file,
+            )
+        return saved, all(unchanged for _, unchanged in results)
+
+    @staticmethod
+    def _fingerprint_options(
+        output_file: str, context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """The settings besides the inputs that change the bundle's bytes."""
+        return {
+            "output": output_file,
+            "base_dir": path_table(context).base_dir,
+            "max_bytes": MAX_SIZE_MB * 1024 * 1024,
+            "binary": context.get("cli_opts", {}).get("binary", "skip"),
+            "outline": context.get("cli_opts", {}).get("outline"),
+            "notebook_outputs": context.get("cli_opts", {}).get("notebook_outputs"),
+        }
+
+    @staticmethod
+    def _write_stats(
+        path: str, file_stats: List[FileStats], context: Dict[str, Any]
+    ) -> None:
+        """Write the --stats-json file; a failure is recorded, not raised."""
+        try:
+            write_stats_json(path, file_stats)
+        except OSError as e:
+            log_and_record_error(
+                f"Error writing stats to {path}: {e}",
+                context,
+                logger,
+                category="write",
+                path=path,
+            )
 
 
 # End of savecode/plugins/save.py
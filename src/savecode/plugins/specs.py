@@ -0,0 +1,65 @@
+"""
+savecode/plugins/specs.py - Lightweight descriptors for the built-in plugins.
+
+The plugin manager reads these to schedule plugins without importing them; each
+plugin module is imported only when its plugin is about to run. Third-party packages
+publish descriptors of the same shape (a PluginSpec or a dict of its fields) under the
+"savecode.plugins" entry-point group, e.g. in pyproject.toml:
+
+    [project.entry-points."savecode.plugins"]
+    my_plugin = "my_package.savecode_specs:MY_PLUGIN"
+
+These descriptors are the single source of plugin metadata: each plugin module
+registers its class with @register_plugin(spec=...), passing its descriptor here.
+"""
+
+from typing import List
+
+from savecode.plugin_manager.manager import PluginSpec
+
+EXTRA_ARGS = PluginSpec(
+    name="ExtraArgsPlugin",
+    target="savecode.plugins.extra_args:ExtraArgsPlugin",
+    order=10,
+    provides=("parsed_extra_args",),
+)
+
+GIT_STATUS = PluginSpec(
+    name="GitStatusPlugin",
+    target="savecode.plugins.git_status:GitStatusPlugin",
+    order=15,
+    provides=("all_files",),
+    flags=("git",),
+)
+
+GATHER = PluginSpec(
+    name="GatherPlugin",
+    target="savecode.plugins.gather:GatherPlugin",
+    order=20,
+    provides=("all_files",),
+)
+
+IMPORT_CLOSURE = PluginSpec(
+    name="ImportClosurePlugin",
+    target="savecode.plugins.import_closure:ImportClosurePlugin",
+    order=25,
+    provides=("import_closure",),
+    requires=("all_files",),
+    flags=("entry",),
+)
+
+# Requiring import_closure makes --entry runs save the narrowed file list.
+SAVE = PluginSpec(
+    name="SavePlugin",
+    target="savecode.plugins.save:SavePlugin",
+    order=30,
+    requires=("all_files", "import_closure"),
+)
+
+BUILTIN_SPECS: List[PluginSpec] = [
+    EXTRA_ARGS,
+    GIT_STATUS,
+    GATHER,
+    IMPORT_CLOSURE,
+    SAVE,
+]
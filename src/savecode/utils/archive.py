@@ -0,0 +1,206 @@
+"""
+savecode/utils/archive.py - Read source files straight out of zip and tar archives.
+
+Archive members are addressed with virtual paths of the form
+
+    /path/to/dist.whl!/package/module.py
+
+list_members() enumerates an archive's regular files from the zip central directory
+or the tar headers. ArchiveReader reads member contents without extracting anything
+to disk: zip members are read at random, tar members with one forward pass over the
+(possibly compressed) stream, which is the order GatherPlugin lists them in.
+read_limited() checks a member's uncompressed size and leading bytes before
+decompressing the rest.
+"""
+
+import os
+import threading
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from savecode.utils.binary import SNIFF_BYTES
+
+# Separator between the archive path and the member name in a virtual path.
+MEMBER_SEP = "!/"
+
+ZIP_SUFFIXES = (".zip", ".whl", ".egg", ".jar")
+TAR_SUFFIXES = (
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+
+
+def is_archive(path: str) -> bool:
+    """Return True if *path* names an existing file with a supported archive suffix."""
+    return path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES) and os.path.isfile(path)
+
+
+def member_path(archive: str, member: str) -> str:
+    """Return the virtual path of *member* inside *archive*."""
+    return f"{archive}{MEMBER_SEP}{member}"
+
+
+def split_member_path(path: str) -> Optional[Tuple[str, str]]:
+    """Return (archive, member) for a virtual path, or None for a plain path."""
+    archive, sep, member = path.partition(MEMBER_SEP)
+    if sep and member and archive.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES):
+        return archive, member
+    return None
+
+
+def list_members(archive: str) -> List[Tuple[str, int]]:
+    """List the regular files in *archive*, in archive order.
+
+    Args:
+        archive (str): Path to a zip-family or tar-family archive.
+
+    Returns:
+        List[Tuple[str, int]]: (member name, uncompressed size) pairs.
+
+    Raises:
+        OSError, zipfile.BadZipFile, tarfile.TarError: If the archive is unreadable.
+    """
+    if archive.lower().endswith(ZIP_SUFFIXES):
+        import zipfile
+
+        with zipfile.ZipFile(archive) as zf:
+            return [(i.filename, i.file_size) for i in zf.infolist() if not i.is_dir()]
+
+    import tarfile
+
+    with tarfile.open(archive, "r|*") as tf:
+        return [(m.name, m.size) for m in tf if m.isfile()]
+
+
+class ArchiveReader:
+    """Reads members of many archives, keeping each archive open between reads.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self) -> None:
+        self._zips: Dict[str, Any] = {}
+        # archive -> (open stream-mode TarFile, its member iterator)
+        self._tars: Dict[str, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def read(self, archive: str, member: str) -> bytes:
+        """Return the content of *member* in *archive*.
+
+        Raises:
+            KeyError: If the archive has no such regular file.
+            OSError, zipfile.BadZipFile, tarfile.TarError: If the archive is unreadable.
+        """
+        with self._lock:
+            f, _ = self._open_member(archive, member)
+            with f:
+                data: bytes = f.read()
+            return data
+
+    def read_limited(
+        self,
+        archive: str,
+        member: str,
+        max_bytes: int,
+        is_binary: Optional[Callable[[bytes], bool]] = None,
+    ) -> Tuple[Optional[bytes], int, bool]:
+        """Read *member* unless it is larger than *max_bytes* or looks binary.
+
+        The size is taken from the zip central directory or the tar header before
+        anything is decompressed, so an oversized member (or a zip bomb) is never
+        inflated, and at most *max_bytes* are read even if the header understates
+        it. *is_binary* judges the first SNIFF_BYTES before the rest is read.
+
+        Returns:
+            Tuple[Optional[bytes], int, bool]: (content, size, binary); content is
+            None for a skipped member, and binary tells whether it looked binary
+            (otherwise it was too large).
+
+        Raises:
+            KeyError: If the archive has no such regular file.
+            OSError, zipfile.BadZipFile, tarfile.TarError: If the archive is unreadable.
+        """
+        with self._lock:
+            f, size = self._open_member(archive, member)
+            with f:
+                if size > max_bytes:
+                    return None, size, False
+                head: bytes = f.read(min(SNIFF_BYTES, max_bytes + 1))
+                if is_binary is not None and is_binary(head):
+                    return None, size, True
+                data = head + f.read(max_bytes + 1 - len(head))
+        if len(data) > max_bytes:
+            return None, len(data), False
+        return data, len(data), False
+
+    def _open_member(self, archive: str, member: str) -> Tuple[IO[bytes], int]:
+        """Return an open stream of *member* and its uncompressed size."""
+        if archive.lower().endswith(ZIP_SUFFIXES):
+            return self._open_zip_member(archive, member)
+        return self._open_tar_member(archive, member)
+
+    def _open_zip_member(self, archive: str, member: str) -> Tuple[IO[bytes], int]:
+        import zipfile
+
+        zf = self._zips.get(archive)
+        if zf is None:
+            zf = self._zips[archive] = zipfile.ZipFile(archive)
+        info = zf.getinfo(member)
+        return zf.open(info), info.file_size
+
+    def _open_tar_member(self, archive: str, member: str) -> Tuple[IO[bytes], int]:
+        # Stream mode never seeks: members must be read in archive order. A request
+        # for an earlier member restarts the stream once from the beginning.
+        fresh = archive not in self._tars
+        if fresh:
+            self._open_tar(archive)
+        found = self._scan_tar(archive, member)
+        if found is None and not fresh:
+            self._open_tar(archive)
+            found = self._scan_tar(archive, member)
+        if found is None:
+            raise KeyError(f"{member} not found in {archive}")
+        return found
+
+    def _open_tar(self, archive: str) -> None:
+        import tarfile
+
+        self._close_tar(archive)
+        tf = tarfile.open(archive, "r|*")
+        self._tars[archive] = (tf, iter(tf))
+
+    def _scan_tar(self, archive: str, member: str) -> Optional[Tuple[IO[bytes], int]]:
+        tf, members = self._tars[archive]
+        for info in members:
+            if info.name == member and info.isfile():
+                f = tf.extractfile(info)
+                if f is not None:
+                    return f, info.size
+        return None
+
+    def _close_tar(self, archive: str) -> None:
+        entry = self._tars.pop(archive, None)
+        if entry is not None:
+            entry[0].close()
+
+    def close(self) -> None:
+        """Close every open archive."""
+        with self._lock:
+            for zf in self._zips.values():
+                zf.close()
+            self._zips.clear()
+            for archive in list(self._tars):
+                self._close_tar(archive)
+
+
+# End of savecode/utils/archive.py
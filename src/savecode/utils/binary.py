@@ -0,0 +1,127 @@
+"""
+savecode/utils/binary.py - Cheap detection of binary files before they are read.
+
+Broad --ext lists and --git runs (which include every extension by default) pick up
+images, .pyc files, SQLite databases and the like. Decoding them wastes reads and
+fills the bundle with replacement characters. looks_binary() judges a file from its
+first SNIFF_BYTES bytes: known magic numbers, any NUL byte, or too many bytes that
+are not valid UTF-8.
+
+Verdicts for files on disk are remembered per (device, inode, mtime, size), so a
+long-lived process (the daemon, a manifest run) sniffs each file version only once.
+"""
+
+import codecs
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+# How much of a file is inspected.
+SNIFF_BYTES = 8192
+
+# Above this share of undecodable bytes a file is treated as binary. Legacy 8-bit
+# text (e.g. Latin-1) stays well below it.
+MAX_INVALID_RATIO = 0.3
+
+# File signatures that mark binary formats even without a NUL in the first bytes.
+MAGIC_NUMBERS = (
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",  # JPEG
+    b"GIF87a",
+    b"GIF89a",
+    b"%PDF-",
+    b"PK\x03\x04",  # zip, jar, docx, ...
+    b"\x1f\x8b",  # gzip
+    b"BZh91AY&SY",  # bzip2
+    b"\xfd7zXZ\x00",  # xz
+    b"7z\xbc\xaf\x27\x1c",
+    b"SQLite format 3\x00",
+    b"\x7fELF",
+    b"\xca\xfe\xba\xbe",  # Java class, Mach-O fat binary
+    b"\xcf\xfa\xed\xfe",  # Mach-O
+    b"\x00asm",  # WebAssembly
+    b"wOFF",
+    b"wOF2",
+    b"OggS",
+    b"RIFF",  # WAV, AVI, WebP
+)
+
+# Bound on remembered verdicts; the table is simply cleared when full.
+VERDICT_LIMIT = 65536
+
+_verdicts: Dict[Tuple[int, int, int, int], bool] = {}
+_lock = threading.Lock()
+
+
+def looks_binary(head: bytes) -> bool:
+    """Return True if the leading bytes *head* of a file look binary."""
+    if not head:
+        return False
+    if head.startswith(MAGIC_NUMBERS) or b"\x00" in head:
+        return True
+    # final=False: a multi-byte character cut off at the end is not an error.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    text = decoder.decode(head, final=False)
+    invalid = text.count("\ufffd") - head.count("\ufffd".encode("utf-8"))
+    return invalid > len(head) * MAX_INVALID_RATIO
+
+
+def _key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def cached_verdict(st: os.stat_result) -> Optional[bool]:
+    """Return the remembered verdict for this version of a file, if any."""
+    return _verdicts.get(_key(st)) if st.st_ino else None
+
+
+def remember(st: os.stat_result, binary: bool) -> bool:
+    """Remember *binary* for this version of a file and return it."""
+    if st.st_ino:
+        with _lock:
+            if len(_verdicts) >= VERDICT_LIMIT:
+                _verdicts.clear()
+            _verdicts[_key(st)] = binary
+    return binary
+
+
+def is_binary_file(path: str, st: os.stat_result) -> bool:
+    """Sniff *path* (whose fresh stat is *st*), reusing a remembered verdict.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    verdict = cached_verdict(st)
+    if verdict is None:
+        with open(path, "rb") as f:
+            verdict = remember(st, looks_binary(f.read(SNIFF_BYTES)))
+    return verdict
+
+
+def read_unless_binary(path: str, st: os.stat_result) -> Optional[bytes]:
+    """Return the bytes of *path*, or None if it is binary.
+
+    The sniffed head and the rest of the file come from one open() call, and a
+    known binary is not opened at all.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    verdict = cached_verdict(st)
+    if verdict:
+        return None
+    with open(path, "rb") as f:
+        if verdict is not None:
+            return f.read()
+        head = f.read(SNIFF_BYTES)
+        if remember(st, looks_binary(head)):
+            return None
+        return head + f.read()
+
+
+def binary_stub(size: int) -> str:
+    """Placeholder content for a binary file kept in the bundle (--binary stub)."""
+    return f"(binary file, {size} bytes, contents omitted)\n"
+
+
+# End of savecode/utils/binary.py
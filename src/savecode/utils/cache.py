@@ -0,0 +1,469 @@
+"""
+savecode/utils/cache.py - Cross-run memoization store for plugin results.
+
+Plugins memoize pure steps (e.g. the file list gathered for a root) under an explicit
+namespace and key. Entries live in a small SQLite database in the user cache directory,
+are evicted least-recently-used once the store exceeds its size budget, and can be
+shared safely by concurrently running savecode processes (WAL mode plus a busy
+timeout). The cache is strictly best effort: any storage error is logged and treated
+as a miss, so a broken cache never breaks a run.
+
+Values must be JSON-serialisable or bytes. sqlite3 is imported only when a
+ResultCache is created, so merely importing this module stays cheap.
+
+A resident daemon (see savecode.daemon) uses the in-memory MemoryCache instead, with
+the same interface, plus a ContentCache of decoded file contents. Manifest runs share
+a ListingCache so each directory is listed once across many jobs.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger("savecode.utils.cache")
+
+T = TypeVar("T")
+
+# Default size budget for the on-disk store (override with SAVECODE_CACHE_MAX_MB).
+DEFAULT_MAX_MB = 256
+
+# Fraction of the budget the store is trimmed down to once it overflows.
+_TRIM_RATIO = 0.9
+
+# Modification times this close to "now" may hide a change made in the same clock
+# tick, so results derived from such files or directories are never trusted.
+RACY_WINDOW_NS = 2_000_000_000
+
+_MISSING = object()
+
+
+def default_cache_dir() -> str:
+    """Return the directory holding the cache database.
+
+    Honours SAVECODE_CACHE_DIR, then XDG_CACHE_HOME / LOCALAPPDATA, then ~/.cache.
+
+    Returns:
+        str: The cache directory path.
+    """
+    explicit = os.getenv("SAVECODE_CACHE_DIR")
+    if explicit:
+        return explicit
+    base = os.getenv("XDG_CACHE_HOME") or os.getenv("LOCALAPPDATA")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "savecode")
+
+
+def cache_key(*parts: Any) -> str:
+    """Hash arbitrary JSON-serialisable key parts into a stable cache key."""
+    import hashlib
+
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed, size-bounded LRU store for memoized plugin results."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        if path is None:
+            path = os.path.join(default_cache_dir(), "cache.sqlite3")
+        if max_bytes is None:
+            max_mb = float(os.getenv("SAVECODE_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            max_bytes = int(max_mb * 1024 * 1024)
+        import sqlite3
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._sqlite = sqlite3
+        self._lock = threading.Lock()
+        self._conn: Optional["sqlite3.Connection"] = None
+
+    def _connect(self) -> "sqlite3.Connection":
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = self._sqlite.connect(
+                self.path, timeout=10, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " is_bytes INTEGER NOT NULL,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the cached value for (*namespace*, *key*), or *default* on a miss.
+
+        Args:
+            namespace (str): Logical step name, e.g. "gather".
+            key (str): Key within the namespace (see cache_key()).
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: The cached value or *default*.
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT is_bytes, value FROM entries WHERE namespace=? AND key=?",
+                    (namespace, key),
+                ).fetchone()
+                if row is None:
+                    return default
+                conn.execute(
+                    "UPDATE entries SET accessed=? WHERE namespace=? AND key=?",
+                    (time.time(), namespace, key),
+                )
+        except self._sqlite.Error as e:
+            logger.debug("Cache read failed (%s); treating as a miss", e)
+            return default
+        is_bytes, value = row
+        return bytes(value) if is_bytes else json.loads(value)
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store *value* and evict least-recently-used entries beyond the budget.
+
+        Args:
+            namespace (str): Logical step name.
+            key (str): Key within the namespace.
+            value (Any): JSON-serialisable value or bytes.
+        """
+        is_bytes = isinstance(value, (bytes, bytearray))
+        blob = bytes(value) if is_bytes else json.dumps(value).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (namespace, key, int(is_bytes), blob, len(blob), time.time()),
+                    )
+                    self._evict(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        except self._sqlite.Error as e:
+            logger.debug("Cache write failed (%s); result not cached", e)
+
+    def _evict(self, conn: "sqlite3.Connection") -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * _TRIM_RATIO)
+        rows = conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed"
+        ).fetchall()
+        for namespace, key, size in rows:
+            if total <= target:
+                break
+            conn.execute(
+                "DELETE FROM entries WHERE namespace=? AND key=?", (namespace, key)
+            )
+            total -= size
+
+    def memoize(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], T],
+        validate: Optional[Callable[[Any], bool]] = None,
+    ) -> T:
+        """Return the cached result for *key*, computing and storing it on a miss.
+
+        Args:
+            namespace (str): Logical step name.
+            key (str): Key within the namespace.
+            compute (Callable[[], T]): Produces the value on a miss.
+            validate (Callable[[Any], bool], optional): Rejects stale cached values.
+
+        Returns:
+            T: The cached or freshly computed value.
+        """
+        value = self.get(namespace, key, _MISSING)
+        if value is not _MISSING and (validate is None or validate(value)):
+            return value  # type: ignore[no-any-return]
+        result = compute()
+        self.put(namespace, key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry and byte counts, overall and per namespace."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0)"
+                " FROM entries GROUP BY namespace ORDER BY namespace"
+            ).fetchall()
+        namespaces = {ns: {"entries": n, "bytes": b} for ns, n, b in rows}
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "entries": sum(v["entries"] for v in namespaces.values()),
+            "bytes": sum(v["bytes"] for v in namespaces.values()),
+            "namespaces": namespaces,
+        }
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Delete all entries (or those in *namespace*) and return how many went."""
+        with self._lock:
+            conn = self._connect()
+            if namespace is None:
+                cursor = conn.execute("DELETE FROM entries")
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM entries WHERE namespace=?", (namespace,)
+                )
+            conn.execute("VACUUM")
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class MemoryCache:
+    """In-process LRU with the ResultCache interface, for long-lived processes.
+
+    Values are kept as-is rather than serialised, so callers must not mutate what
+    they get back.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.path = "<memory>"
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the cached value for (*namespace*, *key*), or *default* on a miss."""
+        with self._lock:
+            try:
+                self._entries.move_to_end((namespace, key))
+            except KeyError:
+                return default
+            return self._entries[(namespace, key)]
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store *value*, dropping the least recently used entry when full."""
+        with self._lock:
+            self._entries[(namespace, key)] = value
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def memoize(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], T],
+        validate: Optional[Callable[[Any], bool]] = None,
+    ) -> T:
+        """Return the cached result for *key*, computing and storing it on a miss."""
+        value = self.get(namespace, key, _MISSING)
+        if value is not _MISSING and (validate is None or validate(value)):
+            return value  # type: ignore[no-any-return]
+        result = compute()
+        self.put(namespace, key, result)
+        return result
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Delete all entries (or those in *namespace*) and return how many went."""
+        with self._lock:
+            doomed = [k for k in self._entries if namespace in (None, k[0])]
+            for k in doomed:
+                del self._entries[k]
+            return len(doomed)
+
+    def close(self) -> None:
+        """Nothing to release; present for interface parity with ResultCache."""
+
+
+class ContentCache:
+    """Size-bounded in-memory LRU of decoded file contents.
+
+    Entries are keyed by path and validated against the file's (mtime_ns, size), so
+    an edited file is re-read on the next request. Files modified within
+    *racy_window_ns* of being read are not cached.
+    """
+
+    def __init__(
+        self, max_bytes: Optional[int] = None, racy_window_ns: int = RACY_WINDOW_NS
+    ):
+        if max_bytes is None:
+            max_mb = float(os.getenv("SAVECODE_DAEMON_CACHE_MB", DEFAULT_MAX_MB))
+            max_bytes = int(max_mb * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.racy_window_ns = racy_window_ns
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+
+    def read(self, path: str, st: os.stat_result) -> str:
+        """Return the text of *path*, from memory while *st* still matches.
+
+        Args:
+            path (str): File to read.
+            st (os.stat_result): A fresh stat of *path*.
+
+        Returns:
+            str: The file contents, decoded as UTF-8 with replacement.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        if st.st_mtime_ns < time.time_ns() - self.racy_window_ns:
+            self._store(path, (st.st_mtime_ns, st.st_size, text))
+        return text
+
+    def _store(self, path: str, entry: Tuple[int, int, str]) -> None:
+        if entry[1] > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[path] = entry
+            self._size += entry[1]
+            while self._size > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._size -= dropped[1]
+
+
+class ListingCache:
+    """Directory listings shared by every walk in one process, for batch runs.
+
+    Each directory is listed once, even when several threads walk overlapping trees
+    at the same time. Listings are never revalidated, so use one instance per batch.
+    """
+
+    def __init__(self) -> None:
+        self.listed = 0
+        self._lock = threading.Lock()
+        self._dir_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Tuple[List[str], List[str], List[str]]] = {}
+
+    def listdir(self, path: str) -> Tuple[List[str], List[str], List[str]]:
+        """Return (dirnames, filenames, symlinked dirnames) for *path*.
+
+        Unreadable directories list as empty, as os.walk skips them.
+        """
+        with self._lock:
+            dir_lock = self._dir_locks.setdefault(path, threading.Lock())
+        with dir_lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                dirs: List[str] = []
+                files: List[str] = []
+                links: List[str] = []
+                try:
+                    with os.scandir(path) as it:
+                        for e in it:
+                            try:
+                                is_dir = e.is_dir()
+                            except OSError:
+                                is_dir = False
+                            if is_dir:
+                                dirs.append(e.name)
+                                if e.is_symlink():
+                                    links.append(e.name)
+                            else:
+                                files.append(e.name)
+                except OSError:
+                    pass
+                entry = self._entries[path] = (dirs, files, links)
+                self.listed += 1
+        return entry
+
+    def walk(
+        self, top: str, followlinks: bool = False
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Cached equivalent of os.walk(top, followlinks=...): top-down, pruned via
+        dirnames."""
+        stack = [top]
+        while stack:
+            dirpath = stack.pop()
+            dirs, files, links = self.listdir(dirpath)
+            dirnames = list(dirs)
+            yield dirpath, dirnames, list(files)
+            stack.extend(
+                os.path.join(dirpath, d)
+                for d in reversed(dirnames)
+                if followlinks or d not in links
+            )
+
+
+def memoize(
+    context: Dict[str, Any],
+    namespace: str,
+    key_parts: Sequence[Any],
+    compute: Callable[[], T],
+    validate: Optional[Callable[[Any], bool]] = None,
+) -> T:
+    """Memoize *compute* through the context's cache, or just call it without one.
+
+    Args:
+        context (Dict[str, Any]): Shared context; caching is enabled when it holds a
+            'cache' entry.
+        namespace (str): Logical step name.
+        key_parts (Sequence[Any]): JSON-serialisable values identifying the inputs;
+            hashed with cache_key() only when a cache is present.
+        compute (Callable[[], T]): Produces the value on a miss.
+        validate (Callable[[Any], bool], optional): Rejects stale cached values.
+
+    Returns:
+        T: The cached or freshly computed value.
+    """
+    cache: Optional[Union[ResultCache, MemoryCache]] = context.get("cache")
+    if cache is None:
+        return compute()
+    return cache.memoize(namespace, cache_key(*key_parts), compute, validate)
+
+
+# End of savecode/utils/cache.py
@@ -5,16 +5,105 @@ argument 'source' that supports commands like 'savecode .' or 'savecode ./'.
 """
 
 import argparse
+import logging
 import os
-from typing import List, Tuple
-from savecode import __version__
+from typing import Any, Dict, List, Optional, Tuple
+from savecode.constants.defaults import (
+    DEFAULT_EXTENSIONS,
+    DEFAULT_OUTLINE_HEAD,
+    DEFAULT_SKIP,
+)
 from savecode.utils.path_utils import normalize_path
+from savecode.utils.display import parse_summary_mode
+from savecode.utils.error_handler import DEFAULT_MAX_EXAMPLES
+from savecode.utils.recency import parse_duration, parse_reference_time
+from savecode.utils.split import parse_split_by
 
+logger = logging.getLogger("savecode.utils.cli_args")
 
-def parse_arguments() -> Tuple[argparse.Namespace, List[str]]:
+
+def _summary_mode(value: str) -> str:
+    try:
+        return parse_summary_mode(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"{e} (choose full, tree, dirs, top-N or none)"
+        ) from e
+
+
+def _duration(value: str) -> float:
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"{e} (e.g. 45s, 30m, 2h, 1d)") from e
+
+
+def _reference_time(value: str) -> int:
+    try:
+        return parse_reference_time(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _split_by(value: str) -> str:
+    try:
+        return parse_split_by(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"{e} (choose dir, ext, top-level-package or module:function)"
+        ) from e
+
+
+def _non_negative(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from e
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
+def _jobs(value: str) -> int:
+    """Worker count: a positive int, or 0 for one per CPU."""
+    return _non_negative(value) or os.cpu_count() or 1
+
+
+def _default_jobs() -> int:
+    """--jobs default from $SAVECODE_JOBS; an invalid value warns and falls back to 1."""
+    raw = os.getenv("SAVECODE_JOBS")
+    if raw is None:
+        return 1
+    try:
+        return _jobs(raw)
+    except argparse.ArgumentTypeError as e:
+        logger.warning("Ignoring SAVECODE_JOBS=%r (%s); using 1 job.", raw, e)
+        return 1
+
+
+class _LazyVersionAction(argparse.Action):
+    """Like action="version", but only looks the version up when -v is given."""
+
+    def __init__(self, option_strings: List[str], dest: str, **kwargs: Any) -> None:
+        kwargs.setdefault("nargs", 0)
+        kwargs.setdefault("default", argparse.SUPPRESS)
+        super().__init__(option_strings, dest, **kwargs)
+
+    def __call__(self, parser: argparse.ArgumentParser, *args: Any) -> None:
+        import savecode
+
+        parser.exit(message=f"{parser.prog} {savecode.__version__}\n")
+
+
+def parse_arguments(
+    argv: Optional[List[str]] = None,
+) -> Tuple[argparse.Namespace, List[str]]:
     """
     Parse command-line arguments for the savecode tool.
 
+    Args:
+        argv (List[str], optional): Arguments to parse. Defaults to sys.argv[1:].
+
     Returns:
         tuple: A tuple containing:
             - argparse.Namespace: Parsed arguments.
@@ -35,25 +124,24 @@ def parse_arguments() -> Tuple[argparse.Namespace, List[str]]:
         "--files",
         nargs="*",
         default=[],
-        help="One or more directories or file paths to include. Accepts both directories and individual files.",
+        help="One or more directories or file paths to include. Accepts directories, individual files and .zip/.whl/.tar.gz archives.",
     )
     parser.add_argument(
         "-o",
         "--output",
         default="./temp.txt",
-        help="Output file path. Defaults to './temp.txt'.",
+        help="Output file path, or '-' for stdout. Defaults to './temp.txt'.",
     )
     parser.add_argument(
         "--skip",
         nargs="*",
-        default=["rnn_src", "node_modules", "dist", "build", ".git"],
+        default=list(DEFAULT_SKIP),
         help="Subdirectory names or file paths to skip (e.g. 'rnn_src' or 'foo/bar.py')",
     )
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"%(prog)s {__version__}",
+        action=_LazyVersionAction,
         help="Show program's version number and exit.",
     )
     parser.add_argument(
@@ -92,6 +180,211 @@ def parse_arguments() -> Tuple[argparse.Namespace, List[str]]:
         action="store_true",
         help="When used with --git, include every file Git reports, ignoring --ext.",
     )
+    parser.add_argument(
+        "--follow-symlinks",
+        action="store_true",
+        help=(
+            "Also walk symlinked directories. Directories reached twice (e.g. via "
+            "a symlink loop) are entered only once."
+        ),
+    )
+    parser.add_argument(
+        "--changed-within",
+        type=_duration,
+        default=None,
+        metavar="DURATION",
+        help="Only include files modified within DURATION (e.g. 30m, 2h, 1d).",
+    )
+    parser.add_argument(
+        "--newer-than",
+        type=_reference_time,
+        default=None,
+        metavar="FILE|TIME",
+        help=(
+            "Only include files modified after FILE was (e.g. the previous bundle) "
+            "or after an ISO date/time such as 2024-05-01T09:30."
+        ),
+    )
+    parser.add_argument(
+        "--entry",
+        nargs="+",
+        default=None,
+        metavar="SCRIPT",
+        help=(
+            "Bundle only these scripts and the local modules they import, directly "
+            "or transitively, from the gathered roots (default root: the current "
+            "directory)."
+        ),
+    )
+    parser.add_argument(
+        "--dep-order",
+        action="store_true",
+        help="With --entry: list imported modules before the files that import them.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_jobs,
+        default=_default_jobs(),
+        metavar="N",
+        help=(
+            "Read and format files on N worker processes (0 = one per CPU). "
+            "Defaults to $SAVECODE_JOBS or 1."
+        ),
+    )
+    parser.add_argument(
+        "--outline",
+        action="store_true",
+        help=(
+            "Write Python files as skeletons (signatures, decorators, first docstring "
+            "lines, constants, original line numbers) instead of full contents."
+        ),
+    )
+    parser.add_argument(
+        "--outline-head",
+        type=int,
+        default=DEFAULT_OUTLINE_HEAD,
+        metavar="BYTES",
+        help=(
+            "With --outline: keep only about this many leading bytes of non-Python "
+            f"files (default {DEFAULT_OUTLINE_HEAD}, 0 = whole files)."
+        ),
+    )
+    parser.add_argument(
+        "--notebook-outputs",
+        action="store_true",
+        help=(
+            "Jupyter notebooks are bundled as their code and markdown cells; also "
+            "include the cells' text outputs."
+        ),
+    )
+    parser.add_argument(
+        "--binary",
+        choices=("skip", "stub"),
+        default="skip",
+        help=(
+            "What to do with binary files (images, .pyc, databases, ...): skip them "
+            "(default) or keep a one-line placeholder in the bundle."
+        ),
+    )
+    parser.add_argument(
+        "--split-by",
+        type=_split_by,
+        default=None,
+        metavar="{dir,ext,top-level-package,MODULE:FUNCTION}",
+        help=(
+            "Write one bundle per directory, extension, top-level package or custom "
+            "key (a function of the relative path) next to the output, which becomes "
+            "an index of the bundles. The bundles are written concurrently, sharing one "
+            "worker pool with --jobs."
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "Rewrite the output even if its fingerprint (OUTPUT.fp) shows that no "
+            "input changed since it was written."
+        ),
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        default=os.getenv("SAVECODE_CACHE") == "1",
+        help=(
+            "Reuse results from previous runs (e.g. directory walks) stored in the "
+            "user cache directory. Also enabled by SAVECODE_CACHE=1. "
+            "Manage the store with 'savecode cache stats|clear'."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-plugin wall/CPU time and memory peaks to stderr after the run.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        default=None,
+        help="Write a Chrome trace event file (chrome://tracing, Perfetto) to PATH.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=_non_negative,
+        default=DEFAULT_MAX_EXAMPLES,
+        metavar="N",
+        help=(
+            "Show at most N examples of each kind of problem (missing, oversized, "
+            f"unreadable files...); the rest are counted. Defaults to {DEFAULT_MAX_EXAMPLES}."
+        ),
+    )
+    parser.add_argument(
+        "--summary",
+        type=_summary_mode,
+        default=None,
+        metavar="{full,tree,dirs,top-N,none}",
+        help=(
+            "How to list saved files after a run: every file by directory (full), a "
+            "directory tree, per-directory counts (dirs), the N largest files "
+            "(e.g. top-20) or nothing. Defaults to full, or dirs above 1000 files."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help=(
+            "Count lines, blank/comment lines and estimated tokens per file while "
+            "reading, and add totals per extension to the bundle banner and summary."
+        ),
+    )
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Write per-file statistics with totals per extension and per directory "
+            "to PATH as JSON (implies --stats)."
+        ),
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Build every bundle described in a TOML manifest ([[job]] tables with "
+            "roots/ext/skip/output) in one process, sharing directory listings "
+            "and file reads."
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Run a resident server that keeps the file index and file contents warm "
+            "and answers 'savecode --client ...' requests over a Unix socket."
+        ),
+    )
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help=(
+            "Forward the other arguments to a running daemon "
+            "(or run locally if none is listening)."
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=os.getenv("SAVECODE_SOCKET"),
+        help="Daemon socket path. Defaults to $SAVECODE_SOCKET or a per-user path.",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=900.0,
+        metavar="SECONDS",
+        help="With --daemon: exit after this many idle seconds (0 = never). Default 900.",
+    )
     # New optional positional argument to support commands like "savecode ." or "savecode ./"
     parser.add_argument(
         "source",
@@ -99,22 +392,30 @@ def parse_arguments() -> Tuple[argparse.Namespace, List[str]]:
         default=[],
         help="Optional positional argument(s) specifying directories or file paths.",
     )
-    args, extra_args = parser.parse_known_args()
+    args, extra_args = parser.parse_known_args(argv)
 
     # Did the caller explicitly give --ext/--extensions?
     ext_provided = args.ext is not None  # <── NEW
 
     # If not, fall back to the historical default ("py")
     if not ext_provided:
-        args.ext = ["py"]
+        args.ext = list(DEFAULT_EXTENSIONS)
 
     # Stash the flag so plugins can see it
     setattr(args, "ext_provided", ext_provided)  # <── NEW
 
+    # Each distinct argument is normalized and checked on disk once, even though
+    # positional sources are classified here and again by reclassify() below.
+    dir_cache: Dict[str, bool] = {}
+
+    def is_dir(path: str) -> bool:
+        if path not in dir_cache:
+            dir_cache[path] = os.path.isdir(normalize_path(path))
+        return dir_cache[path]
+
     # Append positional source arguments into roots/files lists.
     for src in args.source:
-        normalized_src = normalize_path(src)
-        if os.path.isdir(normalized_src):
+        if is_dir(src):
             args.roots.append(src)
         else:
             args.files.append(src)
@@ -124,13 +425,16 @@ def parse_arguments() -> Tuple[argparse.Namespace, List[str]]:
         dirs: List[str] = []
         files: List[str] = []
         for p in paths:
-            normalized_p = normalize_path(p)
-            if os.path.isdir(normalized_p):
+            if is_dir(p):
                 dirs.append(p)
             else:
                 files.append(p)
         return dirs, files
 
+    # An entry point alone resolves its imports against the current directory.
+    if args.entry and not args.roots and not args.files:
+        args.roots.append(".")
+
     roots_dirs, roots_files = reclassify(args.roots)
     files_dirs, files_files = reclassify(args.files)
 
@@ -1,33 +1,46 @@
 """
 Cross-platform clipboard helper used by SavePlugin.
 Falls back silently if the platform has no clipboard.
+
+The clipboard backend (pyperclip, or a platform tool via subprocess) is only
+imported on the first copy, keeping it off the CLI's startup path.
 """
 
-import subprocess
 import os
 import sys
+from typing import Callable, Optional
+
+_COPY: Optional[Callable[[str], None]] = None
 
-try:
-    import pyperclip  # type: ignore
 
-    def _COPY(txt: str) -> None:
-        pyperclip.copy(txt)
+def _load_backend() -> Callable[[str], None]:
+    """Pick the clipboard implementation for this platform."""
+    try:
+        import pyperclip  # type: ignore
+
+        def _copy(txt: str) -> None:
+            pyperclip.copy(txt)
+
+        return _copy
+    except Exception:  # pyperclip not installed or unsupported
+        pass
+
+    import subprocess
 
-except Exception:  # pyperclip not installed or unsupported
     if sys.platform == "win32":
 
-        def _COPY(txt: str) -> None:
+        def _copy(txt: str) -> None:
             p = subprocess.Popen(["clip"], stdin=subprocess.PIPE, close_fds=True)
             p.communicate(txt.encode("utf-8"))
 
     elif sys.platform == "darwin":
 
-        def _COPY(txt: str) -> None:
+        def _copy(txt: str) -> None:
             subprocess.run(["pbcopy"], input=txt.encode())
 
     else:  # X11 / Wayland
 
-        def _COPY(txt: str) -> None:
+        def _copy(txt: str) -> None:
             subprocess.run(
                 ["xclip", "-selection", "clipboard"],
                 input=txt.encode(),
@@ -35,15 +48,20 @@ except Exception:  # pyperclip not installed or unsupported
                 stderr=subprocess.DEVNULL,
             )
 
+    return _copy
+
 
 def copy(text: str) -> None:
     """
     Copy *text* to the system clipboard unless the user opted out by
     setting SAVECODE_NOCOPY=1.
     """
+    global _COPY
     if os.getenv("SAVECODE_NOCOPY") == "1":
         return
     try:
+        if _COPY is None:
+            _COPY = _load_backend()
         _COPY(text)
     except Exception:
         pass  # never break the main flow
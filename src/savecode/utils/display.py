@@ -1,51 +1,216 @@
 """
 savecode/utils/display.py - Module for displaying file list and summary in CLI.
+
+The summary is rendered into a single string and written in one call. Relative paths
+and sizes come from context['saved_files'] (filled by SavePlugin) when available.
+Modes (--summary):
+  - full: every file, grouped by directory (the default).
+  - tree: a directory tree; directories with many files are collapsed to counts.
+  - dirs: one line per directory with file and byte counts.
+  - top-N: the N largest files (e.g. top-20).
+  - none: only the closing line.
+Without an explicit mode, runs saving more than AUTO_COLLAPSE_FILES files fall back
+from full to dirs. With --stats, per-extension totals from context['file_stats']
+follow the listing.
 """
 
 import os
+import re
+import sys
 from collections import defaultdict
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
 from savecode.utils.colors import BLUE, WHITE, BG_CYAN, RESET
-from savecode.utils.path_utils import relative_path
+from savecode.utils.stats import format_stats
+from savecode.utils.path_record import path_table
+
+SUMMARY_MODES = ("full", "tree", "dirs", "top-N", "none")
+
+# Without --summary, larger runs are summarised per directory instead of per file.
+AUTO_COLLAPSE_FILES = 1000
+
+# In tree mode, directories holding more files than this show counts only.
+TREE_DIR_LIMIT = 20
+
+_TOP_RE = re.compile(r"top-(\d+)$")
+
+
+def parse_summary_mode(value: str) -> str:
+    """Validate a --summary value ('full', 'tree', 'dirs', 'top-<N>' or 'none').
+
+    Args:
+        value (str): The raw option value.
 
+    Returns:
+        str: The lower-cased mode.
 
-def display_summary(context: Dict[str, Any]) -> None:
+    Raises:
+        ValueError: If the value is not a known mode.
     """
-    Displays a summary of the saved source files, grouped by directory.
+    mode = value.lower()
+    if mode in ("full", "tree", "dirs", "none") or _TOP_RE.match(mode):
+        return mode
+    raise ValueError(f"unknown summary mode {value!r}")
+
+
+def _format_size(size: int) -> str:
+    """Return *size* in bytes as a short human-readable string."""
+    amount = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if amount < 1024:
+            return f"{amount:.0f} {unit}" if unit == "B" else f"{amount:.1f} {unit}"
+        amount /= 1024
+    return f"{amount:.1f} GiB"
+
+
+def _saved_entries(context: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """Return (relative path, size) pairs for the saved files."""
+    saved: Optional[List[Tuple[str, int]]] = context.get("saved_files")
+    if saved is not None:
+        return saved
+    # Not produced by SavePlugin (e.g. a custom pipeline): derive from the shared
+    # path records, reusing any relative path or stat already computed.
+    paths = path_table(context)
+    entries = []
+    for file in context.get("all_files", []):
+        record = paths.get(file)
+        try:
+            size = record.stat().st_size
+        except OSError:
+            size = 0
+        entries.append((record.rel, size))
+    return entries
+
+
+def _group_by_dir(
+    entries: List[Tuple[str, int]],
+) -> Dict[str, List[Tuple[str, int]]]:
+    """Group entries by directory, using "root" for the current directory."""
+    grouped: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+    for rel_path, size in entries:
+        grouped[os.path.dirname(rel_path) or "root"].append((rel_path, size))
+    return grouped
+
+
+def _render_full(entries: List[Tuple[str, int]], lines: List[str]) -> None:
+    grouped = _group_by_dir(entries)
+    # Sort groups for consistent ordering, with a blank line between groups.
+    for group in sorted(grouped):
+        lines.append("")
+        lines.append(f"{WHITE}{group}:{RESET}")
+        lines.extend(f"{BLUE}- {rel_path}{RESET}" for rel_path, _ in grouped[group])
+
+
+def _render_dirs(entries: List[Tuple[str, int]], lines: List[str]) -> None:
+    grouped = _group_by_dir(entries)
+    width = max((len(group) for group in grouped), default=0)
+    lines.append("")
+    for group in sorted(grouped):
+        files = grouped[group]
+        total = sum(size for _, size in files)
+        lines.append(
+            f"{WHITE}{group:<{width}}{RESET}  {len(files):>7} files  "
+            f"{_format_size(total):>10}"
+        )
+
+
+def _render_tree(entries: List[Tuple[str, int]], lines: List[str]) -> None:
+    grouped = _group_by_dir(entries)
+    lines.append("")
+    printed: Set[str] = set()
+
+    def parts_of(group: str) -> List[str]:
+        return [] if group == "root" else group.split(os.sep)
+
+    for group in sorted(grouped, key=parts_of):
+        parts = parts_of(group)
+        # Emit any ancestor directories not printed yet.
+        for depth in range(len(parts)):
+            ancestor = os.sep.join(parts[: depth + 1])
+            if ancestor not in printed:
+                printed.add(ancestor)
+                lines.append(f"{'  ' * depth}{WHITE}{parts[depth]}/{RESET}")
+        indent = "  " * len(parts)
+        files = grouped[group]
+        if len(files) > TREE_DIR_LIMIT:
+            total = sum(size for _, size in files)
+            lines.append(
+                f"{indent}{BLUE}({len(files)} files, {_format_size(total)}){RESET}"
+            )
+        else:
+            lines.extend(
+                f"{indent}{BLUE}{os.path.basename(rel_path)}{RESET}"
+                for rel_path, _ in files
+            )
+
+
+def _render_top(entries: List[Tuple[str, int]], count: int, lines: List[str]) -> None:
+    largest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:count]
+    lines.append("")
+    lines.extend(
+        f"{BLUE}{_format_size(size):>10}  {rel_path}{RESET}"
+        for rel_path, size in largest
+    )
+    if len(entries) > count:
+        lines.append(f"{'':>10}  ... and {len(entries) - count} more")
+
+
+def display_summary(context: Dict[str, Any], stream: Optional[TextIO] = None) -> None:
+    """
+    Displays a summary of the saved source files in the mode chosen by --summary.
 
     Expects the context to have:
-      - 'all_files': list of source file paths.
+      - 'all_files' or 'saved_files': the saved source files.
       - 'output': the output file path.
+      - 'cli_opts' (optional): with 'summary', the summary mode.
+      - 'file_stats' (optional): per-file statistics (--stats).
+      - 'partitions' (optional): the bundles of a --split-by run.
 
-    The function groups files by their directory, prints a header for each group with a newline
-    separation, and then prints a summary line indicating the total number of files saved and the output file path.
+    Args:
+        context (Dict[str, Any]): Shared context.
+        stream (TextIO, optional): Destination. Defaults to sys.stdout.
     """
-    all_files: List[str] = context.get("all_files", [])
+    entries = _saved_entries(context)
     output = context.get("output", "./temp.txt")
+    mode = context.get("cli_opts", {}).get("summary")
+    collapsed = mode is None and len(entries) > AUTO_COLLAPSE_FILES
+    if mode is None:
+        mode = "dirs" if collapsed else "full"
 
-    # Group files by their directory.
-    grouped_files = defaultdict(list)
-    for file in all_files:
-        rel_path = relative_path(file)
-        dir_name = os.path.dirname(rel_path)
-        # Use "root" as header if file is in the current directory.
-        header = dir_name if dir_name else "root"
-        grouped_files[header].append(rel_path)
-
-    # Print the grouped files.
-    print(f"\n{WHITE}{BG_CYAN}Files saved ({len(all_files)}):{RESET}")
-    # Sort groups for consistent ordering.
-    for group in sorted(grouped_files.keys()):
-        # Add a newline between groups.
-        print()
-        print(f"{WHITE}{group}:{RESET}")
-        for file in grouped_files[group]:
-            print(f"{BLUE}- {file}{RESET}")
-
-    # Print the summary line at the bottom.
-    print(
-        f"\n{WHITE}{BG_CYAN}Saved code from {len(all_files)} files to {output}{RESET}\n"
-    )
+    lines = [f"\n{WHITE}{BG_CYAN}Files saved ({len(entries)}):{RESET}"]
+    if collapsed:
+        lines.append("(grouped by directory; use --summary full to list every file)")
+    top = _TOP_RE.match(mode)
+    if mode == "full":
+        _render_full(entries, lines)
+    elif mode == "tree":
+        _render_tree(entries, lines)
+    elif mode == "dirs":
+        _render_dirs(entries, lines)
+    elif top:
+        _render_top(entries, int(top.group(1)), lines)
+    elif mode == "none":
+        lines = []
+
+    file_stats = context.get("file_stats")
+    if file_stats is not None:
+        stats_lines = format_stats(file_stats)
+        lines.append("")
+        lines.append(f"{WHITE}{stats_lines[0]}{RESET}")
+        lines.extend(stats_lines[1:])
+
+    # The summary line at the bottom.
+    partitions = context.get("partitions")
+    if partitions is not None:
+        closing = (
+            f"Saved code from {len(entries)} files to {len(partitions)} bundles "
+            f"listed in {output}"
+        )
+    else:
+        closing = f"Saved code from {len(entries)} files to {output}"
+    if context.get("bundle_unchanged"):
+        closing += " (unchanged, not rewritten)"
+    lines.append(f"\n{WHITE}{BG_CYAN}{closing}{RESET}\n")
+    (stream or sys.stdout).write("\n".join(lines) + "\n")
 
 
 # End of savecode/utils/display.py
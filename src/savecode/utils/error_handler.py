@@ -2,17 +2,142 @@
 savecode/utils/error_handler.py - Helper functions for error logging and aggregation.
 
 Provides a unified function to log messages and record them in the shared context.
+context['errors'] is either a plain list of messages or an ErrorCollector, which
+counts problems per severity and category but keeps (and logs) only the first few
+examples of each, so trees with many thousands of unreadable or oversized files stay
+cheap to report on.
 """
 
-from typing import Dict, Any, List
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
 
+# Default number of examples kept per category (see --max-errors).
+DEFAULT_MAX_EXAMPLES = 10
+
+SEVERITIES = ("error", "warning", "info")
+
+
+class ErrorRecord:
+    """One recorded problem."""
+
+    __slots__ = ("message", "severity", "category", "path")
+
+    def __init__(
+        self, message: str, severity: str, category: str, path: Optional[str]
+    ) -> None:
+        self.message = message
+        self.severity = severity
+        self.category = category
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"ErrorRecord({self.severity}/{self.category}: {self.message!r})"
+
+
+class ErrorCollector:
+    """Thread-safe, bounded aggregation of errors and warnings.
+
+    Every problem is counted per (severity, category); only the first
+    *max_examples* of each category are kept. Iterating yields the kept messages, so
+    code written for the old list of strings keeps working.
+    """
+
+    def __init__(self, max_examples: int = DEFAULT_MAX_EXAMPLES) -> None:
+        self.max_examples = max(0, max_examples)
+        self.records: List[ErrorRecord] = []
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        message: str,
+        severity: str = "error",
+        category: str = "general",
+        path: Optional[str] = None,
+    ) -> bool:
+        """Count a problem and keep it as an example if its category has room.
+
+        Args:
+            message (str): Human-readable description.
+            severity (str, optional): "error", "warning" or "info". Defaults to "error".
+            category (str, optional): Short machine-readable kind, e.g. "oversized".
+            path (str, optional): The file or directory concerned.
+
+        Returns:
+            bool: True if the problem was kept as an example.
+        """
+        key = (severity, category)
+        with self._lock:
+            seen = self.counts.get(key, 0)
+            self.counts[key] = seen + 1
+            if seen >= self.max_examples:
+                return False
+            self.records.append(ErrorRecord(message, severity, category, path))
+            return True
+
+    # List compatibility for plugins that append messages directly.
+    def append(self, message: str) -> None:
+        self.record(message)
+
+    def extend(self, messages: Iterable[str]) -> None:
+        for message in messages:
+            self.record(message)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([r.message for r in self.records])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __bool__(self) -> bool:
+        return bool(self.counts)
+
+    def total(self, severity: Optional[str] = None) -> int:
+        """Return how many problems were recorded (of *severity*, if given)."""
+        return sum(n for (sev, _), n in self.counts.items() if severity in (None, sev))
+
+    def has_errors(self) -> bool:
+        """Return True if any problem of severity "error" was recorded."""
+        return self.total("error") > 0
+
+    def report_lines(self, severity: str) -> List[str]:
+        """Render the kept examples of *severity*, plus a count of the rest.
+
+        Args:
+            severity (str): Which problems to render.
+
+        Returns:
+            List[str]: "- <message>" lines, then one "... and N more" line per
+            truncated category.
+        """
+        lines = [f"- {r.message}" for r in self.records if r.severity == severity]
+        for (sev, category), count in sorted(self.counts.items()):
+            hidden = count - self.max_examples
+            if sev == severity and hidden > 0:
+                lines.append(f"  ... and {hidden} more {category} {severity}s")
+        return lines
+
+    def format_report(self) -> str:
+        """Render errors, then warnings, as the CLI prints them after a run."""
+        text = ""
+        for severity, title in (
+            ("error", "Errors encountered"),
+            ("warning", "Warnings"),
+        ):
+            lines = self.report_lines(severity)
+            if lines:
+                text += f"\n{title}:\n" + "\n".join(lines) + "\n"
+        return text
+
 
 def log_and_record_error(
     message: str,
     context: Dict[str, Any],
     logger: logging.Logger,
     level: str = "error",
+    category: str = "general",
+    path: Optional[str] = None,
     **kwargs: Any,
 ) -> None:
     """Log a message and record it in the context's error list.
@@ -22,12 +147,21 @@ def log_and_record_error(
         context (Dict[str, Any]): The shared context dictionary where errors are aggregated.
         logger (logging.Logger): The logger instance to use for logging.
         level (str, optional): Logging level; one of "error", "warning", "info", or "debug". Defaults to "error".
+        category (str, optional): Problem kind used for counting (ErrorCollector only).
+        path (str, optional): The file or directory concerned (ErrorCollector only).
         **kwargs: Additional keyword arguments to pass to the logger (e.g., exc_info=True).
 
     Returns:
         None
     """
     level = level.lower()
+    errors = context.setdefault("errors", [])
+    if isinstance(errors, ErrorCollector):
+        severity = level if level in SEVERITIES else "info"
+        if not errors.record(message, severity, category, path):
+            level = "debug"  # counted, but past the example limit: keep logs quiet
+    else:
+        errors.append(message)
     if level == "error":
         logger.error(message, **kwargs)
     elif level == "warning":
@@ -36,5 +170,3 @@ def log_and_record_error(
         logger.info(message, **kwargs)
     else:
         logger.debug(message, **kwargs)
-    errors: List[str] = context.setdefault("errors", [])
-    errors.append(message)
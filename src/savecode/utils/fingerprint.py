@@ -0,0 +1,125 @@
+"""
+savecode/utils/fingerprint.py - Detect that a bundle is already up to date.
+
+After writing a bundle, SavePlugin stores a fingerprint of its inputs next to it
+(OUTPUT.fp): a digest of the ordered file list with each file's size and mtime plus
+the options that shape the bundle, together with the bundle's own size and mtime
+and the (relative path, size) list the summary needs. When the next run gathers the
+same files and nothing changed, SavePlugin skips reading and writing entirely;
+checking costs one stat per file and no content reads.
+
+No fingerprint is written when a run recorded problems, or when an input was
+modified within RACY_WINDOW_NS of the run (mtime granularity could hide a later
+edit), so such runs are always redone.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from savecode.utils.archive import split_member_path
+from savecode.utils.cache import RACY_WINDOW_NS
+from savecode.utils.path_record import path_table
+
+logger = logging.getLogger("savecode.utils.fingerprint")
+
+FINGERPRINT_SUFFIX = ".fp"
+# Bump when the bundle layout changes, so older fingerprints stop matching.
+FINGERPRINT_VERSION = 1
+
+
+def fingerprint_path(output: str) -> str:
+    """Return the fingerprint sidecar path for the bundle *output*."""
+    return output + FINGERPRINT_SUFFIX
+
+
+def input_fingerprint(
+    files: List[str], context: Dict[str, Any], options: Dict[str, Any]
+) -> Tuple[Optional[str], bool]:
+    """Digest *files* (path, size, mtime, in order) and *options*.
+
+    Archive members contribute their archive's stat. The stat results go through the
+    shared path records, so a run that does read the files does not stat them again.
+
+    Args:
+        files (List[str]): Gathered paths, in bundle order.
+        context (Dict[str, Any]): Shared context holding the path table.
+        options (Dict[str, Any]): JSON-serialisable settings that affect the bundle.
+
+    Returns:
+        Tuple[Optional[str], bool]: The hex digest (None if a file cannot be
+        stat'ed) and whether every mtime is old enough to be trusted.
+    """
+    paths = path_table(context)
+    digest = hashlib.sha256(
+        json.dumps([FINGERPRINT_VERSION, options], sort_keys=True).encode("utf-8")
+    )
+    settled_ns = time.time_ns() - RACY_WINDOW_NS
+    settled = True
+    for file in files:
+        member = split_member_path(file)
+        try:
+            st = paths.get(member[0] if member is not None else file).stat()
+        except OSError:
+            return None, False
+        settled = settled and st.st_mtime_ns < settled_ns
+        digest.update(f"{file}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest(), settled
+
+
+def _output_stamp(output: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(output)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_unchanged(output: str, digest: str) -> Optional[List[Tuple[str, int]]]:
+    """Return the saved-file list if *output* still matches *digest*, else None.
+
+    Args:
+        output (str): Bundle path.
+        digest (str): Fingerprint of the current inputs.
+
+    Returns:
+        Optional[List[Tuple[str, int]]]: (relative path, size) of the bundled files
+        when the fingerprint and the bundle itself are unchanged.
+    """
+    try:
+        with open(fingerprint_path(output), encoding="utf-8") as f:
+            doc = json.load(f)
+        if doc["digest"] != digest or doc["output"] != _output_stamp(output):
+            return None
+        return [(rel, size) for rel, size in doc["saved"]]
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def write_fingerprint(output: str, digest: str, saved: List[Tuple[str, int]]) -> None:
+    """Store *digest* for the just-written bundle *output*; failures are logged."""
+    sidecar = fingerprint_path(output)
+    stamp = _output_stamp(output)
+    if stamp is None:
+        return
+    try:
+        tmp = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"digest": digest, "output": stamp, "saved": saved}, f)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.debug("Could not write fingerprint %s: %s", sidecar, e)
+
+
+def discard_fingerprint(output: str) -> None:
+    """Remove a stale fingerprint so a failed or partial run is never reused."""
+    try:
+        os.unlink(fingerprint_path(output))
+    except OSError:
+        pass
+
+
+# End of savecode/utils/fingerprint.py
@@ -32,6 +32,11 @@ def configure_logging(level: int = logging.WARNING) -> None:
 
         # Prevent messages from propagating to the root logger to avoid duplicate logs.
         logger.propagate = False
+    else:
+        # Reconfiguring (e.g. per request in a long-lived daemon) only adjusts levels.
+        logger.setLevel(level)
+        for handler in logger.handlers:
+            handler.setLevel(level)
 
     # Optionally, configure the root logger if desired (uncomment the following line)
     # logging.getLogger().setLevel(level)
@@ -0,0 +1,290 @@
+"""
+savecode/utils/notebook.py - Extract the cells of Jupyter notebooks for bundling.
+
+A .ipynb file is mostly JSON-escaped outputs (often base64 images), so SavePlugin
+bundles only its code and markdown cells, numbered in notebook order, plus the text
+outputs when cli_opts['notebook_outputs'] is set:
+
+    # ---- cell 1: markdown ----
+    # Analysis
+
+    # ---- cell 2: code ----
+    df = load()
+
+The notebook is read as a stream of JSON events, so even a notebook of tens of MB
+is never built into a Python object tree. ijson is used when installed (pip install
+savecode[notebooks]); otherwise a small incremental parser built on the standard
+json module produces the same (prefix, event, value) events.
+"""
+
+import io
+import json
+import logging
+import re
+from typing import Any, BinaryIO, Iterator, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger("savecode.utils.notebook")
+
+# Notebooks up to this size are extracted; larger ones get the normal size limit.
+NOTEBOOK_MAX_BYTES = 256 * 1024 * 1024
+
+# Characters read at a time by the fallback parser.
+CHUNK_CHARS = 1 << 16
+
+Event = Tuple[str, str, Any]
+
+_WS_RE = re.compile(r"[ \t\r\n]*")
+_BARE_RE = re.compile(r'[^ \t\r\n,:\[\]{}"]+')
+_LITERALS = {"true": True, "false": False, "null": None}
+
+# Cell fields (relative to "cells.item.") that hold text.
+_SOURCE_FIELDS = ("source", "source.item")
+_OUTPUT_FIELDS = (
+    "outputs.item.text",
+    "outputs.item.text.item",
+    "outputs.item.data.text/plain",
+    "outputs.item.data.text/plain.item",
+)
+
+
+def is_notebook(path: str) -> bool:
+    """Return True if *path* names a Jupyter notebook."""
+    return path.lower().endswith(".ipynb")
+
+
+class _Lexer:
+    """Tokenises JSON from a text stream, holding at most one token in memory."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, at_least: int = CHUNK_CHARS) -> bool:
+        """Drop consumed text and append more; False at end of input."""
+        if self._eof:
+            return False
+        chunk = self._f.read(at_least)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def tokens(self) -> Iterator[Tuple[str, Any]]:
+        """Yield ('{', None), ... (':' and ',' too), ('string', s) or ('scalar', v)."""
+        while True:
+            self._pos = _WS_RE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos >= len(self._buf):
+                if self._fill():
+                    continue
+                return
+            char = self._buf[self._pos]
+            if char in "{}[]:,":
+                self._pos += 1
+                yield char, None
+            elif char == '"':
+                yield "string", self._string()
+            else:
+                yield "scalar", self._scalar()
+
+    def _string(self) -> str:
+        search = self._pos + 1
+        while True:
+            end = self._buf.find('"', search)
+            if end < 0:
+                # Grow geometrically so a long string is copied O(1) times on average.
+                search = len(self._buf) - self._pos
+                if not self._fill(max(CHUNK_CHARS, len(self._buf))):
+                    raise ValueError("unterminated string in notebook")
+                continue
+            backslashes = 0
+            while self._buf[end - 1 - backslashes] == "\\":
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            search = end + 1
+        raw = self._buf[self._pos : end + 1]
+        self._pos = end + 1
+        value: str = json.loads(raw)
+        return value
+
+    def _scalar(self) -> Any:
+        while True:
+            match = _BARE_RE.match(self._buf, self._pos)
+            if match is None:
+                raise ValueError(f"unexpected {self._buf[self._pos]!r} in notebook")
+            if match.end() < len(self._buf) or not self._fill():
+                break
+        self._pos = match.end()
+        word = match.group()
+        if word in _LITERALS:
+            return _LITERALS[word]
+        return json.loads(word)
+
+
+def _join(prefix: str, name: str) -> str:
+    return f"{prefix}.{name}" if prefix else name
+
+
+def parse_events(f: TextIO) -> Iterator[Event]:
+    """Yield ijson.parse()-style (prefix, event, value) tuples for JSON text *f*.
+
+    Raises:
+        ValueError: If the input is not well-formed JSON.
+    """
+    # (container kind, prefix of the container itself)
+    stack: List[Tuple[str, str]] = []
+    value_prefix = ""
+    expect_key = False
+    for token, value in _Lexer(f).tokens():
+        if token == ",":
+            expect_key = bool(stack) and stack[-1][0] == "{"
+            continue
+        if token == ":":
+            continue
+        if token in "}]" and stack:
+            _, prefix = stack.pop()
+            expect_key = False
+            yield prefix, "end_map" if token == "}" else "end_array", None
+            continue
+        if expect_key:
+            if token != "string":
+                raise ValueError("expected an object key in notebook")
+            yield stack[-1][1], "map_key", value
+            value_prefix = _join(stack[-1][1], value)
+            expect_key = False
+            continue
+        if stack and stack[-1][0] == "[":
+            prefix = _join(stack[-1][1], "item")
+        else:
+            prefix = value_prefix
+        if token == "{":
+            yield prefix, "start_map", None
+            stack.append(("{", prefix))
+            expect_key = True
+        elif token == "[":
+            yield prefix, "start_array", None
+            stack.append(("[", prefix))
+        elif token == "string":
+            yield prefix, "string", value
+        elif token == "scalar":
+            kind = "null" if value is None else "boolean"
+            if value is not None and not isinstance(value, bool):
+                kind = "number"
+            yield prefix, kind, value
+        else:
+            raise ValueError(f"unexpected {token!r} in notebook")
+    if stack:
+        raise ValueError("notebook ends inside an object or array")
+
+
+def _events(f: BinaryIO) -> Iterator[Event]:
+    try:
+        import ijson  # type: ignore
+    except ImportError:
+        text = io.TextIOWrapper(f, encoding="utf-8", errors="replace")
+        try:
+            yield from parse_events(text)
+        finally:
+            text.detach()  # leave *f* open for the caller
+        return
+    events: Iterator[Event] = ijson.parse(f)
+    yield from events
+
+
+class _Cell:
+    __slots__ = ("kind", "source", "outputs")
+
+    def __init__(self) -> None:
+        self.kind = ""
+        self.source: List[str] = []
+        self.outputs: List[str] = []
+
+
+def _render(cell: _Cell, number: int, lines: List[str]) -> None:
+    if cell.kind not in ("code", "markdown"):
+        return
+    source = "".join(cell.source)
+    lines.append(f"# ---- cell {number}: {cell.kind} ----\n")
+    lines.append(source if source.endswith("\n") or not source else source + "\n")
+    output = "".join(cell.outputs)
+    if output:
+        lines.append(f"\n# ---- cell {number}: output ----\n")
+        lines.append(output if output.endswith("\n") else output + "\n")
+    lines.append("\n")
+
+
+def extract_cells(f: BinaryIO, outputs: bool = False) -> Optional[str]:
+    """Return the code and markdown cells of the notebook in *f* as text.
+
+    Args:
+        f (BinaryIO): The notebook, opened in binary mode.
+        outputs (bool, optional): Also include text outputs (stream text, plain-text
+            results and error names/values). Defaults to False.
+
+    Returns:
+        Optional[str]: The cells, or None if *f* holds no nbformat 4 cell list.
+
+    Raises:
+        ValueError: If the notebook is not valid JSON (ijson raises its own
+            JSONError, which callers treat the same way).
+    """
+    lines: List[str] = []
+    cell: Optional[_Cell] = None
+    number = 0
+    found = False
+    for prefix, event, value in _events(f):
+        if prefix == "cells":
+            found = True
+            continue
+        if prefix == "cells.item":
+            if event == "start_map":
+                cell = _Cell()
+            elif event == "end_map" and cell is not None:
+                number += 1
+                _render(cell, number, lines)
+                cell = None
+            continue
+        if cell is None or event != "string" or not prefix.startswith("cells.item."):
+            continue
+        field = prefix[len("cells.item.") :]
+        if field == "cell_type":
+            cell.kind = value
+        elif field in _SOURCE_FIELDS:
+            cell.source.append(value)
+        elif outputs and field in _OUTPUT_FIELDS:
+            cell.outputs.append(value)
+        elif outputs and field == "outputs.item.ename":
+            cell.outputs.append(f"{value}: ")
+        elif outputs and field == "outputs.item.evalue":
+            cell.outputs.append(f"{value}\n")
+    return "".join(lines) if found else None
+
+
+def read_notebook(path: str, outputs: bool = False) -> Optional[str]:
+    """Return the extracted cells of the notebook at *path*, or None.
+
+    None means the file should be bundled like any other file: it is not a
+    readable nbformat 4 notebook.
+    """
+    try:
+        with open(path, "rb") as f:
+            return extract_cells(f, outputs)
+    except Exception as e:
+        logger.debug("Could not extract cells from %s: %s", path, e)
+        return None
+
+
+def notebook_from_bytes(data: bytes, outputs: bool = False) -> Optional[str]:
+    """Like read_notebook(), for a notebook already in memory (archive members)."""
+    try:
+        return extract_cells(io.BytesIO(data), outputs)
+    except Exception as e:
+        logger.debug("Could not extract notebook cells: %s", e)
+        return None
+
+
+# End of savecode/utils/notebook.py
@@ -0,0 +1,193 @@
+"""
+savecode/utils/outline.py - Python module skeletons for --outline bundles.
+
+outline_source() parses a module with ast and keeps what an overview needs: the
+module docstring's first line, module-level constants, and every class and function
+signature (with decorators and the first line of its docstring). Each body is
+replaced by "..." plus the original line range, and constants and classes whose
+members are listed carry theirs as a trailing comment, e.g.
+
+    LIMIT = 10  # L5
+    class Loader:  # L8-60
+        @cached
+        def load(self, path: str) -> Config:
+            ...  # L12-40
+
+Docstring lines that would not survive triple quotes (quotes, backslashes,
+control characters) are written with repr().
+
+Files that are not Python (or do not parse) are kept whole, or cut to a head of
+at most --outline-head bytes. Outlines are memoized by content hash through the
+result cache, and computed on the worker processes when --jobs is used.
+"""
+
+import ast
+import hashlib
+from typing import Any, Dict, List, Optional, Union
+
+from savecode.constants.defaults import DEFAULT_OUTLINE_HEAD
+from savecode.utils.cache import memoize
+
+# Bump when the skeleton layout changes, so cached outlines are recomputed.
+OUTLINE_VERSION = 2
+
+# Constant values longer than this are shortened.
+MAX_CONSTANT_CHARS = 100
+
+_Def = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+
+
+def _first_doc_line(node: Any) -> Optional[str]:
+    doc = ast.get_docstring(node, clean=True)
+    if not doc:
+        return None
+    return doc.strip().splitlines()[0]
+
+
+def _doc_literal(doc: str) -> str:
+    """Quote a docstring line so the outline stays valid Python."""
+    if '"' in doc or "\\" in doc or not doc.isprintable():
+        return repr(doc)
+    return f'"""{doc}"""'
+
+
+def _lines(node: ast.stmt) -> str:
+    """The original line range of *node*, e.g. 'L12-40' (or 'L5' for one line)."""
+    end = node.end_lineno or node.lineno
+    return f"L{node.lineno}" if end == node.lineno else f"L{node.lineno}-{end}"
+
+
+def _is_constant_target(target: ast.expr) -> bool:
+    return isinstance(target, ast.Name) and target.id.isupper()
+
+
+def _constant(node: ast.stmt, indent: str) -> Optional[str]:
+    """Render an UPPER_CASE assignment, or None for any other statement."""
+    if isinstance(node, ast.Assign):
+        if not all(_is_constant_target(t) for t in node.targets):
+            return None
+    elif isinstance(node, ast.AnnAssign):
+        if not _is_constant_target(node.target):
+            return None
+    else:
+        return None
+    text = ast.unparse(node)
+    if len(text) > MAX_CONSTANT_CHARS:
+        text = text[: MAX_CONSTANT_CHARS - 3] + "..."
+    return f"{indent}{text}  # {_lines(node)}"
+
+
+def _signature(node: _Def) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(b) for b in [*node.bases, *node.keywords]]
+        return (
+            f"class {node.name}({', '.join(bases)}):"
+            if bases
+            else f"class {node.name}:"
+        )
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}:"
+
+
+def _outline_body(body: List[ast.stmt], indent: str, lines: List[str]) -> None:
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            _outline_def(node, indent, lines)
+        else:
+            constant = _constant(node, indent)
+            if constant is not None:
+                lines.append(constant)
+
+
+def _outline_def(node: _Def, indent: str, lines: List[str]) -> None:
+    for decorator in node.decorator_list:
+        lines.append(f"{indent}@{ast.unparse(decorator)}")
+    signature = len(lines)
+    lines.append(indent + _signature(node))
+    inner = indent + "    "
+    doc = _first_doc_line(node)
+    if doc is not None:
+        lines.append(inner + _doc_literal(doc))
+    if isinstance(node, ast.ClassDef):
+        before = len(lines)
+        _outline_body(node.body, inner, lines)
+        if len(lines) > before:
+            lines[signature] += f"  # {_lines(node)}"
+            return
+    lines.append(f"{inner}...  # {_lines(node)}")
+
+
+def outline_source(source: str, filename: str = "<unknown>") -> Optional[str]:
+    """Return the skeleton of Python *source*, or None if it does not parse.
+
+    Args:
+        source (str): Module source.
+        filename (str, optional): Used in syntax error messages only.
+
+    Returns:
+        Optional[str]: The outline, ending with a newline (empty for a module with
+        nothing to show).
+    """
+    try:
+        tree = ast.parse(source, filename)
+    except (SyntaxError, ValueError):
+        return None
+    lines: List[str] = []
+    doc = _first_doc_line(tree)
+    if doc is not None:
+        lines.append(_doc_literal(doc))
+    _outline_body(tree.body, "", lines)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def head(text: str, max_bytes: int) -> str:
+    """Return *text* cut to about *max_bytes* UTF-8 bytes on a line boundary."""
+    # Cheap exit: no character takes more than four bytes.
+    if max_bytes <= 0 or len(text) * 4 <= max_bytes:
+        return text
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    cut = data[:max_bytes].decode("utf-8", errors="ignore")
+    if "\n" in cut:
+        cut = cut[: cut.rindex("\n") + 1]
+    remaining = len(data) - len(cut.encode("utf-8"))
+    return f"{cut}... ({remaining} more bytes)\n"
+
+
+def outline_text(
+    rel_path: str,
+    text: str,
+    head_bytes: int = DEFAULT_OUTLINE_HEAD,
+    context: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Return what --outline puts in a bundle section for one file.
+
+    Args:
+        rel_path (str): The file's path as shown in the bundle.
+        text (str): Its full, decoded content.
+        head_bytes (int, optional): Size cap for non-Python files (0 = no cap).
+        context (Dict[str, Any], optional): Shared context; with a result cache in
+            it, Python outlines are memoized by content hash.
+
+    Returns:
+        str: The skeleton for Python files, otherwise the (capped) content.
+    """
+    if not rel_path.lower().endswith((".py", ".pyi")):
+        return head(text, head_bytes)
+
+    def compute() -> Optional[str]:
+        return outline_source(text, rel_path)
+
+    if context is not None and context.get("cache") is not None:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        outline: Optional[str] = memoize(
+            context, "outline", (OUTLINE_VERSION, digest), compute
+        )
+    else:
+        outline = compute()
+    return head(text, head_bytes) if outline is None else outline
+
+
+# End of savecode/utils/outline.py
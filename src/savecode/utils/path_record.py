@@ -0,0 +1,99 @@
+"""
+savecode/utils/path_record.py - Interned per-file path records shared by plugins.
+
+Every gathered file used to be normalised, made relative (with an os.getcwd() call
+each time) and stat'ed separately by each plugin that touched it. A PathTable, kept
+in context['path_table'], creates one PathRecord per absolute path and caches those
+derived fields on it, so later plugins read them instead of recomputing them.
+
+context['all_files'] stays a list of path strings; plugins look the records up with
+path_table(context).get(path).
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+
+class PathRecord:
+    """One file's absolute path plus lazily computed, cached derived fields."""
+
+    __slots__ = ("path", "suffix", "_table", "_rel", "_stat")
+
+    def __init__(self, path: str, table: "PathTable") -> None:
+        self.path = path
+        # Lower-cased extension without the dot ("py"), as --ext compares it.
+        self.suffix = os.path.splitext(path)[1].lstrip(".").lower()
+        self._table = table
+        self._rel: Optional[str] = None
+        self._stat: Optional[os.stat_result] = None
+
+    @property
+    def rel(self) -> str:
+        """The path relative to the table's base directory."""
+        if self._rel is None:
+            self._rel = os.path.relpath(self.path, self._table.base_dir)
+        return self._rel
+
+    def stat(self) -> os.stat_result:
+        """Return os.stat() of the file, calling it at most once.
+
+        Raises:
+            OSError: If the file cannot be stat'ed (failures are not cached).
+        """
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def __repr__(self) -> str:
+        return f"PathRecord({self.path!r})"
+
+
+class PathTable:
+    """Interns PathRecords by absolute path for one base directory."""
+
+    def __init__(self, base_dir: Optional[str] = None) -> None:
+        self.base_dir = os.path.abspath(base_dir or os.getcwd())
+        self._records: Dict[str, PathRecord] = {}
+        # Raw spelling -> normalised absolute path, so each spelling is resolved once.
+        self._normalized: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def normalize(self, path: str) -> str:
+        """Return normalize_path(path), cached per distinct input string."""
+        normalized = self._normalized.get(path)
+        if normalized is None:
+            normalized = os.path.normpath(os.path.abspath(path))
+            self._normalized[path] = normalized
+        return normalized
+
+    def get(self, path: str) -> PathRecord:
+        """Return the record for *path*, creating it on first use.
+
+        Args:
+            path (str): An absolute, normalised path (or archive member path).
+
+        Returns:
+            PathRecord: The shared record.
+        """
+        record = self._records.get(path)
+        if record is None:
+            record = self._records[path] = PathRecord(path, self)
+        return record
+
+
+def path_table(context: Dict[str, Any]) -> PathTable:
+    """Return the context's PathTable, creating it for context['base_dir'].
+
+    A table built for another base directory is replaced, so relative paths always
+    follow the context's current 'base_dir'.
+    """
+    table: Optional[PathTable] = context.get("path_table")
+    base_dir = context.get("base_dir")
+    if table is None or (base_dir and table.base_dir != os.path.abspath(base_dir)):
+        table = context["path_table"] = PathTable(base_dir)
+    return table
+
+
+# End of savecode/utils/path_record.py
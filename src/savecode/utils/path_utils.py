@@ -4,6 +4,7 @@ Provides functions to normalize file paths and get relative paths.
 """
 
 import os
+from typing import Optional
 
 
 def normalize_path(path: str) -> str:
@@ -16,11 +17,12 @@ def normalize_path(path: str) -> str:
     return os.path.normpath(os.path.abspath(path))
 
 
-def relative_path(path: str) -> str:
+def relative_path(path: str, start: Optional[str] = None) -> str:
     """
     Returns the relative path of the given absolute path relative to the current working directory.
 
     :param path: The absolute file path.
-    :return: The file path relative to the current working directory.
+    :param start: Directory to be relative to instead of the current working directory.
+    :return: The file path relative to the current working directory (or *start*).
     """
-    return os.path.relpath(path, os.getcwd())
+    return os.path.relpath(path, start or os.getcwd())
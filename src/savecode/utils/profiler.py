@@ -0,0 +1,204 @@
+"""
+savecode/utils/profiler.py - Lightweight span profiler for plugin runs.
+
+Records wall time, per-thread CPU time and (for plugin spans that did not overlap
+another plugin) the tracemalloc peak.
+Spans can be rendered as a table or exported in the Chrome trace event format
+(load the JSON in chrome://tracing or https://ui.perfetto.dev).
+
+Profiling is opt-in: code paths call span(context, ...) which returns a shared no-op
+context manager when no profiler is present in the context. tracemalloc and json are
+imported only once a Profiler is actually used.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+
+class _NullSpan:
+    """No-op stand-in for a span; counters written to it are discarded."""
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """Collects timing spans from any thread."""
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._started_tracemalloc = False
+        # Overlap markers of the plugin spans currently measuring memory.
+        self._measuring: List[Dict[str, bool]] = []
+
+    def start(self) -> None:
+        """Start memory tracing if requested and not already active."""
+        import tracemalloc
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        """Stop memory tracing if this profiler started it."""
+        import tracemalloc
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def span(
+        self, name: str, category: str = "span", **args: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block.
+
+        Yields a dict the caller may fill with counters (files, bytes, ...), which are
+        attached to the recorded span.
+
+        Args:
+            name (str): Span name.
+            category (str, optional): Span category; "plugin" spans also record the
+                tracemalloc peak, or peak_kib=None if another plugin span ran at the
+                same time (the peak is process-wide). Defaults to "span".
+            **args: Initial span arguments.
+        """
+        import tracemalloc
+
+        measure_memory = category == "plugin" and tracemalloc.is_tracing()
+        # tracemalloc's peak is process-wide, so a plugin span gets a peak only if no
+        # other plugin span overlapped it; overlapping spans are marked instead.
+        token = {"overlapped": False}
+        if measure_memory:
+            with self._lock:
+                if self._measuring:
+                    token["overlapped"] = True
+                    for other in self._measuring:
+                        other["overlapped"] = True
+                self._measuring.append(token)
+            if not token["overlapped"]:
+                base, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+        start_ns = time.perf_counter_ns()
+        cpu_start_ns = time.thread_time_ns()
+        try:
+            yield args
+        finally:
+            wall_ns = time.perf_counter_ns() - start_ns
+            cpu_ns = time.thread_time_ns() - cpu_start_ns
+            event: Dict[str, Any] = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_ns - self._origin_ns) / 1000,
+                "dur": wall_ns / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": dict(args, cpu_ms=round(cpu_ns / 1e6, 3)),
+            }
+            if measure_memory:
+                with self._lock:
+                    self._measuring.remove(token)
+                if token["overlapped"]:
+                    event["args"]["peak_kib"] = None
+                else:
+                    _, peak = tracemalloc.get_traced_memory()
+                    event["args"]["peak_kib"] = round(max(peak - base, 0) / 1024, 1)
+            with self._lock:
+                self.events.append(event)
+
+    def instant(self, name: str, category: str = "span", **args: Any) -> None:
+        """Record a zero-duration marker (e.g. a skipped plugin)."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": (time.perf_counter_ns() - self._origin_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def write_trace(self, path: str) -> None:
+        """Write all events to *path* in Chrome trace event format.
+
+        Args:
+            path (str): Destination JSON file.
+        """
+        import json
+
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["ts"])
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+
+    def print_table(self, stream: TextIO) -> None:
+        """Print a table of completed spans, in start order, to *stream*.
+
+        Args:
+            stream (TextIO): Destination stream (usually sys.stderr).
+        """
+        with self._lock:
+            spans = sorted(
+                (e for e in self.events if e["ph"] == "X"), key=lambda e: e["ts"]
+            )
+        lines = [
+            f"{'span':<28} {'wall ms':>10} {'cpu ms':>10} {'peak KiB':>10}  details"
+        ]
+        for event in spans:
+            args = dict(event["args"])
+            cpu = args.pop("cpu_ms", 0.0)
+            overlapped = "peak_kib" in args and args["peak_kib"] is None
+            peak = args.pop("peak_kib", None)
+            if overlapped:
+                peak = "overlap"
+            indent = "" if event["cat"] in ("plugin", "run") else "  "
+            details = " ".join(f"{k}={v}" for k, v in args.items())
+            lines.append(
+                f"{(indent + event['name'])[:28]:<28} {event['dur'] / 1000:>10.2f} "
+                f"{cpu:>10.2f} {'' if peak is None else peak:>10}  {details}"
+            )
+        lines.append(
+            "peak KiB: tracemalloc peak of a plugin that ran alone; 'overlap' when "
+            "plugins ran concurrently (the peak is process-wide)"
+        )
+        stream.write("\n".join(lines) + "\n")
+
+
+def span(
+    context: Dict[str, Any], name: str, category: str = "span", **args: Any
+) -> Any:
+    """Return a timing span for *name* if profiling is enabled for *context*.
+
+    Args:
+        context (Dict[str, Any]): Shared context; profiling is enabled when it holds a
+            'profiler' entry.
+        name (str): Span name.
+        category (str, optional): Span category. Defaults to "span".
+        **args: Initial span arguments.
+
+    Returns:
+        A context manager yielding a dict for counters.
+    """
+    profiler: Optional[Profiler] = context.get("profiler")
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, category, **args)
+
+
+# End of savecode/utils/profiler.py
@@ -0,0 +1,137 @@
+"""
+savecode/utils/recency.py - mtime filters for --changed-within and --newer-than.
+
+Both options reduce to one cutoff in nanoseconds since the epoch, stored in
+context['newer_than_ns']; gathered files (from a directory walk or from --git) whose
+mtime is older are dropped. The stat results come from the shared path records, so
+SavePlugin reuses them instead of stat'ing the files again.
+
+Directory mtimes are not used to prune subtrees: a directory's mtime only changes
+when entries directly inside it are added, removed or renamed, never when a file is
+edited in place or something changes further down, so an old directory may still
+contain new files.
+"""
+
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from savecode.utils.archive import split_member_path
+from savecode.utils.path_record import path_table
+
+logger = logging.getLogger("savecode.utils.recency")
+
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([smhdw]?)")
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as "90", "45s", "30m", "2h", "1d" or "1h30m".
+
+    Args:
+        value (str): The duration; a bare number is taken as seconds.
+
+    Returns:
+        float: The duration in seconds.
+
+    Raises:
+        ValueError: If the value is not a positive duration.
+    """
+    text = value.strip().lower()
+    pos = 0
+    seconds = 0.0
+    while pos < len(text):
+        match = _DURATION_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"invalid duration {value!r}")
+        seconds += float(match.group(1)) * _UNITS[match.group(2)]
+        pos = match.end()
+    if seconds <= 0:
+        raise ValueError(f"invalid duration {value!r}")
+    return seconds
+
+
+def parse_reference_time(value: str) -> int:
+    """Return the cutoff for --newer-than: a file's mtime or an ISO 8601 time.
+
+    Args:
+        value (str): An existing path (e.g. the previous bundle), or a date/time
+            such as "2024-05-01" or "2024-05-01T09:30" (local time unless an
+            offset is given).
+
+    Returns:
+        int: The cutoff in nanoseconds since the epoch.
+
+    Raises:
+        ValueError: If *value* is neither an existing path nor a date/time.
+    """
+    try:
+        return os.stat(value).st_mtime_ns
+    except OSError:
+        pass
+    from datetime import datetime
+
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"{value!r} is neither an existing file nor an ISO date/time"
+        ) from None
+    return int(moment.timestamp() * 1_000_000_000)
+
+
+def recency_cutoff(
+    changed_within: Optional[float],
+    newer_than_ns: Optional[int],
+    now_ns: Optional[int] = None,
+) -> Optional[int]:
+    """Combine --changed-within (seconds) and --newer-than into one cutoff.
+
+    When both are given the later (stricter) cutoff applies.
+
+    Returns:
+        Optional[int]: Nanoseconds since the epoch, or None for no filtering.
+    """
+    cutoffs = []
+    if changed_within is not None:
+        now = time.time_ns() if now_ns is None else now_ns
+        cutoffs.append(now - int(changed_within * 1_000_000_000))
+    if newer_than_ns is not None:
+        cutoffs.append(newer_than_ns)
+    return max(cutoffs) if cutoffs else None
+
+
+def filter_recent(files: List[str], context: Dict[str, Any]) -> List[str]:
+    """Keep the files modified after context['newer_than_ns'], if set.
+
+    Archive members take the archive's own mtime. Files that cannot be stat'ed are
+    kept, so SavePlugin reports them as usual.
+
+    Args:
+        files (List[str]): Gathered paths.
+        context (Dict[str, Any]): Shared context holding the cutoff and path table.
+
+    Returns:
+        List[str]: The recent files, in their original order.
+    """
+    cutoff: Optional[int] = context.get("newer_than_ns")
+    if cutoff is None:
+        return files
+    paths = path_table(context)
+    recent = []
+    for file in files:
+        member = split_member_path(file)
+        record = paths.get(member[0] if member is not None else file)
+        try:
+            if record.stat().st_mtime_ns <= cutoff:
+                continue
+        except OSError:
+            pass
+        recent.append(file)
+    logger.info("Recency filter kept %d of %d files.", len(recent), len(files))
+    return recent
+
+
+# End of savecode/utils/recency.py
@@ -0,0 +1,183 @@
+"""
+savecode/utils/split.py - Partition one run's files into several bundles (--split-by).
+
+Instead of running savecode once per package (restarting the interpreter and walking
+the tree each time), one run can split context['all_files'] by a key and write one
+bundle per partition:
+
+  - dir: the file's directory, relative to the base directory.
+  - ext: the file's extension.
+  - top-level-package: the outermost directory of the file's Python package (the
+    highest ancestor still holding an __init__.py); files outside any package use
+    their first path component.
+  - module:function: a custom key; the function takes a file's relative path and
+    returns its partition name.
+
+Each partition is written next to --output as OUTPUT-STEM.KEY.EXT (e.g.
+temp.src-savecode.txt), with its own banner and footer. --output itself becomes an
+index listing every partition.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from savecode.utils.path_record import PathTable
+
+SPLIT_MODES = ("dir", "ext", "top-level-package")
+
+# Partition name used for files directly in the base directory / without extension.
+ROOT_KEY = "root"
+NO_EXTENSION_KEY = "no-ext"
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_CUSTOM_RE = re.compile(r"^[A-Za-z_][\w.]*:[A-Za-z_][\w.]*$")
+
+KeyFunction = Callable[[str], str]
+
+
+def parse_split_by(value: str) -> str:
+    """Validate a --split-by value without importing anything.
+
+    Args:
+        value (str): One of SPLIT_MODES, or "module:function".
+
+    Returns:
+        str: The value (modes lower-cased).
+
+    Raises:
+        ValueError: If the value is neither a mode nor a module:function reference.
+    """
+    if value.lower() in SPLIT_MODES:
+        return value.lower()
+    if _CUSTOM_RE.match(value):
+        return value
+    raise ValueError(f"unknown split key {value!r}")
+
+
+def _first_component(rel_path: str) -> str:
+    parts = rel_path.split(os.sep, 1)
+    return parts[0] if len(parts) > 1 else ROOT_KEY
+
+
+def _package_key(paths: PathTable) -> KeyFunction:
+    """Key function for top-level-package; __init__.py checks are cached per dir."""
+    is_package: Dict[str, bool] = {}
+
+    def has_init(directory: str) -> bool:
+        if directory not in is_package:
+            is_package[directory] = os.path.isfile(
+                os.path.join(paths.base_dir, directory, "__init__.py")
+            )
+        return is_package[directory]
+
+    def key(rel_path: str) -> str:
+        directory = os.path.dirname(rel_path)
+        top = None
+        while directory and not directory.startswith(os.pardir) and has_init(directory):
+            top = directory
+            directory = os.path.dirname(directory)
+        return top if top is not None else _first_component(rel_path)
+
+    return key
+
+
+def key_function(split_by: str, paths: PathTable) -> KeyFunction:
+    """Return the function mapping a relative path to its partition name.
+
+    Args:
+        split_by (str): A value accepted by parse_split_by().
+        paths (PathTable): The run's path table (for the base directory).
+
+    Returns:
+        KeyFunction: rel_path -> partition name.
+
+    Raises:
+        ValueError: If a custom module:function cannot be imported or called.
+    """
+    if split_by == "dir":
+        return lambda rel_path: os.path.dirname(rel_path) or ROOT_KEY
+    if split_by == "ext":
+        return lambda rel_path: (
+            os.path.splitext(rel_path)[1].lstrip(".").lower() or NO_EXTENSION_KEY
+        )
+    if split_by == "top-level-package":
+        return _package_key(paths)
+
+    import importlib
+
+    module_name, _, attr = split_by.partition(":")
+    try:
+        function: Any = importlib.import_module(module_name)
+        for part in attr.split("."):
+            function = getattr(function, part)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"cannot load split key {split_by!r}: {e}") from e
+    if not callable(function):
+        raise ValueError(f"split key {split_by!r} is not callable")
+
+    def custom(rel_path: str) -> str:
+        return str(function(rel_path)) or ROOT_KEY
+
+    return custom
+
+
+def partition(
+    files: List[str], paths: PathTable, key: KeyFunction
+) -> Dict[str, List[str]]:
+    """Group *files* by *key* of their relative paths.
+
+    Partitions appear in order of their first file and keep the files' order, so
+    each bundle lists its files as an unsplit run would.
+    """
+    groups: Dict[str, List[str]] = {}
+    for file in files:
+        groups.setdefault(key(paths.get(file).rel), []).append(file)
+    return groups
+
+
+def partition_outputs(output: str, keys: List[str]) -> Dict[str, str]:
+    """Return a distinct bundle path next to *output* for every partition key."""
+    stem, suffix = os.path.splitext(output)
+    outputs: Dict[str, str] = {}
+    taken = {os.path.normcase(output)}
+    for key in keys:
+        name = _UNSAFE_RE.sub("-", key.replace(os.sep, "-")).strip("-.") or ROOT_KEY
+        candidate = f"{stem}.{name}{suffix}"
+        n = 2
+        while os.path.normcase(candidate) in taken:
+            candidate = f"{stem}.{name}-{n}{suffix}"
+            n += 1
+        taken.add(os.path.normcase(candidate))
+        outputs[key] = candidate
+    return outputs
+
+
+def format_index(
+    split_by: str, entries: List[Tuple[str, str, int]], output: str
+) -> str:
+    """Return the index written to --output for a split run.
+
+    Args:
+        split_by (str): The --split-by value.
+        entries (List[Tuple[str, str, int]]): (key, bundle path, file count) for
+            every partition, in bundle order.
+        output (str): The index path; bundle paths are shown relative to it.
+
+    Returns:
+        str: The index text.
+    """
+    base = os.path.dirname(output)
+    width = max((len(key) for key, _, _ in entries), default=0)
+    lines = [f"Bundles ({len(entries)}), split by {split_by}:"]
+    lines.extend(
+        f"- {key:<{width}}  {count:>6} files  {os.path.relpath(path, base)}"
+        for key, path, count in entries
+    )
+    total = sum(count for _, _, count in entries)
+    lines.append("")
+    lines.append(f"Saved code from {total} files to {len(entries)} bundles")
+    return "\n".join(lines) + "\n"
+
+
+# End of savecode/utils/split.py
@@ -0,0 +1,238 @@
+"""
+savecode/utils/stats.py - Per-file statistics computed while a bundle is read.
+
+analyze() walks a file's text once, counting lines, blank lines and comment lines
+(lines whose first non-blank characters start a comment for the file's language,
+plus the rest of a /* ... */ or <!-- ... --> block opened that way). Estimated
+tokens use the common rule of thumb of about four characters per token. Totals are
+aggregated per extension and per directory, rendered as a text block for the bundle
+banner and the CLI summary, or written as JSON (--stats-json).
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Characters per estimated token.
+CHARS_PER_TOKEN = 4
+
+_HASH = ("#",)
+_SLASH = ("//", "/*")
+_DASH = ("--",)
+_MARKUP = ("<!--",)
+
+# Block comment opener -> closer; lines up to the closer are comments too.
+_BLOCKS = {"/*": "*/", "<!--": "-->"}
+
+# Extension -> (language, line comment prefixes).
+LANGUAGES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "py": ("Python", _HASH),
+    "pyi": ("Python", _HASH),
+    "js": ("JavaScript", _SLASH),
+    "jsx": ("JavaScript", _SLASH),
+    "mjs": ("JavaScript", _SLASH),
+    "ts": ("TypeScript", _SLASH),
+    "tsx": ("TypeScript", _SLASH),
+    "c": ("C", _SLASH),
+    "h": ("C", _SLASH),
+    "cpp": ("C++", _SLASH),
+    "hpp": ("C++", _SLASH),
+    "cs": ("C#", _SLASH),
+    "java": ("Java", _SLASH),
+    "kt": ("Kotlin", _SLASH),
+    "go": ("Go", _SLASH),
+    "rs": ("Rust", _SLASH),
+    "swift": ("Swift", _SLASH),
+    "css": ("CSS", ("/*",)),
+    "scss": ("SCSS", _SLASH),
+    "html": ("HTML", _MARKUP),
+    "xml": ("XML", _MARKUP),
+    "md": ("Markdown", ()),
+    "rst": ("reStructuredText", ("..",)),
+    "txt": ("Text", ()),
+    "json": ("JSON", ()),
+    "toml": ("TOML", _HASH),
+    "yaml": ("YAML", _HASH),
+    "yml": ("YAML", _HASH),
+    "ini": ("INI", ("#", ";")),
+    "cfg": ("INI", ("#", ";")),
+    "sh": ("Shell", _HASH),
+    "bash": ("Shell", _HASH),
+    "ps1": ("PowerShell", _HASH),
+    "rb": ("Ruby", _HASH),
+    "pl": ("Perl", _HASH),
+    "r": ("R", _HASH),
+    "sql": ("SQL", _DASH),
+    "lua": ("Lua", _DASH),
+    "hs": ("Haskell", _DASH),
+}
+
+# Extensionless files recognised by name.
+_NAMED: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "makefile": ("Makefile", _HASH),
+    "dockerfile": ("Dockerfile", _HASH),
+}
+
+_COUNTERS = ("files", "bytes", "lines", "blank", "comment", "tokens")
+
+
+class FileStats:
+    """Statistics for one bundled file."""
+
+    __slots__ = (
+        "path",
+        "extension",
+        "language",
+        "bytes",
+        "lines",
+        "blank",
+        "comment",
+        "tokens",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        extension: str,
+        language: str,
+        size: int,
+        lines: int,
+        blank: int,
+        comment: int,
+        tokens: int,
+    ) -> None:
+        self.path = path
+        self.extension = extension
+        self.language = language
+        self.bytes = size
+        self.lines = lines
+        self.blank = blank
+        self.comment = comment
+        self.tokens = tokens
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(self.path) or "."
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def language_of(path: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """Return (extension, language, comment prefixes) for *path*."""
+    name = os.path.basename(path)
+    ext = os.path.splitext(name)[1].lstrip(".").lower()
+    if ext in LANGUAGES:
+        return (ext, *LANGUAGES[ext])
+    if not ext and name.lower() in _NAMED:
+        return (ext, *_NAMED[name.lower()])
+    return ext, ext.upper() or "Text", ()
+
+
+def analyze(path: str, text: str, size: Optional[int] = None) -> FileStats:
+    """Compute statistics for one file's text in a single pass.
+
+    Args:
+        path (str): The file's path as shown in the bundle.
+        text (str): The decoded content.
+        size (int, optional): Size on disk in bytes. Defaults to the UTF-8 length.
+
+    Returns:
+        FileStats: The file's statistics.
+    """
+    ext, language, prefixes = language_of(path)
+    lines = blank = comment = 0
+    closer: Optional[str] = None
+    for line in text.splitlines():
+        lines += 1
+        stripped = line.lstrip()
+        if not stripped:
+            blank += 1
+        elif closer is not None:
+            comment += 1
+            if closer in stripped:
+                closer = None
+        elif prefixes and stripped.startswith(prefixes):
+            comment += 1
+            for opener, end in _BLOCKS.items():
+                if stripped.startswith(opener) and end not in stripped[len(opener) :]:
+                    closer = end
+    if size is None:
+        size = len(text.encode("utf-8"))
+    tokens = -(-len(text) // CHARS_PER_TOKEN)
+    return FileStats(path, ext, language, size, lines, blank, comment, tokens)
+
+
+def totals(file_stats: List[FileStats]) -> Dict[str, int]:
+    """Sum the counters of *file_stats*."""
+    sums = dict.fromkeys(_COUNTERS, 0)
+    for fs in file_stats:
+        sums["files"] += 1
+        for name in _COUNTERS[1:]:
+            sums[name] += getattr(fs, name)
+    return sums
+
+
+def group_totals(file_stats: List[FileStats], key: str) -> Dict[str, Dict[str, int]]:
+    """Sum counters per value of attribute *key* ('extension', 'directory', ...).
+
+    Args:
+        file_stats (List[FileStats]): Per-file statistics.
+        key (str): FileStats attribute to group by.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Totals per group, in sorted group order.
+    """
+    groups: Dict[str, List[FileStats]] = {}
+    for fs in file_stats:
+        groups.setdefault(getattr(fs, key) or "(none)", []).append(fs)
+    return {name: totals(groups[name]) for name in sorted(groups)}
+
+
+def stats_document(file_stats: List[FileStats]) -> Dict[str, Any]:
+    """Return the --stats-json document for *file_stats*."""
+    return {
+        "totals": totals(file_stats),
+        "by_extension": group_totals(file_stats, "extension"),
+        "by_directory": group_totals(file_stats, "directory"),
+        "files": [fs.as_dict() for fs in file_stats],
+    }
+
+
+def write_stats_json(path: str, file_stats: List[FileStats]) -> None:
+    """Write stats_document(file_stats) to *path*."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats_document(file_stats), f, indent=2)
+
+
+def _ratio(part: int, whole: int) -> str:
+    return f"{part / whole:.0%}" if whole else "0%"
+
+
+def format_stats(file_stats: List[FileStats]) -> List[str]:
+    """Render a totals line plus one line per extension, without colors.
+
+    Args:
+        file_stats (List[FileStats]): Per-file statistics.
+
+    Returns:
+        List[str]: Lines of text (no trailing newlines).
+    """
+    total = totals(file_stats)
+    lines = [
+        f"Stats: {total['files']} files, {total['lines']:,} lines "
+        f"({_ratio(total['blank'], total['lines'])} blank, "
+        f"{_ratio(total['comment'], total['lines'])} comment), "
+        f"~{total['tokens']:,} tokens"
+    ]
+    groups = group_totals(file_stats, "extension")
+    width = max((len(name) for name in groups), default=0)
+    for name, group in groups.items():
+        lines.append(
+            f"  {name:<{width}}  {group['files']:>6} files  "
+            f"{group['lines']:>9,} lines  ~{group['tokens']:,} tokens"
+        )
+    return lines
+
+
+# End of savecode/utils/stats.py
@@ -0,0 +1,286 @@
+"""
+savecode/utils/transform_pool.py - Read and transform source files on a process pool.
+
+With --jobs N, SavePlugin hands the per-file CPU work (reading, binary sniffing,
+decoding with replacement, newline normalisation, --outline skeletons, section
+formatting and --stats analysis) to N worker processes instead of the single
+GIL-bound main thread.
+
+Files are sent in batches of paths. Each worker writes its batch's sections, UTF-8
+encoded and back to back, into a spool file and returns only small per-file records
+(size, section length, stats, error); large strings are never pickled. The parent
+consumes batches strictly in submission order, so sections come out in the order of
+context['all_files'], and keeps at most 2*N batches in flight to bound memory.
+
+Workers are started with the "spawn" method (fork is unsafe next to the plugin
+manager's threads) and import only this module and its light dependencies.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from savecode.utils.archive import ArchiveReader, split_member_path
+from savecode.utils.binary import (
+    SNIFF_BYTES,
+    binary_stub,
+    looks_binary,
+    read_unless_binary,
+)
+from savecode.utils.error_handler import log_and_record_error
+from savecode.utils.notebook import (
+    NOTEBOOK_MAX_BYTES,
+    is_notebook,
+    notebook_from_bytes,
+    read_notebook,
+)
+from savecode.utils.path_record import path_table
+from savecode.utils.stats import FileStats, analyze
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger("savecode.utils.transform_pool")
+
+# Runs with fewer files than this stay in-process; pool start-up would dominate.
+PARALLEL_MIN_FILES = 64
+
+# (level, category, message) for a file a worker skipped.
+Problem = Tuple[str, str, str]
+# (size, encoded section length, stats, problem) for one file of a batch.
+Record = Tuple[int, int, Optional[FileStats], Optional[Problem]]
+
+
+def decode_source(data: bytes) -> str:
+    """Decode file bytes the way open(..., encoding="utf-8", errors="replace") does."""
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _binary(
+    path: str, size: int, stub_binaries: bool
+) -> Tuple[Optional[str], int, Optional[Problem]]:
+    if stub_binaries:
+        return binary_stub(size), size, None
+    return None, size, ("info", "binary", f"Skipped binary file {path}")
+
+
+def _read_source(
+    path: str,
+    max_bytes: int,
+    archives: ArchiveReader,
+    stub_binaries: bool = False,
+    notebook_outputs: bool = False,
+) -> Tuple[Optional[str], int, Optional[Problem]]:
+    """Return (text, size, problem) for a file on disk or an archive member."""
+    notebook = is_notebook(path)
+    member = split_member_path(path)
+    oversized = ("warning", "oversized", f"Skipped {path} (>{max_bytes >> 20} MB)")
+    try:
+        if member is not None:
+            read_member, size, binary = archives.read_limited(
+                *member,
+                max(max_bytes, NOTEBOOK_MAX_BYTES) if notebook else max_bytes,
+                None if notebook else looks_binary,
+            )
+            if binary:
+                return _binary(path, size, stub_binaries)
+            if read_member is None:
+                return None, size, oversized
+            data = read_member
+        else:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return (
+                    None,
+                    0,
+                    ("warning", "missing", f"{path} does not exist – skipped"),
+                )
+            if notebook and st.st_size <= NOTEBOOK_MAX_BYTES:
+                cells = read_notebook(path, notebook_outputs)
+                if cells is not None:
+                    return cells, st.st_size, None
+            if st.st_size > max_bytes:
+                return None, st.st_size, oversized
+            read = read_unless_binary(path, st)
+            if read is None:
+                return _binary(path, st.st_size, stub_binaries)
+            data = read
+    except Exception as e:
+        return None, 0, ("error", "read", f"Error reading {path}: {e}")
+    if member is not None and notebook and len(data) <= NOTEBOOK_MAX_BYTES:
+        cells = notebook_from_bytes(data, notebook_outputs)
+        if cells is not None:
+            return cells, len(data), None
+    if len(data) > max_bytes:
+        return None, len(data), oversized
+    if member is not None and notebook and looks_binary(data[:SNIFF_BYTES]):
+        return _binary(path, len(data), stub_binaries)
+    return decode_source(data), len(data), None
+
+
+def transform_batch(
+    paths: List[str],
+    rel_paths: List[str],
+    with_stats: bool,
+    max_bytes: int,
+    spool_dir: str,
+    stub_binaries: bool = False,
+    outline_head: Optional[int] = None,
+    notebook_outputs: bool = False,
+) -> Tuple[str, List[Record]]:
+    """Worker entry point: read, transform and spool one batch of files.
+
+    Args:
+        paths (List[str]): Files (or "archive!/member" paths) to read.
+        rel_paths (List[str]): Their paths as shown in the bundle.
+        with_stats (bool): Also compute FileStats for each file.
+        max_bytes (int): Files larger than this are skipped as oversized.
+        spool_dir (str): Directory for the batch's spool file.
+        stub_binaries (bool, optional): Keep binary files as a placeholder section
+            instead of skipping them.
+        outline_head (int, optional): Write outlines (--outline) instead of full
+            contents, capping non-Python files at this many bytes.
+        notebook_outputs (bool, optional): Include text outputs of notebook cells.
+
+    Returns:
+        Tuple[str, List[Record]]: The spool file path and one record per file.
+    """
+    fd, spool = tempfile.mkstemp(prefix="batch-", suffix=".part", dir=spool_dir)
+    records: List[Record] = []
+    with os.fdopen(fd, "wb") as out, ArchiveReader() as archives:
+        for path, rel_path in zip(paths, rel_paths):
+            text, size, problem = _read_source(
+                path, max_bytes, archives, stub_binaries, notebook_outputs
+            )
+            if text is None:
+                records.append((size, 0, None, problem))
+                continue
+            file_stats = analyze(rel_path, text, size) if with_stats else None
+            if outline_head is not None:
+                from savecode.utils.outline import outline_text
+
+                text = outline_text(rel_path, text, outline_head)
+            section = f"File: {rel_path}\n\n{text}\n\n".encode("utf-8")
+            out.write(section)
+            records.append((size, len(section), file_stats, None))
+    return spool, records
+
+
+def process_pool(jobs: int) -> "ProcessPoolExecutor":
+    """Return a pool of *jobs* spawn-started workers for iter_sections_parallel()."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _batch_size(file_count: int, jobs: int) -> int:
+    """About four batches per worker, within sensible bounds."""
+    return max(16, min(512, file_count // (jobs * 4) or 1))
+
+
+def iter_sections_parallel(
+    files: List[str],
+    context: Dict[str, Any],
+    jobs: int,
+    max_bytes: int,
+    stats: Optional[Dict[str, Any]] = None,
+    saved: Optional[List[Tuple[str, int]]] = None,
+    file_stats: Optional[List[FileStats]] = None,
+    pool: Optional["ProcessPoolExecutor"] = None,
+) -> Iterator[Tuple[str, str, str]]:
+    """Yield the same (path, relative path, section) tuples as iter_sections().
+
+    Args:
+        files (List[str]): Source file paths, in bundle order.
+        context (Dict[str, Any]): Shared context for 'base_dir' and error aggregation.
+        jobs (int): Number of worker processes.
+        max_bytes (int): Size limit per file.
+        stats (Dict[str, Any], optional): Counters filled with files/bytes read.
+        saved (List[Tuple[str, int]], optional): Receives (relative path, size).
+        file_stats (List[FileStats], optional): Receives per-file statistics.
+        pool (ProcessPoolExecutor, optional): A pool shared with other callers (see
+            process_pool()); it is left running. By default a pool of *jobs*
+            workers is started for this call and shut down afterwards.
+
+    Yields:
+        Tuple[str, str, str]: (path, relative path, section text), in *files* order.
+    """
+    from concurrent.futures import Future
+
+    paths = path_table(context)
+    stub_binaries = context.get("cli_opts", {}).get("binary") == "stub"
+    outline_head = context.get("cli_opts", {}).get("outline")
+    notebook_outputs = bool(context.get("cli_opts", {}).get("notebook_outputs"))
+    size = _batch_size(len(files), jobs)
+    batches = [files[i : i + size] for i in range(0, len(files), size)]
+    spool_dir = tempfile.mkdtemp(prefix="savecode-jobs-")
+    own_pool = pool is None
+    if pool is None:
+        pool = process_pool(jobs)
+    pending: Deque[Tuple[List[str], List[str], "Future[Tuple[str, List[Record]]]"]]
+    pending = deque()
+    file_count = 0
+    bytes_read = 0
+    try:
+        next_batch = 0
+        while next_batch < len(batches) or pending:
+            while next_batch < len(batches) and len(pending) < 2 * jobs:
+                batch = batches[next_batch]
+                rel_paths = [paths.get(f).rel for f in batch]
+                future = pool.submit(
+                    transform_batch,
+                    batch,
+                    rel_paths,
+                    file_stats is not None,
+                    max_bytes,
+                    spool_dir,
+                    stub_binaries,
+                    outline_head,
+                    notebook_outputs,
+                )
+                pending.append((batch, rel_paths, future))
+                next_batch += 1
+
+            batch, rel_paths, future = pending.popleft()
+            spool, records = future.result()
+            with open(spool, "rb") as f:
+                data = f.read()
+            os.unlink(spool)
+
+            offset = 0
+            for path, rel_path, (file_size, length, fs, problem) in zip(
+                batch, rel_paths, records
+            ):
+                if problem is not None:
+                    level, category, message = problem
+                    log_and_record_error(
+                        message, context, logger, level, category, path=path
+                    )
+                    continue
+                section = data[offset : offset + length].decode("utf-8")
+                offset += length
+                file_count += 1
+                bytes_read += file_size
+                if saved is not None:
+                    saved.append((rel_path, file_size))
+                if file_stats is not None and fs is not None:
+                    file_stats.append(fs)
+                yield path, rel_path, section
+    finally:
+        if own_pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            for _, _, future in pending:
+                future.cancel()
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        if stats is not None:
+            stats.update(files=file_count, bytes=bytes_read, jobs=jobs)
+
+
+# End of savecode/utils/transform_pool.py
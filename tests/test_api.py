@@ -0,0 +1,152 @@
+"""
+tests/test_api.py - Tests for the embeddable bundle()/write_bundle() API.
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from savecode import BundleError, abundle, awrite_bundle, bundle, write_bundle
+
+
+class _GatedExecutor(ThreadPoolExecutor):
+    """Thread pool whose *gate_at*-th job blocks until the gate opens."""
+
+    def __init__(self, gate_at: int) -> None:
+        super().__init__(max_workers=2)
+        self.gate = threading.Event()
+        self.gate_at = gate_at
+        self.submitted = 0
+
+    def submit(
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Future[Any]:
+        self.submitted += 1
+        if self.submitted == self.gate_at:
+            inner = fn
+
+            def fn(*a: Any, **kw: Any) -> Any:
+                self.gate.wait(5)
+                return inner(*a, **kw)
+
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestBundleAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base = tmp.name
+        for rel, text in {
+            "pkg/a.py": "a = 1\n",
+            "pkg/b.toml": "b = 2\n",
+            "pkg/build/skipped.py": "x = 0\n",
+        }.items():
+            path = os.path.join(self.base, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+    def test_bundle_streams_sections_lazily(self) -> None:
+        chunks = bundle(["pkg"], base_dir=self.base)
+        path, data = next(iter(chunks))
+        self.assertEqual(path, os.path.join(self.base, "pkg", "a.py"))
+        self.assertEqual(
+            data, f"File: {os.path.join('pkg', 'a.py')}\n\na = 1\n\n\n".encode()
+        )
+
+        paths = [p for p, _ in bundle(["pkg"], ext=["py", "toml"], base_dir=self.base)]
+        self.assertEqual(sorted(os.path.basename(p) for p in paths), ["a.py", "b.toml"])
+
+    def test_write_bundle_matches_cli_layout(self) -> None:
+        out = io.BytesIO()
+        written = write_bundle(out, ["pkg"], base_dir=self.base)
+        text = out.getvalue().decode()
+        self.assertEqual(len(written), 1)
+        self.assertTrue(text.startswith("Files saved (1):\n- pkg"))
+        self.assertIn("a = 1", text)
+        self.assertTrue(text.endswith("Saved code from 1 files to <stream>\n"))
+
+    def test_errors_are_raised_or_collected(self) -> None:
+        with self.assertRaises(BundleError) as caught:
+            list(bundle(["pkg", "missing"], base_dir=self.base))
+        self.assertEqual(len(caught.exception.errors), 1)
+        self.assertIn("missing", caught.exception.errors[0])
+
+        errors: List[str] = []
+        chunks = list(bundle(["pkg", "missing"], base_dir=self.base, errors=errors))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(len(errors), 1)
+
+        with self.assertRaises(ValueError):
+            bundle(staged=True)
+
+    def test_concurrent_calls_are_independent(self) -> None:
+        def run(ext: str) -> List[str]:
+            return [
+                os.path.basename(p)
+                for p, _ in bundle(["pkg"], ext=[ext], base_dir=self.base)
+            ]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(run, ["py", "toml"] * 8))
+        self.assertEqual(results, [["a.py"], ["b.toml"]] * 8)
+
+    def test_abundle_matches_bundle(self) -> None:
+        async def collect() -> List[Any]:
+            return [
+                chunk
+                async for chunk in abundle(
+                    ["pkg"], ext=["py", "toml"], base_dir=self.base, batch_size=1
+                )
+            ]
+
+        expected = list(bundle(["pkg"], ext=["py", "toml"], base_dir=self.base))
+        self.assertEqual(asyncio.run(collect()), expected)
+
+    def test_awrite_bundle_replaces_output_only_when_complete(self) -> None:
+        output = os.path.join(self.base, "out.txt")
+        written = asyncio.run(
+            awrite_bundle(output, ["pkg"], ext=["py", "toml"], base_dir=self.base)
+        )
+        self.assertEqual(len(written), 2)
+        with open(output, encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith("Files saved (2):"))
+
+        # Cancel while the second batch is being read: nothing may be left behind.
+        # Jobs: create the partial file, open the spool, collect, read batch 1, read
+        # batch 2 (ahead of the consumer).
+        os.unlink(output)
+        executor = _GatedExecutor(gate_at=5)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(executor.gate.set)
+
+        async def cancel_midway() -> None:
+            task = asyncio.ensure_future(
+                awrite_bundle(
+                    output,
+                    ["pkg"],
+                    ext=["py", "toml"],
+                    base_dir=self.base,
+                    batch_size=1,
+                    executor=executor,
+                )
+            )
+            while executor.submitted < executor.gate_at:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_midway())
+        leftovers = [n for n in os.listdir(self.base) if n != "pkg"]
+        self.assertEqual(leftovers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
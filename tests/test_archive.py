@@ -0,0 +1,135 @@
+"""
+tests/test_archive.py - Unit tests for reading sources from zip/tar archives.
+"""
+
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from savecode.plugins.gather import GatherPlugin
+from savecode.plugins.save import SavePlugin
+from savecode.utils.archive import ArchiveReader, list_members, member_path
+from savecode.utils.binary import SNIFF_BYTES, looks_binary
+from savecode.utils.error_handler import ErrorCollector
+
+MEMBERS = {
+    "pkg/__init__.py": b"",
+    "pkg/mod.py": b"x = 1\r\ny = 2\n",
+    "pkg/node_modules/vendored.py": b"skip me\n",
+    "README.md": b"# readme\n",
+}
+
+
+class TestArchives(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.wheel = os.path.join(self.tmp, "pkg-1.0-py3-none-any.whl")
+        with zipfile.ZipFile(self.wheel, "w") as zf:
+            for name, data in MEMBERS.items():
+                zf.writestr(name, data)
+        self.sdist = os.path.join(self.tmp, "pkg-1.0.tar.gz")
+        src = os.path.join(self.tmp, "src")
+        with tarfile.open(self.sdist, "w:gz") as tf:
+            for name, data in MEMBERS.items():
+                path = os.path.join(src, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+                tf.add(path, arcname=name)
+
+    def _gather(self, archive: str) -> Dict[str, Any]:
+        context: Dict[str, Any] = {
+            "roots": [],
+            "files": [archive],
+            "skip": ["node_modules"],
+            "extensions": ["py"],
+            "errors": ErrorCollector(),
+        }
+        GatherPlugin().run(context)
+        return context
+
+    def test_gather_lists_matching_members(self) -> None:
+        for archive in (self.wheel, self.sdist):
+            with self.subTest(archive=archive):
+                context = self._gather(archive)
+                self.assertFalse(context["errors"])
+                self.assertEqual(
+                    context["all_files"],
+                    [
+                        member_path(archive, "pkg/__init__.py"),
+                        member_path(archive, "pkg/mod.py"),
+                    ],
+                )
+
+    def test_save_streams_member_contents(self) -> None:
+        output = os.path.join(self.tmp, "out.txt")
+        for archive in (self.wheel, self.sdist):
+            with self.subTest(archive=archive):
+                context = self._gather(archive)
+                context.update(output=output, base_dir=self.tmp)
+                with patch.dict(os.environ, SAVECODE_NOCOPY="1"):
+                    SavePlugin().run(context)
+                self.assertFalse(context["errors"])
+                with open(output, encoding="utf-8") as f:
+                    bundle = f.read()
+                name = os.path.basename(archive)
+                self.assertIn(f"File: {name}!/pkg/mod.py\n\nx = 1\ny = 2\n", bundle)
+
+    def test_tar_reader_restarts_for_earlier_members(self) -> None:
+        with ArchiveReader() as reader:
+            self.assertEqual(reader.read(self.sdist, "README.md"), b"# readme\n")
+            self.assertEqual(reader.read(self.sdist, "pkg/__init__.py"), b"")
+            with self.assertRaises(KeyError):
+                reader.read(self.sdist, "missing.py")
+        names: List[str] = [name for name, _ in list_members(self.sdist)]
+        self.assertEqual(names, list(MEMBERS))
+
+    def test_oversized_and_binary_members_are_not_inflated(self) -> None:
+        bomb = os.path.join(self.tmp, "bomb.zip")
+        with zipfile.ZipFile(bomb, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("big.py", b"a" * (1 << 20))
+            zf.writestr("blob.py", b"\x00" * (1 << 20))
+            zf.writestr("ok.py", b"x = 1\n")
+        reads: List[int] = []
+        real_read = zipfile.ZipExtFile.read
+
+        def counting_read(f: Any, n: int = -1) -> bytes:
+            data: bytes = real_read(f, n)
+            reads.append(len(data))
+            return data
+
+        with (
+            ArchiveReader() as reader,
+            patch.object(zipfile.ZipExtFile, "read", counting_read),
+        ):
+            self.assertEqual(
+                reader.read_limited(bomb, "big.py", 1000), (None, 1 << 20, False)
+            )
+            self.assertEqual(reads, [])
+            self.assertEqual(
+                reader.read_limited(bomb, "blob.py", 1 << 21, looks_binary),
+                (None, 1 << 20, True),
+            )
+            self.assertEqual(reads, [SNIFF_BYTES])
+            self.assertEqual(
+                reader.read_limited(bomb, "ok.py", 1000, looks_binary),
+                (b"x = 1\n", 6, False),
+            )
+
+    def test_corrupt_archive_is_reported(self) -> None:
+        bad = os.path.join(self.tmp, "bad.zip")
+        with open(bad, "wb") as f:
+            f.write(b"not a zip")
+        context = self._gather(bad)
+        self.assertTrue(context["errors"].has_errors())
+        self.assertEqual(context["all_files"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
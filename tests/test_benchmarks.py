@@ -0,0 +1,63 @@
+"""
+tests/test_benchmarks.py - Smoke tests for the benchmark suite.
+"""
+
+import contextlib
+import filecmp
+import io
+import os
+import tempfile
+import unittest
+
+from benchmarks.run import compare, main, run_suite
+from benchmarks.synthrepo import PRESETS, generate
+
+
+class TestSyntheticRepo(unittest.TestCase):
+    def test_same_seed_builds_identical_trees(self) -> None:
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            info = generate(a, seed=7, **PRESETS["tiny"])
+            self.assertEqual(generate(b, seed=7, **PRESETS["tiny"]), info)
+            diff = filecmp.dircmp(a, b)
+            self.assertEqual(diff.diff_files + diff.left_only + diff.right_only, [])
+            self.assertTrue(os.path.isdir(os.path.join(a, "dir_0_0", "node_modules")))
+            self.assertEqual(info["files"], 7 * PRESETS["tiny"]["files_per_dir"])
+
+
+class TestBenchmarkRun(unittest.TestCase):
+    def test_compare_flags_only_regressions_past_threshold(self) -> None:
+        base = {"save": {"seconds": 1.0, "peak_bytes": 1000}}
+        self.assertEqual(
+            compare({"save": {"seconds": 1.2, "peak_bytes": 1000}}, base, 0.25), []
+        )
+        regressions = compare(
+            {"save": {"seconds": 1.0, "peak_bytes": 2000}}, base, 0.25
+        )
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("save.peak_bytes"))
+
+    def test_suite_measures_every_case(self) -> None:
+        doc = run_suite("tiny", repeat=1, git=False)
+        self.assertEqual(list(doc["cases"]), ["gather", "save", "cli"])
+        for measurement in doc["cases"].values():
+            self.assertGreater(measurement["seconds"], 0)
+            self.assertGreater(measurement["peak_bytes"], 0)
+
+    def test_missing_baseline_skips_comparison(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            missing = os.path.join(tmpdir, "baseline-tiny.json")
+            stderr = io.StringIO()
+            with (
+                contextlib.redirect_stdout(io.StringIO()),
+                contextlib.redirect_stderr(stderr),
+            ):
+                status = main(
+                    ["--preset", "tiny", "--repeat", "1", "--no-git"]
+                    + ["--baseline", missing]
+                )
+            self.assertEqual(status, 0)
+            self.assertIn("skipping the comparison", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+tests/test_binary.py - Unit tests for binary file detection.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+
+from savecode.plugins.save import iter_sections
+from savecode.utils.archive import ArchiveReader
+from savecode.utils.binary import SNIFF_BYTES, cached_verdict, looks_binary
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.transform_pool import _read_source
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(1, 200))
+
+
+class TestLooksBinary(unittest.TestCase):
+    def test_verdicts(self) -> None:
+        self.assertTrue(looks_binary(PNG))
+        self.assertTrue(looks_binary(b"text\x00more"))
+        self.assertTrue(looks_binary(bytes(range(128, 256)) * 4))
+        self.assertFalse(looks_binary(b""))
+        self.assertFalse(looks_binary("café = 'naïve'\n".encode("latin-1")))
+        # A multi-byte character cut off at the sniff boundary is still text.
+        head = ("x" * (SNIFF_BYTES - 1) + "é").encode("utf-8")[:SNIFF_BYTES]
+        self.assertFalse(looks_binary(head))
+
+
+class TestSaveSkipsBinaries(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.text = os.path.join(self.root, "mod.py")
+        self.image = os.path.join(self.root, "logo.png")
+        with open(self.text, "w", encoding="utf-8") as f:
+            f.write("x = 1\n")
+        with open(self.image, "wb") as f:
+            f.write(PNG)
+
+    def _sections(self, **cli_opts: Any) -> List[str]:
+        self.context: Dict[str, Any] = {
+            "errors": ErrorCollector(),
+            "base_dir": self.root,
+            "cli_opts": cli_opts,
+        }
+        files = [self.text, self.image]
+        return [s for _, _, s in iter_sections(files, self.context)]
+
+    def test_binary_files_are_skipped_and_remembered(self) -> None:
+        self.assertEqual(self._sections(), ["File: mod.py\n\nx = 1\n\n\n"])
+        errors = self.context["errors"]
+        self.assertEqual(errors.total("info"), 1)
+        self.assertFalse(errors.has_errors())
+        self.assertIs(cached_verdict(os.stat(self.image)), True)
+        self.assertIs(cached_verdict(os.stat(self.text)), False)
+
+    def test_stub_mode_keeps_a_placeholder(self) -> None:
+        sections = self._sections(binary="stub")
+        self.assertEqual(len(sections), 2)
+        self.assertIn(f"(binary file, {len(PNG)} bytes", sections[1])
+        self.assertEqual(self.context["errors"].total(), 0)
+
+    def test_pool_worker_sniffs_too(self) -> None:
+        with ArchiveReader() as archives:
+            text, size, problem = _read_source(self.image, 1 << 20, archives)
+            self.assertIsNone(text)
+            self.assertEqual(
+                problem, ("info", "binary", f"Skipped binary file {self.image}")
+            )
+            text, _, problem = _read_source(self.image, 1 << 20, archives, True)
+            self.assertIsNotNone(text)
+            self.assertIsNone(problem)
+
+
+if __name__ == "__main__":
+    unittest.main()
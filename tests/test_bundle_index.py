@@ -0,0 +1,105 @@
+"""
+tests/test_bundle_index.py - Unit tests for `savecode extract` and `savecode unpack`.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+from savecode.bundle_index import (
+    BundleFormatError,
+    extract_command,
+    index_path,
+    load_index,
+    safe_destination,
+    scan_bundle,
+    unpack_command,
+)
+from savecode.plugins.save import SavePlugin
+from savecode.utils.error_handler import ErrorCollector
+
+SOURCES = {
+    "a.py": "x = 1\n",
+    "pkg/b.py": "doc = '''\n\nFile: a.py\n\nSaved code from 9 files to nowhere\n'''\n",
+    "pkg/empty.py": "",
+    "c.py": "trailing\n\n\n",
+}
+
+
+class TestBundleIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        src = os.path.join(self.tmp, "src")
+        files = []
+        for rel, text in SOURCES.items():
+            path = os.path.join(src, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            files.append(path)
+        self.bundle = os.path.join(self.tmp, "bundle.txt")
+        context: Dict[str, Any] = {
+            "all_files": files,
+            "base_dir": src,
+            "output": self.bundle,
+            "errors": ErrorCollector(),
+        }
+        with patch.dict(os.environ, SAVECODE_NOCOPY="1"):
+            SavePlugin().run(context)
+
+    def test_index_covers_exact_contents(self) -> None:
+        with open(self.bundle, "rb") as f:
+            entries = scan_bundle(f)
+            self.assertEqual([rel for rel, _, _ in entries], list(SOURCES))
+            for rel, start, end in entries:
+                f.seek(start)
+                self.assertEqual(f.read(end - start).decode(), SOURCES[rel])
+
+    def test_sidecar_is_reused_until_bundle_changes(self) -> None:
+        entries = load_index(self.bundle)
+        self.assertTrue(os.path.exists(index_path(self.bundle)))
+        with patch("savecode.bundle_index.scan_bundle") as scan:
+            self.assertEqual(load_index(self.bundle), entries)
+            scan.assert_not_called()
+        with open(self.bundle, "ab") as f:
+            f.write(b"\n")
+        with patch("savecode.bundle_index.scan_bundle", return_value=[]) as scan:
+            self.assertEqual(load_index(self.bundle), [])
+            scan.assert_called_once()
+
+    def test_extract_prints_one_file(self) -> None:
+        out = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", out):
+            status = extract_command([self.bundle, "pkg/b.py"])
+            out.flush()
+            printed = out.buffer.getvalue().decode()
+        self.assertEqual(status, 0)
+        self.assertEqual(printed, SOURCES["pkg/b.py"])
+        with patch("sys.stderr", io.StringIO()):
+            self.assertEqual(extract_command([self.bundle, "nope.py"]), 1)
+
+    def test_unpack_restores_tree(self) -> None:
+        dest = os.path.join(self.tmp, "out")
+        with patch("sys.stdout", io.StringIO()):
+            self.assertEqual(unpack_command([self.bundle, dest, "-j", "2"]), 0)
+        for rel, text in SOURCES.items():
+            with open(os.path.join(dest, rel), encoding="utf-8", newline="") as f:
+                self.assertEqual(f.read(), text)
+
+    def test_unsafe_paths_and_bad_bundles(self) -> None:
+        self.assertIsNone(safe_destination("out", "../etc/passwd"))
+        self.assertIsNone(safe_destination("out", "/etc/passwd"))
+        self.assertEqual(
+            safe_destination("out", "a/b.py"), os.path.join("out", "a", "b.py")
+        )
+        with self.assertRaises(BundleFormatError):
+            scan_bundle(io.BytesIO(b"not a bundle\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+tests/test_cache.py - Unit tests for the cross-run result cache.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+from savecode.plugins.gather import GatherPlugin
+from savecode.utils.cache import ResultCache, cache_key, memoize
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ResultCache(os.path.join(self.tmp.name, "c.sqlite3"))
+        self.addCleanup(self.cache.close)
+
+    def test_round_trip_json_and_bytes(self) -> None:
+        self.cache.put("ns", "a", {"files": ["x.py"]})
+        self.cache.put("ns", "b", b"\x00raw")
+        self.assertEqual(self.cache.get("ns", "a"), {"files": ["x.py"]})
+        self.assertEqual(self.cache.get("ns", "b"), b"\x00raw")
+        self.assertIsNone(self.cache.get("other", "a"))
+
+    def test_lru_eviction_respects_budget(self) -> None:
+        cache = ResultCache(os.path.join(self.tmp.name, "small.sqlite3"), 1000)
+        self.addCleanup(cache.close)
+        cache.put("ns", "old", b"x" * 400)
+        cache.put("ns", "mid", b"x" * 400)
+        cache.get("ns", "old")  # refresh: "mid" is now least recently used
+        cache.put("ns", "new", b"x" * 400)
+        self.assertIsNotNone(cache.get("ns", "old"))
+        self.assertIsNone(cache.get("ns", "mid"))
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+
+    def test_memoize_validates_and_recomputes(self) -> None:
+        context: Dict[str, Any] = {"cache": self.cache}
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(memoize(context, "ns", ["k"], compute), 1)
+        self.assertEqual(memoize(context, "ns", ["k"], compute), 1)
+        self.assertEqual(memoize(context, "ns", ["k"], compute, lambda v: False), 2)
+        # Without a cache in the context the step is always computed.
+        self.assertEqual(memoize({}, "ns", ["k"], compute), 3)
+
+    def test_clear_and_stats(self) -> None:
+        self.cache.put("gather", cache_key("root"), ["a"])
+        self.assertEqual(self.cache.stats()["namespaces"]["gather"]["entries"], 1)
+        self.assertEqual(self.cache.clear(), 1)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_gather_walk_is_reused_until_a_directory_changes(self) -> None:
+        root = os.path.join(self.tmp.name, "src")
+        os.makedirs(os.path.join(root, "pkg"))
+        with open(os.path.join(root, "pkg", "a.py"), "w", encoding="utf-8") as f:
+            f.write("a = 1\n")
+        past = time.time() - 3600
+        for d in (root, os.path.join(root, "pkg")):
+            os.utime(d, (past, past))
+
+        context: Dict[str, Any] = {"extensions": ["py"], "cache": self.cache}
+        plugin = GatherPlugin()
+        first = plugin.gather_files(root, [], context)
+        with patch.object(GatherPlugin, "_walk", side_effect=AssertionError):
+            self.assertEqual(plugin.gather_files(root, [], context), first)
+
+        new_file = os.path.join(root, "pkg", "b.py")
+        with open(new_file, "w", encoding="utf-8") as f:
+            f.write("b = 2\n")
+        self.assertIn(new_file, plugin.gather_files(root, [], context))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,10 +4,12 @@ Tests for the new positional argument handling for source inputs, merging of -r
 and the robustness of --skip functionality.
 """
 
+import io
 import os
 import sys
 import tempfile
 import unittest
+from unittest.mock import patch
 from savecode.utils.cli_args import parse_arguments
 from savecode.plugins.gather import should_skip
 from savecode.utils.path_utils import normalize_path
@@ -96,6 +98,22 @@ class TestCLIArgs(unittest.TestCase):
         # Restore original argv
         sys.argv = orig_argv
 
+    def test_jobs_validation(self) -> None:
+        """
+        Test that --jobs rejects negatives and that a bad SAVECODE_JOBS falls back to 1.
+        """
+        with patch("sys.stderr", io.StringIO()), self.assertRaises(SystemExit):
+            parse_arguments(["--jobs", "-1"])
+        args, _ = parse_arguments(["--jobs", "0"])
+        self.assertEqual(args.jobs, os.cpu_count() or 1)
+        with patch.dict(os.environ, SAVECODE_JOBS="3"):
+            self.assertEqual(parse_arguments([])[0].jobs, 3)
+        for bad in ("lots", "-2"):
+            with patch.dict(os.environ, SAVECODE_JOBS=bad):
+                with self.assertLogs("savecode.utils.cli_args", "WARNING"):
+                    args, _ = parse_arguments([])
+            self.assertEqual(args.jobs, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+"""
+tests/test_daemon.py - Tests for the resident daemon and its thin client.
+"""
+
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import List, Tuple
+from unittest.mock import patch
+
+from savecode.daemon import client_main
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix domain sockets")
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(tmp.name, "proj")
+        os.makedirs(self.root)
+        self.socket = os.path.join(tmp.name, "d.sock")
+        self.source = os.path.join(self.root, "a.py")
+        self._write("a = 1\n", age=3600)
+
+    def _write(self, text: str, age: float) -> None:
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(text)
+        past = time.time() - age
+        for path in (self.source, self.root):
+            os.utime(path, (past, past))
+
+    def _start_daemon(self, idle_timeout: str = "30") -> "subprocess.Popen[bytes]":
+        env = dict(os.environ, PYTHONPATH=SRC, SAVECODE_NOCOPY="1")
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "savecode", "--daemon"]
+            + ["--socket", self.socket, "--idle-timeout", idle_timeout],
+            env=env,
+        )
+        self.addCleanup(proc.wait, 10)
+        self.addCleanup(proc.kill)
+        deadline = time.time() + 10
+        while not os.path.exists(self.socket):
+            self.assertLess(time.time(), deadline, "daemon did not start")
+            time.sleep(0.02)
+        return proc
+
+    def _client(self, *args: str) -> Tuple[int, str, str]:
+        out, err = io.StringIO(), io.StringIO()
+        argv: List[str] = ["--socket", self.socket, *args]
+        with patch("sys.stdout", out), patch("sys.stderr", err):
+            with patch.dict(os.environ, SAVECODE_NOCOPY="1"):
+                status = client_main(argv)
+        return status, out.getvalue(), err.getvalue()
+
+    def test_bundle_streams_back_and_reflects_edits(self) -> None:
+        self._start_daemon()
+        status, out, err = self._client(self.root, "-o", "-", "--profile")
+        self.assertEqual(status, 0, err)
+        self.assertIn("a = 1", out)
+        self.assertIn("save.read", err)
+
+        # Warm run: the walk and the file contents come from the daemon's caches.
+        status, out, err = self._client(self.root, "-o", "-", "--profile")
+        self.assertIn("cached=True", err)
+        self.assertIn("cache_hits=1", err)
+
+        self._write("a = 2\n", age=1800)
+        status, out, _ = self._client(self.root, "-o", "-")
+        self.assertIn("a = 2", out)
+        self.assertNotIn("a = 1", out)
+
+    def test_idle_timeout_shuts_down_and_removes_socket(self) -> None:
+        proc = self._start_daemon(idle_timeout="0.3")
+        self.assertEqual(proc.wait(10), 0)
+        self.assertFalse(os.path.exists(self.socket))
+
+    def test_client_runs_locally_without_daemon(self) -> None:
+        output = os.path.join(self.root, "out.txt")
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        status, out, _ = self._client(self.root, "-o", output)
+        self.assertEqual(status, 0)
+        self.assertIn("a = 1", Path(output).read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+tests/test_display.py - Unit tests for summary rendering modes.
+"""
+
+import io
+import os
+import re
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+from savecode.utils.display import AUTO_COLLAPSE_FILES, display_summary
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def _render(saved: List[Tuple[str, int]], mode: Optional[str]) -> str:
+    context: Dict[str, Any] = {
+        "saved_files": saved,
+        "output": "out.txt",
+        "cli_opts": {"summary": mode},
+    }
+    stream = io.StringIO()
+    display_summary(context, stream)
+    return _ANSI.sub("", stream.getvalue())
+
+
+SAVED = [
+    ("top.py", 10),
+    (os.path.join("pkg", "a.py"), 2048),
+    (os.path.join("pkg", "sub", "b.py"), 30),
+]
+
+
+class TestDisplaySummary(unittest.TestCase):
+    def test_uses_precomputed_paths_without_recomputing(self) -> None:
+        with patch("os.path.relpath", side_effect=AssertionError):
+            text = _render(SAVED, "full")
+        self.assertIn("root:\n- top.py", text)
+        self.assertIn(f"- {os.path.join('pkg', 'a.py')}", text)
+        self.assertIn("Saved code from 3 files to out.txt", text)
+
+    def test_dirs_tree_top_and_none_modes(self) -> None:
+        dirs = _render(SAVED, "dirs")
+        self.assertRegex(dirs, r"pkg\s+1 files\s+2\.0 KiB")
+
+        tree = _render(SAVED, "tree")
+        self.assertIn("pkg/\n  a.py\n  sub/\n    b.py", tree)
+
+        top = _render(SAVED, "top-1")
+        self.assertIn("2.0 KiB  " + os.path.join("pkg", "a.py"), top)
+        self.assertIn("... and 2 more", top)
+
+        self.assertEqual(
+            _render(SAVED, "none").strip(), "Saved code from 3 files to out.txt"
+        )
+
+    def test_large_runs_collapse_by_default(self) -> None:
+        many = [
+            (os.path.join("d", f"f{i}.py"), 1) for i in range(AUTO_COLLAPSE_FILES + 1)
+        ]
+        text = _render(many, None)
+        self.assertNotIn("f0.py", text)
+        self.assertIn(f"{AUTO_COLLAPSE_FILES + 1} files", text)
+        self.assertIn("f0.py", _render(many, "full"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+tests/test_error_handler.py - Unit tests for bounded error aggregation.
+"""
+
+import io
+import logging
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from savecode.cli import run
+from savecode.utils.cli_args import parse_arguments
+from savecode.utils.error_handler import ErrorCollector, log_and_record_error
+
+logger = logging.getLogger("savecode.tests")
+
+
+class TestErrorCollector(unittest.TestCase):
+    def test_keeps_first_examples_and_counts_the_rest(self) -> None:
+        errors = ErrorCollector(max_examples=2)
+        context: Dict[str, Any] = {"errors": errors}
+        with self.assertLogs("savecode.tests", level="DEBUG") as logs:
+            for i in range(5):
+                log_and_record_error(
+                    f"big{i}", context, logger, level="warning", category="oversized"
+                )
+            log_and_record_error("boom", context, logger, category="read")
+
+        self.assertEqual(list(errors), ["big0", "big1", "boom"])
+        self.assertEqual(errors.total(), 6)
+        self.assertEqual(errors.total("warning"), 5)
+        self.assertEqual(
+            errors.report_lines("warning"),
+            ["- big0", "- big1", "  ... and 3 more oversized warnings"],
+        )
+        # Only the kept examples are logged above debug level.
+        loud = [r for r in logs.records if r.levelno > logging.DEBUG]
+        self.assertEqual(len(loud), 3)
+
+    def test_negative_example_limit_is_rejected_or_clamped(self) -> None:
+        with patch("sys.stderr", io.StringIO()), self.assertRaises(SystemExit):
+            parse_arguments(["--max-errors", "-1"])
+        errors = ErrorCollector(max_examples=-3)
+        log_and_record_error("x", {"errors": errors}, logger, category="read")
+        self.assertEqual(errors.report_lines("error"), ["  ... and 1 more read errors"])
+
+    def test_plain_list_context_still_works(self) -> None:
+        context: Dict[str, Any] = {"errors": []}
+        log_and_record_error("x", context, logger, level="warning", category="c")
+        self.assertEqual(context["errors"], ["x"])
+
+    def test_warnings_do_not_fail_the_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "out.txt")
+            missing = os.path.join(tmp, "gone.py")
+            argv: List[str] = ["-f", missing, "-o", out, "--summary", "none"]
+            with (
+                patch.dict(os.environ, {"SAVECODE_NOCOPY": "1"}),
+                patch(
+                    "savecode.plugins.save.SavePlugin.run",
+                    lambda self, ctx: log_and_record_error(
+                        "missing file", ctx, logger, level="warning", category="missing"
+                    ),
+                ),
+                patch("sys.stdout", new_callable=io.StringIO) as stdout,
+            ):
+                self.assertEqual(run(argv + ["--max-errors", "1"]), 1)
+                self.assertIn("Errors encountered:", stdout.getvalue())
+
+                stdout.truncate(0)
+                os.makedirs(missing)  # now a directory: no gather error
+                self.assertEqual(run(argv), 0)
+                self.assertIn("Warnings:\n- missing file", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
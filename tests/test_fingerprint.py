@@ -0,0 +1,98 @@
+"""
+tests/test_fingerprint.py - Unit tests for skipping unchanged bundles.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from savecode.plugins.save import SavePlugin
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.fingerprint import fingerprint_path
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.files: List[str] = []
+        for name in ("a.py", "b.py"):
+            path = os.path.join(self.root, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# {name}\n")
+            self.files.append(path)
+        self._age(*self.files)
+        self.output = os.path.join(self.root, "out.txt")
+        env = patch.dict(os.environ, SAVECODE_NOCOPY="1")
+        env.start()
+        self.addCleanup(env.stop)
+
+    @staticmethod
+    def _age(*paths: str) -> None:
+        old = time.time() - 60
+        for path in paths:
+            os.utime(path, (old, old))
+
+    def _save(self, **cli_opts: Any) -> Dict[str, Any]:
+        context: Dict[str, Any] = {
+            "all_files": list(self.files),
+            "base_dir": self.root,
+            "output": self.output,
+            "errors": ErrorCollector(),
+            "cli_opts": cli_opts,
+        }
+        SavePlugin().run(context)
+        return context
+
+    def test_unchanged_inputs_skip_reading_and_writing(self) -> None:
+        self.assertNotIn("bundle_unchanged", self._save())
+        self.assertTrue(os.path.exists(fingerprint_path(self.output)))
+        written = os.stat(self.output).st_mtime_ns
+        with patch("savecode.plugins.save.iter_sections") as sections:
+            context = self._save()
+            sections.assert_not_called()
+        self.assertTrue(context["bundle_unchanged"])
+        self.assertEqual(context["saved_files"], [("a.py", 7), ("b.py", 7)])
+        self.assertEqual(os.stat(self.output).st_mtime_ns, written)
+
+    def test_unchanged_bundle_is_still_copied_to_the_clipboard(self) -> None:
+        with patch("savecode.plugins.save.copy_clipboard") as copy:
+            self._save()
+            written = copy.call_args.args[0]
+            copy.reset_mock()
+            self.assertTrue(self._save()["bundle_unchanged"])
+        copy.assert_called_once_with(written)
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(f.read().strip(), written)
+
+    def test_changes_and_force_rewrite(self) -> None:
+        self._save()
+        with open(self.files[0], "a", encoding="utf-8") as f:
+            f.write("x = 1\n")
+        self._age(self.files[0])
+        self.assertNotIn("bundle_unchanged", self._save())
+        self.assertTrue(self._save().get("bundle_unchanged"))
+        self.assertNotIn("bundle_unchanged", self._save(force=True))
+        self.files.pop()
+        self.assertNotIn("bundle_unchanged", self._save())
+        with open(self.output, "a", encoding="utf-8") as f:
+            f.write("edited by hand\n")
+        self.assertNotIn("bundle_unchanged", self._save())
+
+    def test_no_fingerprint_for_recent_or_failed_runs(self) -> None:
+        os.utime(self.files[0])
+        self._save()
+        self.assertFalse(os.path.exists(fingerprint_path(self.output)))
+        self._age(self.files[0])
+        self.files.append(os.path.join(self.root, "missing.py"))
+        context = self._save()
+        self.assertTrue(context["errors"])
+        self.assertFalse(os.path.exists(fingerprint_path(self.output)))
+
+
+if __name__ == "__main__":
+    unittest.main()
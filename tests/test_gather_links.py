@@ -0,0 +1,65 @@
+"""
+tests/test_gather_links.py - Unit tests for --follow-symlinks and inode dedupe.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+
+from savecode.plugins.gather import GatherPlugin
+from savecode.utils.cache import ListingCache
+from savecode.utils.error_handler import ErrorCollector
+
+
+@unittest.skipUnless(hasattr(os, "symlink") and os.name == "posix", "needs symlinks")
+class TestGatherLinks(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(os.path.realpath(tmp.name), "repo")
+        self.shared = os.path.join(os.path.realpath(tmp.name), "shared")
+        os.makedirs(os.path.join(self.root, "pkg"))
+        os.makedirs(self.shared)
+        self.main = os.path.join(self.root, "pkg", "main.py")
+        self.lib = os.path.join(self.shared, "lib.py")
+        for path in (self.main, self.lib):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+        os.link(self.main, os.path.join(self.root, "pkg", "hardlink.py"))
+        os.symlink(self.main, os.path.join(self.root, "alias.py"))
+        # A linked source tree outside the root, and a loop back to the root.
+        os.symlink(self.shared, os.path.join(self.root, "vendor"))
+        os.symlink(self.root, os.path.join(self.root, "pkg", "loop"))
+
+    def _gather(self, follow: bool, **extra: Any) -> Dict[str, Any]:
+        context: Dict[str, Any] = {
+            "roots": [self.root],
+            "files": [],
+            "skip": [],
+            "extensions": ["py"],
+            "errors": ErrorCollector(),
+            "cli_opts": {"follow_symlinks": follow},
+        }
+        context.update(extra)
+        GatherPlugin().run(context)
+        return context
+
+    def test_linked_copies_are_bundled_once(self) -> None:
+        files = self._gather(follow=False)["all_files"]
+        self.assertEqual(len(files), 1)
+        self.assertEqual(os.stat(files[0]).st_ino, os.stat(self.main).st_ino)
+
+    def test_follow_symlinks_walks_linked_trees_without_looping(self) -> None:
+        for extra in ({}, {"listing_cache": ListingCache()}):
+            with self.subTest(listing=bool(extra)):
+                files = self._gather(follow=True, **extra)["all_files"]
+                self.assertEqual(
+                    sorted(os.path.basename(os.path.realpath(f)) for f in files),
+                    ["lib.py", "main.py"],
+                )
+                self.assertIn(os.path.join(self.root, "vendor", "lib.py"), files)
+
+
+if __name__ == "__main__":
+    unittest.main()
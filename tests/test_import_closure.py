@@ -0,0 +1,126 @@
+"""
+tests/test_import_closure.py - Unit tests for --entry import-closure bundling.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from savecode.cli import run
+from savecode.plugins.import_closure import ImportClosurePlugin, scan_imports
+from savecode.utils.cache import MemoryCache
+from savecode.utils.error_handler import ErrorCollector
+
+FILES = {
+    "main.py": "import helpers\nfrom app import service\n",
+    "helpers.py": "import os\n",
+    "unused.py": "import helpers\n",
+    "app/__init__.py": "",
+    "app/service.py": "from .models import User\nfrom . import util\n",
+    "app/models.py": "def f():\n    from app.db import connect\n",
+    "app/db.py": "import app.service\n",  # cycle back to service
+    "app/util.py": "",
+    "app/orphan.py": "",
+}
+
+
+class TestImportClosure(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.paths: Dict[str, str] = {}
+        for rel, text in FILES.items():
+            path = os.path.join(self.root, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            self.paths[rel] = path
+
+    def _run(self, dep_order: bool = False, **extra: Any) -> Dict[str, Any]:
+        context: Dict[str, Any] = {
+            "entry": [self.paths["main.py"]],
+            "all_files": sorted(self.paths.values()),
+            "errors": ErrorCollector(),
+            "cli_opts": {"entry": True, "dep_order": dep_order},
+        }
+        context.update(extra)
+        ImportClosurePlugin().run(context)
+        return context
+
+    def _rel(self, paths: List[str]) -> List[str]:
+        return [os.path.relpath(p, self.root).replace(os.sep, "/") for p in paths]
+
+    def test_scan_imports(self) -> None:
+        self.assertEqual(
+            scan_imports("import a.b\nfrom ..x import y\nfrom m import *\n"),
+            [(0, "a.b", []), (2, "x", ["y"]), (0, "m", [])],
+        )
+
+    def test_keeps_only_the_transitive_closure(self) -> None:
+        context = self._run()
+        kept = self._rel(context["all_files"])
+        self.assertEqual(
+            sorted(kept),
+            sorted(
+                [
+                    "main.py",
+                    "helpers.py",
+                    "app/__init__.py",
+                    "app/service.py",
+                    "app/models.py",
+                    "app/db.py",
+                    "app/util.py",
+                ]
+            ),
+        )
+        self.assertFalse(context["errors"])
+
+    def test_dependency_order_puts_imports_first(self) -> None:
+        kept = self._rel(self._run(dep_order=True)["all_files"])
+        self.assertEqual(kept[-1], "main.py")
+        self.assertLess(kept.index("helpers.py"), kept.index("main.py"))
+        self.assertLess(kept.index("app/models.py"), kept.index("app/service.py"))
+
+    def test_imports_are_memoized_by_mtime(self) -> None:
+        cache = MemoryCache()
+        old = 1_000_000_000
+        for path in self.paths.values():
+            os.utime(path, ns=(old, old))
+        self._run(cache=cache)
+        # Unchanged files are not parsed again.
+        with patch(
+            "savecode.plugins.import_closure.scan_imports", side_effect=AssertionError
+        ):
+            self.assertFalse(self._run(cache=cache)["errors"])
+        with open(self.paths["helpers.py"], "w", encoding="utf-8") as f:
+            f.write("import unused\n")
+        os.utime(self.paths["helpers.py"], ns=(old + 10**9, old + 10**9))
+        self.assertIn("unused.py", self._rel(self._run(cache=cache)["all_files"]))
+
+    def test_second_cached_cli_run_parses_nothing(self) -> None:
+        old = 1_000_000_000
+        for path in self.paths.values():
+            os.utime(path, ns=(old, old))
+        output = os.path.join(self.root, "out.txt")
+        argv = [self.root, "--ext", "py", "--cache", "-o", output]
+        argv += ["--entry", self.paths["main.py"]]
+        env = {"SAVECODE_CACHE_DIR": os.path.join(self.root, ".cache")}
+        with patch.dict(os.environ, env, SAVECODE_NOCOPY="1"):
+            with patch("sys.stdout", io.StringIO()):
+                self.assertEqual(run(argv), 0)
+                # The on-disk memo answers every import scan of the second run.
+                with patch(
+                    "savecode.plugins.import_closure.scan_imports",
+                    side_effect=AssertionError,
+                ):
+                    self.assertEqual(run(argv), 0)
+        with open(output, encoding="utf-8") as f:
+            self.assertIn("from .models import User", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+tests/test_import_time.py - Regression guard for CLI startup cost.
+
+Runs `python -X importtime` in a fresh interpreter and checks that heavy or unneeded
+modules stay off the startup path, and that the total import time of `--help` and of
+a small real run stays within budget. Each run gets an empty cache directory, so the
+cold path (no plugin entry-point index yet) is what gets measured. Override the
+budget with SAVECODE_IMPORT_BUDGET_MS on slow machines.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+# Imported lazily, only by the features that need them.
+DEFERRED_MODULES = (
+    "tqdm",
+    "pyperclip",
+    "importlib.metadata",
+    "sqlite3",
+    "tracemalloc",
+    "subprocess",
+    "dataclasses",
+    "ast",
+)
+
+BUDGET_MS = float(os.getenv("SAVECODE_IMPORT_BUDGET_MS", "150"))
+
+
+def _importtime(args: List[str], cwd: str) -> Tuple[Dict[str, int], float]:
+    """Run a fresh, cold interpreter in *cwd*.
+
+    Returns:
+        Tuple[Dict[str, int], float]: {module: cumulative microseconds}, and the
+        total import time in milliseconds (the sum over top-level imports).
+    """
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(
+            os.environ,
+            PYTHONPATH=SRC,
+            SAVECODE_NOCOPY="1",
+            HOME=home,
+            XDG_CACHE_HOME=os.path.join(home, ".cache"),
+        )
+        env.pop("SAVECODE_CACHE_DIR", None)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=cwd,
+        )
+    timings: Dict[str, int] = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return timings, total_us / 1000
+
+
+class TestImportTime(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.project = tmp.name
+        with open(os.path.join(self.project, "mod.py"), "w", encoding="utf-8") as f:
+            f.write("x = 1\n")
+        self.small_run = [
+            "-m",
+            "savecode",
+            self.project,
+            "--ext",
+            "py",
+            "-o",
+            os.path.join(self.project, "out.txt"),
+        ]
+
+    def test_cli_import_avoids_deferred_modules(self) -> None:
+        timings, _ = _importtime(["-c", "import savecode.cli"], self.project)
+        self.assertIn("savecode.cli", timings)
+        loaded = sorted(m for m in DEFERRED_MODULES if m in timings)
+        self.assertEqual(loaded, [], f"imported at startup: {loaded}")
+
+    def test_help_and_small_run_avoid_deferred_modules(self) -> None:
+        for args in (["-m", "savecode", "--help"], self.small_run):
+            with self.subTest(args=args):
+                timings, _ = _importtime(args, self.project)
+                self.assertIn("savecode.cli", timings)
+                loaded = sorted(m for m in DEFERRED_MODULES if m in timings)
+                self.assertEqual(loaded, [], f"imported cold: {loaded}")
+
+    def test_startup_within_budget(self) -> None:
+        for args in (["-m", "savecode", "--help"], self.small_run):
+            with self.subTest(args=args):
+                # Take the best of a few runs to keep the check stable on busy
+                # machines.
+                best_ms = min(_importtime(args, self.project)[1] for _ in range(3))
+                self.assertLess(best_ms, BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
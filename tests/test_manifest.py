@@ -0,0 +1,123 @@
+"""
+tests/test_manifest.py - Tests for batch manifest mode.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+from savecode.manifest import ManifestError, load_manifest, run_manifest
+from savecode.utils.cache import ContentCache, ListingCache
+
+MANIFEST = """
+[defaults]
+skip = ["build"]
+
+[[job]]
+roots = ["proj"]
+output = "out/all-py.txt"
+
+[[job]]
+name = "a-mixed"
+roots = ["proj/a"]
+ext = ["py", "toml"]
+output = "out/a.txt"
+"""
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base = tmp.name
+        for rel, text in {
+            "proj/a/x.py": "x = 1\n",
+            "proj/a/k.toml": "k = 1\n",
+            "proj/b/y.py": "y = 1\n",
+            "proj/build/z.py": "z = 1\n",
+        }.items():
+            path = os.path.join(self.base, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        self.manifest = self._write_manifest(MANIFEST)
+
+    def _write_manifest(self, text: str) -> str:
+        path = os.path.join(self.base, "jobs.toml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def _read(self, rel: str) -> str:
+        with open(os.path.join(self.base, rel), encoding="utf-8") as f:
+            return f.read()
+
+    def test_jobs_share_listings_and_reads(self) -> None:
+        caches: Dict[str, object] = {}
+
+        def spy(cls: type, name: str) -> object:
+            def make(*args: object, **kwargs: object) -> object:
+                caches[name] = cls(*args, **kwargs)
+                return caches[name]
+
+            return make
+
+        with patch("savecode.manifest.ListingCache", spy(ListingCache, "listing")):
+            with patch("savecode.manifest.ContentCache", spy(ContentCache, "content")):
+                with patch("sys.stdout", io.StringIO()) as out:
+                    status = run_manifest(self.manifest)
+
+        self.assertEqual(status, 0)
+        self.assertIn("a-mixed: 2 files", out.getvalue())
+        # proj, proj/a and proj/b: the skipped build dir is never listed.
+        self.assertEqual(caches["listing"].listed, 3)  # type: ignore[attr-defined]
+        # x.py is needed by both jobs but read once.
+        self.assertEqual(caches["content"].misses, 3)  # type: ignore[attr-defined]
+
+        everything = self._read("out/all-py.txt")
+        self.assertIn("x = 1", everything)
+        self.assertIn("y = 1", everything)
+        self.assertNotIn("z = 1", everything)
+        self.assertTrue(self._read("out/a.txt").startswith("Files saved (2):"))
+
+    def test_warming_skips_binaries_and_respects_the_budget(self) -> None:
+        with open(os.path.join(self.base, "proj/b/blob.py"), "wb") as f:
+            f.write(b"\x00" * 4096)
+        with open(os.path.join(self.base, "proj/b/big.py"), "wb") as f:
+            f.write(b"# " + b"x" * 2 * 1024 * 1024 + b"\n")
+        caches: Dict[str, ContentCache] = {}
+
+        def make(*args: Any, **kwargs: Any) -> ContentCache:
+            caches["content"] = ContentCache(*args, **kwargs)
+            return caches["content"]
+
+        with (
+            patch.dict(os.environ, SAVECODE_MANIFEST_CACHE_MB="1"),
+            patch("savecode.manifest.ContentCache", make),
+            patch("sys.stdout", io.StringIO()),
+        ):
+            status = run_manifest(self.manifest)
+
+        self.assertEqual(status, 0)
+        contents = caches["content"]
+        self.assertEqual(contents.max_bytes, 1024 * 1024)
+        cached = {os.path.basename(p) for p in contents._entries}
+        self.assertEqual(cached, {"x.py", "k.toml", "y.py"})
+        self.assertIn("# xxx", self._read("out/all-py.txt"))
+
+    def test_invalid_manifests_are_rejected(self) -> None:
+        for text in (
+            "",
+            "[[job]]\nroots = ['proj']\n",
+            "[[job]]\noutput = 'o.txt'\ncolour = true\n",
+            "[[job]]\noutput = 'o.txt'\n[[job]]\noutput = 'o.txt'\n",
+        ):
+            with self.subTest(text=text), self.assertRaises(ManifestError):
+                load_manifest(self._write_manifest(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
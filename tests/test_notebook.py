@@ -0,0 +1,143 @@
+"""
+tests/test_notebook.py - Unit tests for Jupyter notebook cell extraction.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+from savecode.plugins.save import iter_sections
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.notebook import (
+    extract_cells,
+    notebook_from_bytes,
+    parse_events,
+    read_notebook,
+)
+from savecode.utils.transform_pool import transform_batch
+
+NOTEBOOK = {
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Analysis\n"]},
+        {
+            "cell_type": "code",
+            "execution_count": 1,
+            "metadata": {"tags": []},
+            "source": ["df = load()\n", 'print("a \\"quoted\\" value")'],
+            "outputs": [
+                {"output_type": "stream", "name": "stdout", "text": ["done\n"]},
+                {
+                    "output_type": "display_data",
+                    "data": {"image/png": "iVBORw0KGgo" * 1000},
+                    "metadata": {},
+                },
+            ],
+        },
+        {"cell_type": "raw", "metadata": {}, "source": "ignored"},
+        {
+            "cell_type": "code",
+            "execution_count": None,
+            "metadata": {},
+            "source": "1 / 0",
+            "outputs": [
+                {
+                    "output_type": "error",
+                    "ename": "ZeroDivisionError",
+                    "evalue": "division by zero",
+                    "traceback": ["..."],
+                }
+            ],
+        },
+    ],
+    "metadata": {"kernelspec": {"name": "python3"}},
+    "nbformat": 4,
+    "nbformat_minor": 5,
+}
+
+CELLS = (
+    "# ---- cell 1: markdown ----\n# Analysis\n\n"
+    '# ---- cell 2: code ----\ndf = load()\nprint("a \\"quoted\\" value")\n\n'
+    "# ---- cell 4: code ----\n1 / 0\n\n"
+)
+
+CELLS_WITH_OUTPUTS = (
+    "# ---- cell 1: markdown ----\n# Analysis\n\n"
+    '# ---- cell 2: code ----\ndf = load()\nprint("a \\"quoted\\" value")\n'
+    "\n# ---- cell 2: output ----\ndone\n\n"
+    "# ---- cell 4: code ----\n1 / 0\n"
+    "\n# ---- cell 4: output ----\nZeroDivisionError: division by zero\n\n"
+)
+
+
+def _without_ijson() -> Any:
+    """Force the standard-library fallback parser."""
+    return patch.dict("sys.modules", {"ijson": None})
+
+
+class TestNotebook(unittest.TestCase):
+    def test_fallback_events_survive_small_chunks(self) -> None:
+        text = json.dumps({"a": [1, 2.5, 'x\\"y', {"b": None}], "c": True}, indent=1)
+        with patch("savecode.utils.notebook.CHUNK_CHARS", 3):
+            events = list(parse_events(io.StringIO(text)))
+        self.assertEqual(
+            events,
+            [
+                ("", "start_map", None),
+                ("", "map_key", "a"),
+                ("a", "start_array", None),
+                ("a.item", "number", 1),
+                ("a.item", "number", 2.5),
+                ("a.item", "string", 'x\\"y'),
+                ("a.item", "start_map", None),
+                ("a.item", "map_key", "b"),
+                ("a.item.b", "null", None),
+                ("a.item", "end_map", None),
+                ("a", "end_array", None),
+                ("", "map_key", "c"),
+                ("c", "boolean", True),
+                ("", "end_map", None),
+            ],
+        )
+
+    def test_only_code_and_markdown_cells_are_kept(self) -> None:
+        data = json.dumps(NOTEBOOK, indent=1).encode("utf-8")
+        with _without_ijson():
+            self.assertEqual(extract_cells(io.BytesIO(data)), CELLS)
+            self.assertEqual(
+                extract_cells(io.BytesIO(data), outputs=True), CELLS_WITH_OUTPUTS
+            )
+
+    def test_non_notebooks_fall_back(self) -> None:
+        with _without_ijson():
+            self.assertIsNone(notebook_from_bytes(b'{"cells": [1, 2'))
+            self.assertIsNone(notebook_from_bytes(b"not json"))
+            self.assertIsNone(notebook_from_bytes(b'{"worksheets": []}'))
+        self.assertIsNone(read_notebook("/nonexistent/x.ipynb"))
+
+    def test_save_and_pool_bundle_cells(self) -> None:
+        data = json.dumps(NOTEBOOK)
+        with tempfile.TemporaryDirectory() as root, _without_ijson():
+            path = os.path.join(root, "analysis.ipynb")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+            context: Dict[str, Any] = {
+                "errors": ErrorCollector(),
+                "base_dir": root,
+                "cli_opts": {},
+            }
+            saved: List[Tuple[str, int]] = []
+            sections = [s for _, _, s in iter_sections([path], context, saved=saved)]
+            self.assertEqual(sections, [f"File: analysis.ipynb\n\n{CELLS}\n\n"])
+            self.assertEqual(saved, [("analysis.ipynb", len(data))])
+
+            spool, _ = transform_batch([path], ["analysis.ipynb"], False, 1 << 20, root)
+            with open(spool, "rb") as f:
+                self.assertEqual(f.read().decode("utf-8"), sections[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+tests/test_outline.py - Unit tests for --outline Python skeletons.
+"""
+
+import ast
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+from savecode.plugins.save import iter_sections
+from savecode.utils.cache import MemoryCache
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.outline import head, outline_source, outline_text
+from savecode.utils.transform_pool import transform_batch
+
+SOURCE = '''"""Module summary.
+
+More detail that is left out.
+"""
+
+import os
+
+LIMIT: int = 10
+_private = 1
+
+
+@dataclass(frozen=True)
+class Point(Base, metaclass=Meta):
+    """A point."""
+
+    ORIGIN = (0, 0)
+
+    def norm(self, *, squared: bool = False) -> float:
+        """Return the length.
+
+        Long explanation.
+        """
+        return 0.0
+
+
+async def fetch(url, timeout=5):
+    pass
+'''
+
+OUTLINE = '''"""Module summary."""
+LIMIT: int = 10  # L8
+@dataclass(frozen=True)
+class Point(Base, metaclass=Meta):  # L13-23
+    """A point."""
+    ORIGIN = (0, 0)  # L16
+    def norm(self, *, squared: bool=False) -> float:
+        """Return the length."""
+        ...  # L18-23
+async def fetch(url, timeout=5):
+    ...  # L26-27
+'''
+
+
+class TestOutline(unittest.TestCase):
+    def test_skeleton_keeps_signatures_and_line_numbers(self) -> None:
+        self.assertEqual(outline_source(SOURCE), OUTLINE)
+        self.assertIsNone(outline_source("def broken(:\n"))
+        self.assertEqual(outline_source("x = 1\n"), "")
+
+    def test_awkward_docstrings_stay_valid_python(self) -> None:
+        for doc in ('Say """hi""".', "Ends in a backslash \\\\", 'Quote"'):
+            with self.subTest(doc=doc):
+                source = f"def f():\n    {doc!r}\n"
+                outline = outline_source(source)
+                assert outline is not None
+                node = ast.parse(outline).body[0]
+                assert isinstance(node, ast.FunctionDef)
+                self.assertEqual(ast.get_docstring(node), doc)
+
+    def test_non_python_files_are_capped(self) -> None:
+        text = "".join(f"line {i}\n" for i in range(1000))
+        capped = outline_text("notes.md", text, head_bytes=100)
+        self.assertTrue(capped.startswith("line 0\n"))
+        self.assertLess(len(capped), 150)
+        self.assertTrue(capped.endswith("more bytes)\n"))
+        self.assertEqual(head(text, 0), text)
+        # Python that does not parse falls back to the capped content too.
+        self.assertEqual(outline_text("bad.py", "def (:\n", 100), "def (:\n")
+
+    def test_outlines_are_memoized_by_content(self) -> None:
+        context: Dict[str, Any] = {"cache": MemoryCache()}
+        outline_text("a.py", SOURCE, context=context)
+        with patch("savecode.utils.outline.outline_source") as parse:
+            self.assertEqual(outline_text("b.py", SOURCE, context=context), OUTLINE)
+            parse.assert_not_called()
+
+    def test_save_and_pool_write_outlines(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "mod.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SOURCE)
+            context: Dict[str, Any] = {
+                "errors": ErrorCollector(),
+                "base_dir": root,
+                "cli_opts": {"outline": 4096},
+            }
+            saved: List[Tuple[str, int]] = []
+            sections = [s for _, _, s in iter_sections([path], context, saved=saved)]
+            self.assertEqual(sections, [f"File: mod.py\n\n{OUTLINE}\n\n"])
+            self.assertEqual(saved, [("mod.py", len(SOURCE))])
+
+            spool, records = transform_batch(
+                [path], ["mod.py"], False, 1 << 20, root, outline_head=4096
+            )
+            with open(spool, "rb") as f:
+                self.assertEqual(f.read().decode("utf-8"), sections[0])
+            self.assertEqual(records[0][1], len(sections[0].encode("utf-8")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+tests/test_plugin_discovery.py - Unit tests for descriptor/entry-point plugin discovery.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from importlib import reload
+from typing import Any, Dict
+from unittest.mock import patch
+
+from savecode.plugin_manager.manager import (
+    PluginManager,
+    PluginSpec,
+    _scan_entry_points,
+    clear_registry,
+    entry_point_specs,
+    plugin_manager,
+    register_plugin,
+)
+from savecode.plugins.specs import BUILTIN_SPECS
+
+
+class TestPluginDiscovery(unittest.TestCase):
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_inactive_plugin_is_never_imported(self) -> None:
+        manager = PluginManager()
+        manager.register_spec(
+            PluginSpec(
+                name="GhostPlugin",
+                target="savecode_missing_module:GhostPlugin",
+                provides=("ghost",),
+                flags=("ghost",),
+            )
+        )
+        manager.run_plugins({"cli_opts": {}})
+        self.assertNotIn("savecode_missing_module", sys.modules)
+
+    def test_lazy_target_is_loaded_on_run(self) -> None:
+        manager = PluginManager()
+        manager.register_spec(
+            PluginSpec(
+                name="ExtraArgsPlugin",
+                target="savecode.plugins.extra_args:ExtraArgsPlugin",
+                provides=("parsed_extra_args",),
+            )
+        )
+        context: Dict[str, Any] = {"extra_args": ["flag"]}
+        manager.run_plugins(context)
+        self.assertEqual(context["parsed_extra_args"], {"flag": True})
+
+    def test_entry_point_descriptors_are_registered(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.mkdir(os.path.join(tmpdir, "site"))
+            with open(os.path.join(tmpdir, "site", "thirdparty_specs.py"), "w") as fh:
+                fh.write(
+                    "LINT = {'target': 'thirdparty.lint:LintPlugin',"
+                    " 'order': 40, 'requires': ['all_files']}\n"
+                    "BROKEN = 42\n"
+                )
+            dist_info = os.path.join(tmpdir, "site", "thirdparty-1.0.dist-info")
+            os.mkdir(dist_info)
+            with open(os.path.join(dist_info, "entry_points.txt"), "w") as fh:
+                fh.write(
+                    "[console_scripts]\nlint = thirdparty.cli:main\n\n"
+                    "[savecode.plugins]\n"
+                    "lint = thirdparty_specs:LINT\n"
+                    "broken = thirdparty_specs:BROKEN\n"
+                )
+            manager = PluginManager(autodiscover=True)
+            with (
+                patch.dict(
+                    os.environ, {"SAVECODE_CACHE_DIR": os.path.join(tmpdir, "cache")}
+                ),
+                patch.object(sys, "path", sys.path + [os.path.join(tmpdir, "site")]),
+                patch.object(sys, "dont_write_bytecode", True),
+                patch(
+                    "savecode.plugin_manager.manager._scan_entry_points",
+                    wraps=_scan_entry_points,
+                ) as scan,
+            ):
+                names = manager.list_plugins()
+                # A second lookup is answered from the on-disk index without a scan.
+                self.assertEqual(len(entry_point_specs()), 1)
+            self.assertEqual(scan.call_count, 1)
+        self.assertIn("lint", names)
+        self.assertNotIn("broken", names)
+        self.assertLess(names.index("GatherPlugin"), names.index("lint"))
+
+    def test_builtin_descriptors_match_decorators(self) -> None:
+        import savecode.plugins.extra_args
+        import savecode.plugins.gather
+        import savecode.plugins.git_status
+        import savecode.plugins.import_closure
+        import savecode.plugins.save
+
+        clear_registry()
+        for module in (
+            savecode.plugins.extra_args,
+            savecode.plugins.git_status,
+            savecode.plugins.gather,
+            savecode.plugins.import_closure,
+            savecode.plugins.save,
+        ):
+            reload(module)
+        registered = {s.name: s for s in plugin_manager.registry}
+        for spec in BUILTIN_SPECS:
+            actual = registered[spec.name]
+            self.assertEqual(
+                (spec.order, spec.provides, spec.requires, spec.flags),
+                (actual.order, actual.provides, actual.requires, actual.flags),
+            )
+            lazy = PluginSpec(name=spec.name, target=spec.target)
+            self.assertIs(lazy.load(), actual.plugin_class)
+
+    def test_descriptor_must_name_the_decorated_class(self) -> None:
+        from savecode.plugins.specs import SAVE
+
+        with self.assertRaises(ValueError):
+
+            @register_plugin(spec=SAVE)
+            class NotSavePlugin:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
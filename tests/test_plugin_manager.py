@@ -0,0 +1,89 @@
+"""
+tests/test_plugin_manager.py - Unit tests for dependency-based plugin scheduling.
+"""
+
+import threading
+import unittest
+from typing import Any, Dict, List
+
+from savecode.plugin_manager.manager import PluginCycleError, PluginManager
+
+
+def _make_plugin(name: str, log: List[str], action: Any = None) -> type:
+    def run(self: Any, context: Dict[str, Any]) -> None:
+        if action is not None:
+            action(context)
+        log.append(name)
+
+    return type(name, (), {"run": run})
+
+
+class TestPluginManager(unittest.TestCase):
+    def test_requires_runs_after_provider(self) -> None:
+        log: List[str] = []
+        manager = PluginManager()
+        # Register the consumer first, with a lower order, to prove keys win over order.
+        manager.register_plugin(
+            _make_plugin("Consumer", log), order=1, requires=["data"]
+        )
+        manager.register_plugin(
+            _make_plugin("Producer", log, lambda c: c.update(data=1)),
+            order=50,
+            provides=["data"],
+        )
+        manager.run_plugins({})
+        self.assertEqual(log, ["Producer", "Consumer"])
+        self.assertEqual(manager.list_plugins(), ["Producer", "Consumer"])
+
+    def test_cycle_detected_at_registration(self) -> None:
+        manager = PluginManager()
+        manager.register_plugin(_make_plugin("A", []), provides=["a"], requires=["b"])
+        with self.assertRaises(PluginCycleError):
+            manager.register_plugin(
+                _make_plugin("B", []), provides=["b"], requires=["a"]
+            )
+        self.assertEqual(manager.list_plugins(), ["A"])
+
+    def test_unneeded_provider_is_skipped(self) -> None:
+        log: List[str] = []
+        manager = PluginManager()
+        manager.register_plugin(
+            _make_plugin("First", log, lambda c: c.update(files=["x"])),
+            order=10,
+            provides=["files"],
+        )
+        manager.register_plugin(
+            _make_plugin("Second", log), order=20, provides=["files"]
+        )
+        manager.register_plugin(
+            _make_plugin("Flagged", log), order=5, provides=["other"], flags=["git"]
+        )
+        manager.run_plugins({"cli_opts": {"git": False}})
+        self.assertEqual(log, ["First"])
+
+    def test_independent_plugins_run_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+        log: List[str] = []
+        manager = PluginManager(max_workers=2)
+        manager.register_plugin(
+            _make_plugin("Left", log, lambda c: barrier.wait()), provides=["left"]
+        )
+        manager.register_plugin(
+            _make_plugin("Right", log, lambda c: barrier.wait()), provides=["right"]
+        )
+        # Would deadlock (BrokenBarrierError after the timeout) if run sequentially.
+        manager.run_plugins({})
+        self.assertEqual(sorted(log), ["Left", "Right"])
+
+    def test_undeclared_plugins_fall_back_to_order(self) -> None:
+        log: List[str] = []
+        manager = PluginManager()
+        manager.register_plugin(_make_plugin("Late", log), order=30)
+        manager.register_plugin(_make_plugin("Early", log), order=10)
+        manager.register_plugin(_make_plugin("Middle", log), order=20, provides=["k"])
+        manager.run_plugins({})
+        self.assertEqual(log, ["Early", "Middle", "Late"])
+
+
+if __name__ == "__main__":
+    unittest.main()
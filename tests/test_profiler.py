@@ -0,0 +1,113 @@
+"""
+tests/test_profiler.py - Unit tests for the span profiler and Chrome trace export.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from importlib import reload
+
+from savecode.plugin_manager.manager import run_plugins, clear_registry
+from savecode.utils.profiler import Profiler, span
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_registry()
+        import savecode.plugins.gather
+        import savecode.plugins.save
+
+        reload(savecode.plugins.gather)
+        reload(savecode.plugins.save)
+
+    def tearDown(self) -> None:
+        clear_registry()
+
+    def test_span_is_noop_without_profiler(self) -> None:
+        with span({}, "anything") as stats:
+            stats["files"] = 1
+        # The no-op span hands out a fresh dict each time, so nothing leaks.
+        with span({}, "anything") as stats:
+            self.assertEqual(stats, {})
+
+    def test_plugin_spans_and_trace_export(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "a.py"), "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+            profiler = Profiler()
+            profiler.start()
+            context = {
+                "roots": [tmpdir],
+                "files": [],
+                "skip": [],
+                "output": os.path.join(tmpdir, "out.txt"),
+                "extensions": ["py"],
+                "errors": [],
+                "profiler": profiler,
+            }
+            try:
+                run_plugins(context)
+            finally:
+                profiler.stop()
+
+            names = {e["name"] for e in profiler.events}
+            self.assertTrue(
+                {"run_plugins", "GatherPlugin", "SavePlugin", "gather.walk"} <= names
+            )
+            save_span = next(e for e in profiler.events if e["name"] == "SavePlugin")
+            self.assertIn("peak_kib", save_span["args"])
+            read_span = next(e for e in profiler.events if e["name"] == "save.read")
+            self.assertEqual(read_span["args"]["files"], 1)
+
+            trace_path = os.path.join(tmpdir, "trace.json")
+            profiler.write_trace(trace_path)
+            with open(trace_path, encoding="utf-8") as fh:
+                trace = json.load(fh)
+            event = trace["traceEvents"][0]
+            for key in ("name", "ph", "ts", "pid", "tid"):
+                self.assertIn(key, event)
+
+    def test_overlapping_plugin_spans_get_no_memory_peak(self) -> None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            with profiler.span("A", "plugin"):
+                with profiler.span("B", "plugin"):
+                    pass
+            with profiler.span("C", "plugin"):
+                pass
+        finally:
+            profiler.stop()
+        peaks = {e["name"]: e["args"]["peak_kib"] for e in profiler.events}
+        self.assertIsNone(peaks["A"])
+        self.assertIsNone(peaks["B"])
+        self.assertIsInstance(peaks["C"], float)
+
+    def test_walk_counts_directories_without_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for sub in ("a", os.path.join("a", "b")):
+                os.makedirs(os.path.join(tmpdir, sub))
+                with open(os.path.join(tmpdir, sub, "m.py"), "w") as f:
+                    f.write("x = 1\n")
+            with open(os.path.join(tmpdir, "notes.txt"), "w") as f:
+                f.write("notes\n")
+            profiler = Profiler(trace_memory=False)
+            context = {
+                "roots": [tmpdir],
+                "files": [],
+                "skip": [],
+                "output": os.path.join(tmpdir, "out.txt"),
+                "extensions": ["py"],
+                "errors": [],
+                "profiler": profiler,
+            }
+            run_plugins(context)
+            walk = next(e for e in profiler.events if e["name"] == "gather.walk")
+            self.assertEqual(walk["args"]["dirs"], 3)
+            self.assertEqual(walk["args"]["files_seen"], 3)
+            self.assertEqual(walk["args"]["matched"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
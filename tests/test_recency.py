@@ -0,0 +1,82 @@
+"""
+tests/test_recency.py - Unit tests for --changed-within / --newer-than filtering.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, Dict
+
+from savecode.plugins.gather import GatherPlugin
+from savecode.utils.cli_args import parse_arguments
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.recency import (
+    filter_recent,
+    parse_duration,
+    parse_reference_time,
+    recency_cutoff,
+)
+
+
+class TestRecency(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.old = os.path.join(self.root, "pkg", "old.py")
+        self.new = os.path.join(self.root, "new.py")
+        os.makedirs(os.path.dirname(self.old))
+        for path in (self.old, self.new):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+        hours_ago = time.time() - 3 * 3600
+        os.utime(self.old, (hours_ago, hours_ago))
+
+    def test_parse_duration(self) -> None:
+        self.assertEqual(parse_duration("90"), 90)
+        self.assertEqual(parse_duration("2h"), 7200)
+        self.assertEqual(parse_duration("1h30m"), 5400)
+        self.assertEqual(parse_duration("1.5d"), 129600)
+        for bad in ("", "0", "5x", "h"):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                parse_duration(bad)
+
+    def test_reference_time_from_file_or_iso(self) -> None:
+        self.assertEqual(parse_reference_time(self.new), os.stat(self.new).st_mtime_ns)
+        self.assertEqual(
+            parse_reference_time("1970-01-02T00:00:00+00:00"), 86400 * 10**9
+        )
+        with self.assertRaises(ValueError):
+            parse_reference_time(os.path.join(self.root, "missing"))
+
+    def test_cutoff_takes_the_stricter_option(self) -> None:
+        self.assertIsNone(recency_cutoff(None, None))
+        self.assertEqual(recency_cutoff(10, None, now_ns=100 * 10**9), 90 * 10**9)
+        self.assertEqual(recency_cutoff(10, 95 * 10**9, now_ns=100 * 10**9), 95 * 10**9)
+
+    def test_gather_keeps_only_recent_files(self) -> None:
+        args, _ = parse_arguments([self.root, "--changed-within", "2h"])
+        context: Dict[str, Any] = {
+            "roots": args.roots,
+            "files": [],
+            "skip": [],
+            "extensions": ["py"],
+            "errors": ErrorCollector(),
+            "newer_than_ns": recency_cutoff(args.changed_within, args.newer_than),
+        }
+        GatherPlugin().run(context)
+        self.assertEqual(context["all_files"], [self.new])
+        # The mtime lookups are shared with later plugins through the path table.
+        self.assertIn(self.new, context["path_table"]._records)
+
+    def test_unreadable_files_are_kept_for_reporting(self) -> None:
+        missing = os.path.join(self.root, "gone.py")
+        context: Dict[str, Any] = {"newer_than_ns": time.time_ns() - 10**9}
+        self.assertEqual(
+            filter_recent([self.old, missing, self.new], context), [missing, self.new]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+tests/test_split.py - Unit tests for --split-by partitioned bundles.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from savecode.plugins.save import SavePlugin
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.path_record import PathTable
+from savecode.utils.transform_pool import PARALLEL_MIN_FILES, process_pool
+from savecode.utils.split import (
+    key_function,
+    parse_split_by,
+    partition,
+    partition_outputs,
+)
+
+LAYOUT = {
+    os.path.join("src", "pkg", "__init__.py"): "",
+    os.path.join("src", "pkg", "sub", "__init__.py"): "",
+    os.path.join("src", "pkg", "sub", "mod.py"): "x = 1\n",
+    os.path.join("tools", "run.py"): "run()\n",
+    os.path.join("tools", "notes.md"): "# notes\n",
+    "setup.py": "setup()\n",
+}
+
+
+class TestSplit(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.files: List[str] = []
+        for rel, text in LAYOUT.items():
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            self.files.append(path)
+        self.paths = PathTable(self.root)
+        env = patch.dict(os.environ, SAVECODE_NOCOPY="1")
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _keys(self, split_by: str) -> Dict[str, List[str]]:
+        groups = partition(self.files, self.paths, key_function(split_by, self.paths))
+        return {k: [self.paths.get(f).rel for f in v] for k, v in groups.items()}
+
+    def test_keys(self) -> None:
+        pkg = os.path.join("src", "pkg")
+        self.assertEqual(list(self._keys("top-level-package")), [pkg, "tools", "root"])
+        self.assertEqual(
+            list(self._keys("dir")),
+            [pkg, os.path.join(pkg, "sub"), "tools", "root"],
+        )
+        self.assertEqual(list(self._keys("ext")), ["py", "md"])
+        # A custom key is any importable function of the relative path.
+        self.assertEqual(
+            self._keys("os.path:basename")["__init__.py"],
+            [os.path.join(pkg, "__init__.py"), os.path.join(pkg, "sub", "__init__.py")],
+        )
+        with self.assertRaises(ValueError):
+            key_function("no_such_module_xyz:key", self.paths)
+        with self.assertRaises(ValueError):
+            parse_split_by("size")
+
+    def test_outputs_are_distinct(self) -> None:
+        out = os.path.join(self.root, "out.txt")
+        outputs = partition_outputs(out, ["src/pkg", "src-pkg", ""])
+        self.assertEqual(
+            [os.path.basename(p) for p in outputs.values()],
+            ["out.src-pkg.txt", "out.src-pkg-2.txt", "out.root.txt"],
+        )
+
+    def test_save_writes_bundles_and_index(self) -> None:
+        output = os.path.join(self.root, "out.txt")
+        context: Dict[str, Any] = {
+            "all_files": list(self.files),
+            "base_dir": self.root,
+            "output": output,
+            "errors": ErrorCollector(),
+            "cli_opts": {"split_by": "top-level-package", "stats": True},
+        }
+        SavePlugin().run(context)
+        self.assertFalse(context["errors"].has_errors())
+        bundles = dict(context["partitions"])
+        self.assertEqual(list(bundles), [os.path.join("src", "pkg"), "tools", "root"])
+        with open(bundles["tools"], encoding="utf-8") as f:
+            tools = f.read()
+        self.assertTrue(tools.startswith("Files saved (2):\n"))
+        self.assertIn("run()\n", tools)
+        self.assertNotIn("setup()", tools)
+        self.assertTrue(tools.endswith(f"to {bundles['tools']}\n"))
+        with open(output, encoding="utf-8") as f:
+            index = f.read()
+        self.assertIn("out.tools.txt", index)
+        self.assertIn("Saved code from 6 files to 3 bundles", index)
+        self.assertEqual(len(context["saved_files"]), 6)
+        self.assertEqual(len(context["file_stats"]), 6)
+
+    def test_partitions_share_one_process_pool(self) -> None:
+        files = []
+        for package in ("alpha", "beta"):
+            for i in range(PARALLEL_MIN_FILES):
+                path = os.path.join(self.root, package, f"m{i}.py")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"x = {i}\n")
+                files.append(path)
+        context: Dict[str, Any] = {
+            "all_files": files,
+            "base_dir": self.root,
+            "output": os.path.join(self.root, "out.txt"),
+            "errors": ErrorCollector(),
+            "jobs": 2,
+            "cli_opts": {"split_by": "dir"},
+        }
+        with patch("savecode.plugins.save.process_pool", wraps=process_pool) as started:
+            SavePlugin().run(context)
+        started.assert_called_once_with(2)
+        self.assertFalse(context["errors"].has_errors())
+        self.assertEqual(len(context["saved_files"]), 2 * PARALLEL_MIN_FILES)
+        with open(dict(context["partitions"])["beta"], encoding="utf-8") as f:
+            self.assertIn("x = 63\n", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+tests/test_stats.py - Unit tests for per-file statistics and --stats-json output.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+from savecode.plugins.save import SavePlugin
+from savecode.utils.stats import analyze, group_totals
+
+
+class TestStats(unittest.TestCase):
+    def test_analyze_counts_lines_in_one_pass(self) -> None:
+        text = "# header\nimport os\n\n    # indented comment\nx = 1\n"
+        fs = analyze(os.path.join("pkg", "mod.py"), text)
+        self.assertEqual(
+            (fs.language, fs.lines, fs.blank, fs.comment), ("Python", 5, 1, 2)
+        )
+        self.assertEqual(fs.tokens, -(-len(text) // 4))
+        self.assertEqual(fs.bytes, len(text))
+        self.assertEqual(fs.directory, "pkg")
+
+        js = analyze("app.js", "// c\n/* block\n * more\n */\nrun();\n")
+        self.assertEqual((js.language, js.comment), ("JavaScript", 4))
+        # A bare "*" is only a comment inside a block: here it is multiplication.
+        c = analyze("m.c", "/* a */\nint x = a\n    * b;\n/*\nnotes\n*/ int y;\n")
+        self.assertEqual((c.lines, c.comment), (6, 4))
+        self.assertEqual(analyze("Makefile", "# x\nall:\n").language, "Makefile")
+
+    def test_group_totals(self) -> None:
+        stats = [
+            analyze("a.py", "x\n"),
+            analyze(os.path.join("d", "b.py"), "y\nz\n"),
+            analyze(os.path.join("d", "c.md"), "w\n"),
+        ]
+        by_ext = group_totals(stats, "extension")
+        self.assertEqual(by_ext["py"]["files"], 2)
+        self.assertEqual(by_ext["py"]["lines"], 3)
+        self.assertEqual(list(group_totals(stats, "directory")), [".", "d"])
+
+    def test_save_plugin_writes_banner_block_and_json(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "m.py")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write("# c\n\nprint(1)\n")
+            output = os.path.join(tmp, "out.txt")
+            stats_json = os.path.join(tmp, "stats.json")
+            context: Dict[str, Any] = {
+                "all_files": [source],
+                "output": output,
+                "errors": [],
+                "base_dir": tmp,
+                "stats_json": stats_json,
+            }
+            with patch.dict(os.environ, SAVECODE_NOCOPY="1"):
+                SavePlugin().run(context)
+
+            self.assertEqual(context["errors"], [])
+            self.assertEqual(context["file_stats"][0].comment, 1)
+            with open(output, encoding="utf-8") as f:
+                self.assertIn(
+                    "Stats: 1 files, 3 lines (33% blank, 33% comment)", f.read()
+                )
+            with open(stats_json, encoding="utf-8") as f:
+                doc = json.load(f)
+            self.assertEqual(doc["totals"]["lines"], 3)
+            self.assertEqual(doc["by_directory"]["."]["files"], 1)
+            self.assertEqual(doc["files"][0]["path"], "m.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+tests/test_transform_pool.py - Unit tests for --jobs process-pool reading.
+"""
+
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List, Tuple
+
+from savecode.plugins.save import iter_sections
+from savecode.utils.error_handler import ErrorCollector
+from savecode.utils.stats import FileStats
+from savecode.utils.transform_pool import PARALLEL_MIN_FILES, iter_sections_parallel
+
+
+class TestTransformPool(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.files: List[str] = []
+        for i in range(PARALLEL_MIN_FILES + 5):
+            path = os.path.join(tmp.name, f"m{i:03}.py")
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(f"# file {i}\r\nvalue = {i}\n" + ("x" * 200 if i == 7 else ""))
+            self.files.append(path)
+        self.files.insert(3, os.path.join(tmp.name, "missing.py"))
+        self.base = tmp.name
+
+    def _context(self, jobs: int) -> Dict[str, Any]:
+        return {"errors": ErrorCollector(), "base_dir": self.base, "jobs": jobs}
+
+    def test_matches_serial_output_in_order(self) -> None:
+        serial_ctx = self._context(1)
+        serial_saved: List[Tuple[str, int]] = []
+        serial = list(iter_sections(self.files, serial_ctx, saved=serial_saved))
+
+        pool_ctx = self._context(2)
+        pool_saved: List[Tuple[str, int]] = []
+        stats: Dict[str, Any] = {}
+        pooled = list(iter_sections(self.files, pool_ctx, stats, saved=pool_saved))
+
+        self.assertEqual(pooled, serial)
+        self.assertEqual(pool_saved, serial_saved)
+        self.assertEqual(stats["jobs"], 2)
+        self.assertEqual(stats["files"], len(self.files) - 1)
+        self.assertEqual(list(pool_ctx["errors"]), list(serial_ctx["errors"]))
+        self.assertIn("value = 0\n", pooled[0][2])
+
+    def test_oversized_files_and_stats(self) -> None:
+        context = self._context(2)
+        file_stats: List[FileStats] = []
+        sections = list(
+            iter_sections_parallel(
+                self.files, context, 2, max_bytes=100, file_stats=file_stats
+            )
+        )
+        self.assertEqual(len(sections), len(self.files) - 2)
+        self.assertEqual(context["errors"].total("warning"), 2)
+        self.assertEqual([fs.path for fs in file_stats], [s[1] for s in sections])
+        self.assertEqual(file_stats[0].comment, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
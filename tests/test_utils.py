@@ -3,7 +3,13 @@ tests/test_utils.py - Unit tests for file path utilities.
 """
 
 import os
+import tempfile
 import unittest
+from typing import Any, Dict
+from unittest.mock import patch
+
+from savecode.plugins.gather import should_skip
+from savecode.utils.path_record import PathRecord, path_table
 from savecode.utils.path_utils import relative_path, normalize_path
 
 
@@ -33,5 +39,48 @@ class TestPathUtilities(unittest.TestCase):
         self.assertNotIn("./", normalized)
 
 
+class TestPathTable(unittest.TestCase):
+    def test_records_are_interned_and_cache_derived_fields(self) -> None:
+        with tempfile.TemporaryDirectory() as base:
+            path = os.path.join(base, "pkg", "Mod.PY")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x = 1\n")
+            context: Dict[str, Any] = {"base_dir": base}
+            table = path_table(context)
+            record = table.get(path)
+            self.assertIs(table.get(path), record)
+            self.assertIs(path_table(context), table)
+            self.assertIsInstance(record, PathRecord)
+            self.assertEqual(record.suffix, "py")
+            self.assertEqual(record.rel, os.path.join("pkg", "Mod.PY"))
+            with patch("os.stat", wraps=os.stat) as stat:
+                self.assertEqual(record.stat().st_size, 6)
+                record.stat()
+            self.assertEqual(stat.call_count, 1)
+            with self.assertRaises(AttributeError):
+                record.extra = 1  # type: ignore[attr-defined]
+
+            context["base_dir"] = os.path.join(base, "pkg")
+            self.assertEqual(path_table(context).get(path).rel, "Mod.PY")
+
+    def test_should_skip_with_normalized_paths(self) -> None:
+        path = normalize_path(os.path.join("src", "node_modules", "x.py"))
+        patterns = ["node_modules", os.path.join("src", "gen") + os.sep]
+        self.assertTrue(should_skip(path, patterns, normalized=True))
+        self.assertFalse(should_skip(normalize_path("src/app.py"), patterns))
+        self.assertTrue(should_skip(os.path.join("src", "gen", "a.py"), patterns))
+        self.assertFalse(should_skip(path, []))
+
+    def test_path_skips_follow_the_working_directory(self) -> None:
+        rel = os.path.join("sub", "x.py")
+        self.addCleanup(os.chdir, os.getcwd())
+        for _ in range(2):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                os.chdir(tmpdir)
+                self.assertTrue(should_skip(rel, [rel]))
+                os.chdir(os.path.dirname(tmpdir))
+
+
 if __name__ == "__main__":
     unittest.main()